@@ -0,0 +1,87 @@
+# app/core/clock_sync.py — cálculo de sincronización de reloj con compensación de RTT (sin Qt)
+from __future__ import annotations
+
+import calendar
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# El equipo maneja la hora en UTC con resolución de 1 s ("yyyyMMddHHmmss");
+# la zona se configura aparte (keyword GMT).
+DEVICE_TIME_FORMAT = "%Y%m%d%H%M%S"
+SEND_MARGIN_S = 0.05              # holgura mínima para programar la escritura
+
+
+def format_device_time(epoch_s: int) -> str:
+    return time.strftime(DEVICE_TIME_FORMAT, time.gmtime(epoch_s))
+
+
+def parse_device_time(text: str) -> Optional[int]:
+    try:
+        return calendar.timegm(time.strptime(text.strip(), DEVICE_TIME_FORMAT))
+    except (ValueError, OverflowError):
+        return None
+
+
+@dataclass
+class Probe:
+    """Consulta de hora: envío/recepción en reloj del PC (epoch s) y la hora que informó el equipo."""
+    sent: float
+    received: float
+    device_s: Optional[int] = None
+
+    @property
+    def rtt(self) -> float:
+        return self.received - self.sent
+
+
+def rtt_estimate(probes: Sequence[Probe]) -> float:
+    """RTT del enlace: el mínimo observado (las demás muestras incluyen colas y latencia del equipo)."""
+    return min(p.rtt for p in probes)
+
+
+def plan_write(now: float, one_way_s: float) -> Tuple[float, int]:
+    """
+    Elige cuándo enviar la hora para que llegue justo en el cambio de segundo.
+    Devuelve (espera en s, segundo a escribir): enviado a `now + espera`, el comando
+    llega al equipo en `segundo` exacto (según el reloj del PC).
+    """
+    target = math.ceil(now + one_way_s + SEND_MARGIN_S)
+    return target - one_way_s - now, target
+
+
+def next_probe_delay(now: float, offset_s: float, one_way_s: float) -> float:
+    """
+    Espera hasta la próxima consulta para que llegue al equipo justo cuando su reloj
+    (según el offset estimado) cambia de segundo: cada respuesta cae a un lado u otro
+    del cambio y parte a la mitad el intervalo de `estimate_offset` (búsqueda binaria).
+    """
+    k = math.ceil(now + one_way_s + SEND_MARGIN_S + offset_s)
+    return (k - offset_s) - one_way_s - now
+
+
+@dataclass
+class OffsetEstimate:
+    offset_s: float          # hora del equipo - hora del PC
+    uncertainty_s: float     # semiancho del intervalo compatible con todas las muestras
+    consistent: bool         # False si las muestras se contradicen (reloj que salta)
+
+
+def estimate_offset(probes: Sequence[Probe]) -> Optional[OffsetEstimate]:
+    """
+    El equipo leyó su reloj en algún instante t entre `sent` y `received`, y su
+    hora real en t estaba en [S, S+1). Por lo tanto offset ∈ [S - received, S + 1 - sent).
+    Intersectando varias muestras (espaciadas para barrer la fracción de segundo)
+    el intervalo se achica muy por debajo de la resolución de 1 s.
+    """
+    valid: List[Probe] = [p for p in probes if p.device_s is not None]
+    if not valid:
+        return None
+    lo = max(p.device_s - p.received for p in valid)
+    hi = min(p.device_s + 1 - p.sent for p in valid)
+    if lo <= hi:
+        return OffsetEstimate((lo + hi) / 2, (hi - lo) / 2, True)
+    # Contradicción: estimación simétrica (punto medio del viaje, mitad del segundo)
+    mids = sorted(p.device_s + 0.5 - (p.sent + p.received) / 2 for p in valid)
+    return OffsetEstimate(mids[len(mids) // 2], 0.5 + rtt_estimate(valid) / 2, False)
@@ -0,0 +1,183 @@
+# app/core/clock_sync_job.py — sincronización de hora (SYN) en todos los puertos conectados
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Sequence
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from app.core.clock_sync import (
+    Probe, estimate_offset, format_device_time, next_probe_delay, parse_device_time, plan_write,
+    rtt_estimate,
+)
+from app.core.device_link import DeviceLink
+from app.core.protocol import CLOCK_KEYWORD, Frame
+
+
+class _PortSync(QObject):
+    """
+    Máquina de estados de un puerto:
+    1. `rtt_probes` consultas de hora seguidas -> RTT (mínimo) y offset inicial.
+    2. Escribe la hora programada para llegar en el cambio de segundo (compensa RTT/2).
+    3. `verify_probes` consultas, cada una apuntada al cambio de segundo del equipo
+       según la estimación anterior -> offset residual e incertidumbre (~RTT/2).
+    """
+
+    done = pyqtSignal(dict)
+
+    def __init__(self, link: DeviceLink, rtt_probes: int, verify_probes: int, timeout_ms: int):
+        super().__init__()
+        self.link = link
+        self.port = link.manager.get_port_name()
+        self.rtt_probes = rtt_probes
+        self.verify_probes = verify_probes
+        self._one_way = 0.0
+        self.result: Dict[str, object] = {"port": self.port, "ok": False}
+        self._phase = "rtt"
+        self._probes: List[Probe] = []
+        self._pending = ""
+        self._sent = 0.0
+        self._planned = 0.0
+        self._finished = False
+
+        self._timeout = QTimer(self)
+        self._timeout.setSingleShot(True)
+        self._timeout.setInterval(timeout_ms)
+        self._timeout.timeout.connect(lambda: self._fail(f"Sin respuesta ({self._phase})"))
+        link.frame_received.connect(self._on_frame)
+
+    def start(self) -> None:
+        self._query()
+
+    def cancel(self) -> None:
+        self._fail("Cancelado")
+
+    # -------------
+    # PASOS
+    # -------------
+    def _send(self, *args: str) -> None:
+        self._sent = time.time()
+        self._pending = self.link.send_command(CLOCK_KEYWORD, *args)
+        if not self._pending:
+            self._fail("Puerto no abierto")
+            return
+        self._timeout.start()
+
+    def _query(self) -> None:
+        if not self._finished:
+            self._send()
+
+    def _write(self, second: int) -> None:
+        if self._finished:
+            return
+        self._phase = "write"
+        self._send(format_device_time(second))
+        self.result["write_lag_ms"] = round((self._sent - self._planned) * 1000.0, 2)
+
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        if self._finished or not self._pending or frame.serial != self._pending:
+            return
+        received = time.time()
+        self.link.latency.matched(frame)
+        self._pending = ""
+        self._timeout.stop()
+
+        if self._phase == "write":
+            self._phase = "verify"
+            self._probes = []
+            self._schedule_probe(0.0)
+            return
+
+        self._probes.append(Probe(self._sent, received, parse_device_time(frame.value)))
+        if self._phase == "rtt":
+            if len(self._probes) < self.rtt_probes:
+                self._query()
+                return
+            rtt = rtt_estimate(self._probes)
+            self._one_way = rtt / 2
+            before = estimate_offset(self._probes)
+            self.result["rtt_ms"] = round(rtt * 1000.0, 2)
+            if before is not None:
+                self.result["offset_before_ms"] = round(before.offset_s * 1000.0, 1)
+            delay, second = plan_write(time.time(), rtt / 2)
+            self._planned = time.time() + delay
+            QTimer.singleShot(int(delay * 1000), Qt.TimerType.PreciseTimer, lambda: self._write(second))
+            return
+
+        # verify
+        est = estimate_offset(self._probes)
+        if len(self._probes) < self.verify_probes:
+            self._schedule_probe(est.offset_s if est is not None else 0.0)
+            return
+        if est is None:
+            self._fail("El equipo no devolvió una hora válida")
+            return
+        self.result.update(ok=True, residual_ms=round(est.offset_s * 1000.0, 1),
+                           uncertainty_ms=round(est.uncertainty_s * 1000.0, 1), consistent=est.consistent)
+        self._finish()
+
+    def _schedule_probe(self, offset_s: float) -> None:
+        delay = next_probe_delay(time.time(), offset_s, self._one_way)
+        QTimer.singleShot(int(delay * 1000), Qt.TimerType.PreciseTimer, self._query)
+
+    def _fail(self, msg: str) -> None:
+        self.result["message"] = msg
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self._timeout.stop()
+        try:
+            self.link.frame_received.disconnect(self._on_frame)
+        except Exception:
+            pass
+        self.done.emit(dict(self.result))
+
+
+class ClockSyncJob(QObject):
+    """
+    Sincroniza la hora de todos los equipos conectados a la vez (un _PortSync por enlace)
+    y reporta por puerto el RTT medido y el error residual verificado.
+    """
+
+    port_finished = pyqtSignal(str, dict)        # puerto, resultado
+    finished = pyqtSignal(list)                  # resultados de todos los puertos
+
+    def __init__(self, rtt_probes: int = 5, verify_probes: int = 6, timeout_ms: int = 1500):
+        super().__init__()
+        self.rtt_probes = rtt_probes
+        self.verify_probes = verify_probes
+        self.timeout_ms = timeout_ms
+        self._syncs: List[_PortSync] = []
+        self._results: List[dict] = []
+
+    def start(self, links: Sequence[DeviceLink]) -> int:
+        """Arranca en los enlaces conectados. Devuelve cuántos puertos se sincronizan."""
+        if self.is_running():
+            return 0
+        self._results = []
+        self._syncs = [_PortSync(link, self.rtt_probes, self.verify_probes, self.timeout_ms)
+                       for link in links if link.manager.is_connected()]
+        for sync in self._syncs:
+            sync.done.connect(self._on_port_done)
+        for sync in list(self._syncs):
+            sync.start()
+        return len(self._syncs)
+
+    def stop(self) -> None:
+        for sync in list(self._syncs):
+            sync.cancel()
+
+    def is_running(self) -> bool:
+        return bool(self._syncs)
+
+    def _on_port_done(self, result: dict) -> None:
+        sync: Optional[_PortSync] = self.sender()
+        self._results.append(result)
+        self.port_finished.emit(result.get("port", ""), result)
+        if sync in self._syncs:
+            self._syncs.remove(sync)
+            sync.deleteLater()
+        if not self._syncs:
+            self.finished.emit(list(self._results))
@@ -0,0 +1,70 @@
+# app/core/config_reader.py — lectura de configuración (IP, APN, tiempos, VIP) en un solo envío
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.protocol import CONFIG_LAYOUT, Frame, config_from_frame
+
+
+class ConfigReader(QObject):
+    """
+    Consulta los keywords de configuración en una sola escritura y emite
+    `config_ready` con todos los campos cuando llegan las respuestas.
+    """
+
+    config_ready = pyqtSignal(dict, str)         # {campo: valor}, puerto
+    config_failed = pyqtSignal(str, str)         # mensaje, puerto
+
+    def __init__(self, link: DeviceLink, timeout_ms: int = 2000):
+        super().__init__()
+        self.link = link
+        self._pending: Dict[str, str] = {}       # serie -> keyword
+        self._result: Dict[str, str] = {}
+        self._port = ""
+        self.last_frame: Optional[Frame] = None  # trama que completó la última lectura
+        self.last_full = False                   # la última lectura cubrió todos los keywords
+        self._full = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(timeout_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+        link.frame_received.connect(self._on_frame)
+
+    def read(self, keywords: Optional[Tuple[str, ...]] = None) -> bool:
+        """Lee los keywords indicados (todos por defecto). False si no se pudo enviar."""
+        if self._pending:
+            return True
+        kws = [k for k in CONFIG_LAYOUT if keywords is None or k in keywords]
+        serials = self.link.send_batch((k,) for k in kws)
+        if not serials:
+            self.config_failed.emit("Puerto no abierto", self.link.manager.get_port_name())
+            return False
+        self._port = self.link.manager.get_port_name()
+        self._result = {}
+        self._full = len(kws) == len(CONFIG_LAYOUT)
+        self._pending = dict(zip(serials, kws))
+        self._timer.start()
+        return True
+
+    def is_busy(self) -> bool:
+        return bool(self._pending)
+
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        if port != self._port or self._pending.pop(frame.serial, None) is None:
+            return
+        self.link.latency.matched(frame)
+        self._result.update(config_from_frame(frame))
+        if not self._pending:
+            self._timer.stop()
+            self.last_frame = frame
+            self.last_full = self._full
+            self.config_ready.emit(dict(self._result), port)
+
+    def _on_timeout(self) -> None:
+        missing = ", ".join(sorted(self._pending.values()))
+        self._pending.clear()
+        self.config_failed.emit(f"Sin respuesta para: {missing}", self._port)
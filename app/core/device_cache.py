@@ -0,0 +1,103 @@
+# app/core/device_cache.py — caché persistente de identidad y configuración por IMEI
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+class DeviceCache:
+    """
+    Última identidad y configuración conocidas de cada equipo, guardadas en JSON.
+    - Clave: IMEI (o ID si el IMEI no se conoce).
+    - Cada sección guarda su marca de tiempo (`identity_ts`, `config_ts`, epoch en segundos).
+    - `invalidate()` descarta la configuración (tras una escritura o un reset de fábrica).
+    Escribe el archivo completo en cada cambio (tmp + rename): son pocos KB.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    # -------------
+    # LECTURA
+    # -------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(key)
+        return json.loads(json.dumps(entry)) if entry else None
+
+    def get_config(self, key: str) -> Dict[str, str]:
+        entry = self._data.get(key) or {}
+        return dict(entry.get("config") or {})
+
+    def config_age(self, key: str, now: Optional[float] = None) -> Optional[float]:
+        """Segundos desde la última lectura de configuración (None si no hay)."""
+        entry = self._data.get(key) or {}
+        ts = entry.get("config_ts")
+        if ts is None:
+            return None
+        return (now if now is not None else time.time()) - ts
+
+    # -------------
+    # ESCRITURA
+    # -------------
+    def put_identity(self, key: str, identity: Dict[str, str]) -> None:
+        if not key:
+            return
+        entry = self._data.setdefault(key, {})
+        entry["identity"] = dict(identity)
+        entry["identity_ts"] = time.time()
+        self._save()
+
+    def put_config(self, key: str, config: Dict[str, str], merge: bool = True) -> None:
+        if not key:
+            return
+        entry = self._data.setdefault(key, {})
+        current = dict(entry.get("config") or {}) if merge else {}
+        current.update({k: str(v) for k, v in config.items()})
+        entry["config"] = current
+        entry["config_ts"] = time.time()
+        self._save()
+
+    def invalidate(self, key: str) -> None:
+        """Olvida la configuración del equipo (la identidad sigue siendo válida)."""
+        entry = self._data.get(key)
+        if not entry or "config" not in entry:
+            return
+        entry.pop("config", None)
+        entry.pop("config_ts", None)
+        entry["invalidated_ts"] = time.time()
+        self._save()
+
+    def forget(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._save()
+
+    # -------------
+    # PERSISTENCIA
+    # -------------
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except (OSError, ValueError):
+            self._data = {}
+
+    def _save(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def cache_key(identity: Dict[str, str]) -> str:
+    """IMEI si se conoce; si no, el ID del equipo."""
+    return identity.get("imei") or identity.get("id") or ""
@@ -0,0 +1,77 @@
+# app/core/device_link.py — capa de comandos sobre SerialManager
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.core.latency import LatencyStats
+from app.core.protocol import DEFAULT_DEVICE_ID, FrameParser, SerialCounter, build_command
+from app.core.serial_manager import SerialManager
+
+
+class DeviceLink(QObject):
+    """
+    Convierte el flujo de bytes de SerialManager en tramas (`frame_received`)
+    y arma los comandos con ID y número de serie.
+    - `send_command` envía un comando y devuelve su número de serie.
+    - `send_batch` envía varios comandos en una sola escritura (pipeline).
+    - Cada trama sale marcada con la llegada de sus bytes; `latency` junta las
+      latencias por etapa (los lectores llaman a `latency.matched`, la UI a `displayed`).
+    """
+
+    frame_received = pyqtSignal(object, str)     # Frame, puerto
+
+    def __init__(self, manager: SerialManager, device_id: str = DEFAULT_DEVICE_ID):
+        super().__init__()
+        self.manager = manager
+        self.device_id = device_id
+        self._parser = FrameParser()
+        self._counter = SerialCounter()
+        self.latency = LatencyStats()
+
+        manager.data_received_ns.connect(self._on_data)
+        manager.connection_changed.connect(self._on_connection_changed)
+
+    # -------------
+    # ENVÍO
+    # -------------
+    def send_command(self, keyword: str, *args: str, device_id: Optional[str] = None) -> str:
+        """Envía un comando y devuelve el número de serie usado ("" si el puerto está cerrado)."""
+        serials = self.send_batch([(keyword, *args)], device_id=device_id)
+        return serials[0] if serials else ""
+
+    def next_serial(self) -> str:
+        """Reserva el siguiente número de serie (para comandos armados fuera de la capa)."""
+        return self._counter.next()
+
+    def send_batch(self, commands: Iterable[Sequence[str]], device_id: Optional[str] = None) -> List[str]:
+        """
+        Envía todos los comandos concatenados en una única escritura.
+        Devuelve los números de serie en el mismo orden.
+        """
+        if not self.manager.is_connected():
+            self.manager.error_occurred.emit("Puerto no abierto", self.manager.get_port_name())
+            return []
+        dev = device_id or self.device_id
+        serials: List[str] = []
+        chunks: List[str] = []
+        for keyword, *args in commands:
+            serial = self._counter.next()
+            serials.append(serial)
+            chunks.append(build_command(dev, serial, keyword, *args))
+        if not chunks:
+            return []
+        self.manager.send_data_str("\r\n".join(chunks) + "\r\n", append_newline=False, encoding="latin-1")
+        return serials
+
+    # -------------
+    # RECEPCIÓN
+    # -------------
+    def _on_data(self, data: bytes, port: str, rx_ns: int = 0) -> None:
+        for frame in self._parser.feed(data, rx_ns):
+            self.latency.parsed(frame)
+            self.frame_received.emit(frame, port)
+
+    def _on_connection_changed(self, connected: bool, port: str) -> None:
+        # Restos de una sesión anterior no deben mezclarse con la nueva
+        self._parser.reset()
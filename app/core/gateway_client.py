@@ -0,0 +1,156 @@
+# app/core/gateway_client.py — SerialManager sobre la pasarela (serial_gateway) en vez del puerto
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from PyQt6.QtNetwork import QAbstractSocket, QLocalSocket, QTcpSocket
+
+from app.core.serial_manager import SerialManager
+
+TCP_PREFIX = "tcp:"            # "tcp:HOST:PUERTO", igual que --tcp de la pasarela
+LOCAL_PREFIX = "local:"        # "local:NOMBRE", igual que --local
+CONNECT_TIMEOUT_MS = 2000
+
+_Socket = Union[QTcpSocket, QLocalSocket]
+
+
+def parse_gateway_address(address: str) -> Tuple[str, str, int]:
+    """("tcp", host, puerto) o ("local", nombre, 0). ValueError si la dirección no es válida."""
+    if address.startswith(LOCAL_PREFIX) and address[len(LOCAL_PREFIX):]:
+        return "local", address[len(LOCAL_PREFIX):], 0
+    if address.startswith(TCP_PREFIX):
+        host, _, port = address[len(TCP_PREFIX):].rpartition(":")
+        if port.isdigit() and 0 < int(port) < 65536:
+            return "tcp", host or "127.0.0.1", int(port)
+    raise ValueError(f"Dirección de pasarela inválida: {address!r} (tcp:HOST:PUERTO o local:NOMBRE)")
+
+
+class GatewayManager(SerialManager):
+    """
+    Mismas señales y métodos que SerialManager, pero el "puerto" es una conexión a la
+    pasarela que ya tiene abierto el puerto real; así DeviceLink y la ventana funcionan
+    igual mientras guiones y monitores comparten ese mismo puerto.
+    - La única entrada de la lista de puertos es `address`; el escaneo periódico sirve
+      para reconectar si la pasarela se reinicia (auto_reconnect).
+    - Los ajustes serie (baud, etc.) los fija el proceso de la pasarela: acá se ignoran.
+    - DTR/RTS no viajan por el socket: `set_control_lines` devuelve False (como en un pty).
+    """
+
+    def __init__(self, address: str, scan_interval_ms: int = 2000, auto_reconnect: bool = True,
+                 connect_timeout_ms: int = CONNECT_TIMEOUT_MS):
+        self.address = address
+        self.sock: Optional[_Socket] = None
+        self.connect_timeout_ms = connect_timeout_ms
+        super().__init__(scan_interval_ms, auto_reconnect)
+
+    # --------------------
+    # "ESCANEO"
+    # --------------------
+    def scan_ports(self) -> None:
+        ports = self.get_list_ports()
+        if ports != self._last_ports:
+            self._last_ports = ports
+            self.ports_updated.emit(ports)
+        self._try_reconnect(ports)
+
+    def get_list_ports(self) -> List[str]:
+        return [self.address] if self.address else []
+
+    def get_port_info(self, port_name: str) -> Dict[str, Any]:
+        if port_name != self.address:
+            return {}
+        return {'description': "Serial gateway", 'manufacturer': "", 'serial_number': "",
+                'vendor_id': None, 'product_id': None, 'system_location': port_name}
+
+    # -------------
+    # CONEXIÓN
+    # -------------
+    def open_port(self, port_name: str, settings: Optional[Dict[str, Any]] = None) -> bool:
+        try:
+            kind, target, port = parse_gateway_address(port_name)
+        except ValueError as e:
+            self.error_occurred.emit(str(e), port_name)
+            return False
+        if self.sock is not None:
+            self.close_port(user_requested=False)
+
+        self.port_name = port_name
+        sock: _Socket = QTcpSocket() if kind == "tcp" else QLocalSocket()
+        if kind == "tcp":
+            sock.setSocketOption(QAbstractSocket.SocketOption.LowDelayOption, 1)
+            sock.connectToHost(target, port)
+        else:
+            sock.connectToServer(target)
+        if not sock.waitForConnected(self.connect_timeout_ms):
+            self.error_occurred.emit(f"No se pudo conectar a la pasarela {port_name}: {sock.errorString()}",
+                                     port_name)
+            sock.abort()
+            sock.deleteLater()
+            return False
+
+        self.sock = sock
+        sock.readyRead.connect(self._handle_ready_read)
+        sock.disconnected.connect(self._on_disconnected)
+        self.connection_changed.emit(True, port_name)
+        self._scan_timer.stop()
+        return True
+
+    def close_port(self, _restart_scan: bool = True, user_requested: bool = True) -> None:
+        name = self.port_name
+        if user_requested:
+            self.port_name = ""
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            for sig in (sock.readyRead, sock.disconnected):
+                try:
+                    sig.disconnect()
+                except Exception:
+                    pass
+            if isinstance(sock, QTcpSocket):
+                sock.disconnectFromHost()
+            else:
+                sock.disconnectFromServer()
+            sock.abort()
+            sock.deleteLater()
+            self.connection_changed.emit(False, name)
+        if _restart_scan and not self._shutting_down:
+            self._scan_timer.start(self._scan_interval_ms)
+
+    def _on_disconnected(self) -> None:
+        self.error_occurred.emit("Pasarela desconectada", self.port_name)
+        self.close_port(user_requested=False)        # conserva la dirección para reconectar
+
+    # -------------
+    # ESTADO
+    # -------------
+    def is_connected(self) -> bool:
+        return self.sock is not None
+
+    def get_current_settings(self) -> Dict[str, Any]:
+        return {}
+
+    def set_control_lines(self, dtr: Optional[bool] = None, rts: Optional[bool] = None) -> bool:
+        return False
+
+    # -------------
+    # ENVÍO / RECEPCIÓN
+    # -------------
+    def send_data_bytes(self, data: bytes) -> None:
+        if self.sock is None:
+            self.error_occurred.emit("Puerto no abierto", self.port_name)
+            return
+        n = self.sock.write(data)
+        if n != len(data):
+            self.error_occurred.emit("Error al escribir en la pasarela", self.port_name)
+            return
+        self.sock.flush()
+        self.data_sent.emit(data, self.port_name)
+
+    def _handle_ready_read(self) -> None:
+        rx_ns = time.monotonic_ns()
+        if self.sock is not None:
+            data = bytes(self.sock.readAll())
+            if data:
+                self.data_received_ns.emit(data, self.port_name, rx_ns)
+                self.data_received.emit(data, self.port_name)
+
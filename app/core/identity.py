@@ -0,0 +1,116 @@
+# app/core/identity.py — lectura de identidad (ID, IMEI, CCID, versión) en un solo envío
+from __future__ import annotations
+
+from typing import Dict, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.protocol import IDENTITY_QUERIES, Frame
+
+
+class IdentityReader(QObject):
+    """
+    Consulta ID, IMEI, CCID y versión enviando las cuatro tramas juntas
+    (una sola escritura) y emite `identity_ready` cuando llegan todas las respuestas.
+    - La identidad queda en caché por puerto; `refresh()` la reutiliza sin tocar el puerto.
+    - La caché se descarta al cerrar el puerto manualmente, o si llega una trama
+      con otro ID (otro equipo conectado en el mismo puerto tras una reconexión).
+    """
+
+    identity_ready = pyqtSignal(dict, str)       # {"id", "imei", "ccid", "version"}, puerto
+    identity_failed = pyqtSignal(str, str)       # mensaje, puerto
+
+    def __init__(self, link: DeviceLink, timeout_ms: int = 1500):
+        super().__init__()
+        self.link = link
+        self._cache: Dict[str, Dict[str, str]] = {}
+        self._pending: Dict[str, str] = {}       # serie -> campo
+        self._result: Dict[str, str] = {}
+        self._port = ""
+        self.last_frame: Optional[Frame] = None  # trama que completó la última identidad (None: de caché)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(timeout_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+        link.frame_received.connect(self._on_frame)
+        link.manager.connection_changed.connect(self._on_connection_changed)
+
+    # -------------
+    # API
+    # -------------
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Pide la identidad del equipo conectado. Si está en caché (y no `force`)
+        la emite de inmediato. Devuelve False si no se pudo enviar la consulta.
+        """
+        port = self.link.manager.get_port_name()
+        if not self.link.manager.is_connected():
+            self.identity_failed.emit("Puerto no abierto", port)
+            return False
+        if not force and port in self._cache:
+            self.last_frame = None
+            self.identity_ready.emit(dict(self._cache[port]), port)
+            return True
+        if self._pending:
+            return True  # ya hay una consulta en curso; su respuesta llenará el panel
+
+        fields = list(IDENTITY_QUERIES)
+        serials = self.link.send_batch(IDENTITY_QUERIES[f] for f in fields)
+        if not serials:
+            return False
+        self._port = port
+        self._result = {}
+        self._pending = dict(zip(serials, fields))
+        self._timer.start()
+        return True
+
+    def cached(self, port: str) -> Optional[Dict[str, str]]:
+        data = self._cache.get(port)
+        return dict(data) if data else None
+
+    def invalidate(self, port: Optional[str] = None) -> None:
+        if port is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(port, None)
+
+    # -------------
+    # INTERNOS
+    # -------------
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        cached = self._cache.get(port)
+        if cached and frame.device_id != cached.get("id"):
+            self._cache.pop(port, None)
+
+        # Primero el puerto: una serie igual que llega por otro puerto no consume la pendiente
+        if port != self._port or frame.serial not in self._pending:
+            return
+        field = self._pending.pop(frame.serial)
+        self.link.latency.matched(frame)
+        # El ID viene en la cabecera de cualquier respuesta
+        self._result["id"] = frame.device_id
+        if field != "id":
+            self._result[field] = frame.value
+        if not self._pending:
+            self._timer.stop()
+            self._cache[port] = dict(self._result)
+            self.link.device_id = self._result["id"]
+            self.last_frame = frame
+            self.identity_ready.emit(dict(self._result), port)
+
+    def _on_timeout(self) -> None:
+        missing = ", ".join(sorted(self._pending.values()))
+        self._pending.clear()
+        self.identity_failed.emit(f"Sin respuesta para: {missing}", self._port)
+
+    def _on_connection_changed(self, connected: bool, port: str) -> None:
+        if connected:
+            return
+        if self._pending and port == self._port:
+            self._timer.stop()
+            self._pending.clear()
+        # Cierre manual: el siguiente equipo en este puerto puede ser otro
+        if not self.link.manager.get_port_name():
+            self._cache.pop(port, None)
@@ -0,0 +1,87 @@
+# app/core/latency.py — latencia por etapa de cada trama recibida (sin Qt)
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from app.core.protocol import Frame
+
+# Etapas: llegada (readyRead) -> parseo -> correlación con el comando -> mostrado en la UI
+ARRIVAL_PARSE = "arrival→parse"
+PARSE_MATCH = "parse→match"
+MATCH_UI = "match→UI"
+STAGES = (ARRIVAL_PARSE, PARSE_MATCH, MATCH_UI)
+CAPACITY = 4096                # muestras recientes por etapa (para los percentiles)
+
+
+class StageStats:
+    """Distribución de una etapa: últimas `capacity` muestras + totales desde el inicio."""
+
+    def __init__(self, capacity: int = CAPACITY):
+        self.samples: Deque[int] = deque(maxlen=capacity)     # ns
+        self.count = 0
+        self.max_ns = 0
+
+    def add(self, ns: int) -> None:
+        ns = max(0, ns)
+        self.samples.append(ns)
+        self.count += 1
+        self.max_ns = max(self.max_ns, ns)
+
+    def percentile(self, p: float) -> float:
+        """Percentil (rango más cercano) de las muestras recientes, en ms."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        i = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[i] / 1e6
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"count": self.count, "p50_ms": self.percentile(50), "p90_ms": self.percentile(90),
+                "p99_ms": self.percentile(99), "max_ms": self.max_ns / 1e6}
+
+
+class LatencyStats:
+    """
+    Acumula cuánto tarda cada trama en cada etapa, a partir de las marcas que lleva el Frame:
+    - `rx_ns`: reloj monotónico (ns) en el readyRead del lote que la completó.
+    - `parsed_ns`: al salir del FrameParser.
+    - `matched_ns`: cuando un lector la asoció a su comando pendiente (`matched`).
+    `displayed` cierra la última etapa cuando la UI termina de mostrar el resultado.
+    """
+
+    def __init__(self, capacity: int = CAPACITY, clock: Callable[[], int] = time.monotonic_ns):
+        self.clock = clock
+        self.stages: Dict[str, StageStats] = {s: StageStats(capacity) for s in STAGES}
+
+    def parsed(self, frame: Frame) -> None:
+        if frame.rx_ns and frame.parsed_ns:
+            self.stages[ARRIVAL_PARSE].add(frame.parsed_ns - frame.rx_ns)
+
+    def matched(self, frame: Frame) -> None:
+        frame.matched_ns = self.clock()
+        if frame.parsed_ns:
+            self.stages[PARSE_MATCH].add(frame.matched_ns - frame.parsed_ns)
+
+    def displayed(self, frame: Optional[Frame]) -> None:
+        """La UI mostró lo que trajo `frame` (None: resultado de caché, no se mide)."""
+        if frame is not None and frame.matched_ns:
+            self.stages[MATCH_UI].add(self.clock() - frame.matched_ns)
+            frame.matched_ns = 0               # una trama se cuenta una sola vez
+
+    def reset(self) -> None:
+        for stage in self.stages.values():
+            stage.samples.clear()
+            stage.count = 0
+            stage.max_ns = 0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
+
+    def summary(self) -> str:
+        lines = ["== Latency (ms) =="]
+        for name, s in self.snapshot().items():
+            lines.append(f"  {name:<14} {int(s['count']):7d} x  p50 {s['p50_ms']:8.2f}  p90 {s['p90_ms']:8.2f}"
+                         f"  p99 {s['p99_ms']:8.2f}  max {s['max_ms']:8.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,26 @@
+# app/core/paths.py — carpetas de datos locales de la aplicación
+from __future__ import annotations
+
+import os
+
+APP_ORG = "Hunter"
+APP_NAME = "ConfigVer"
+
+
+def data_dir() -> str:
+    """
+    Carpeta de datos persistentes (cachés, bases de datos).
+    Usa QStandardPaths si Qt está disponible; si no, ~/.local/share/Hunter/ConfigVer.
+    """
+    path = ""
+    try:
+        from PyQt6.QtCore import QStandardPaths
+        base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+        if base:
+            path = os.path.join(base, APP_ORG, APP_NAME)
+    except ImportError:
+        pass
+    if not path:
+        path = os.path.join(os.path.expanduser("~"), ".local", "share", APP_ORG, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,199 @@
+# app/core/poll_scheduler.py — sondeo periódico de estado con prioridad para comandos interactivos
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.protocol import Frame, FrameParser
+
+DEFAULT_POLL_PRIORITY = 10                 # menor = antes (entre sondeos)
+
+
+@dataclass
+class PollJob:
+    name: str
+    command: Tuple[str, ...]               # (keyword, args...)
+    interval_ms: int
+    device_id: Optional[str] = None        # None -> el ID actual del enlace
+    max_age_ms: Optional[int] = None       # sondeo en cola más viejo que esto se descarta (def. = intervalo)
+    priority: int = DEFAULT_POLL_PRIORITY
+    timer: Optional[QTimer] = field(default=None, repr=False)
+
+    def key(self, link: DeviceLink) -> Tuple[str, ...]:
+        return (self.device_id or link.device_id, *self.command)
+
+
+@dataclass(order=True)
+class _Queued:
+    priority: int
+    seq: int
+    enqueued: float = field(compare=False)
+    job: PollJob = field(compare=False)
+
+
+class PollScheduler(QObject):
+    """
+    Sondea el estado de los equipos conectados sin estorbar al operador.
+    - Cada PollJob encola su consulta cada `interval_ms` (si el puerto está abierto).
+    - Consultas idénticas pendientes se fusionan; las que esperaron más de `max_age_ms` se descartan.
+    - Cualquier trama que no sea de este planificador (BaseInfoTab, AdvancedTab, guiones,
+      aprovisionamiento) cuenta como interactiva: mientras tenga respuestas pendientes
+      no se despacha ningún sondeo, así el operador nunca queda detrás de la cola.
+    - Hasta `window` sondeos en vuelo a la vez (pipeline) para aprovechar el enlace.
+    """
+
+    poll_result = pyqtSignal(str, object, str)      # nombre del job, Frame, puerto
+    poll_dropped = pyqtSignal(str, str)             # nombre del job, motivo
+
+    def __init__(self, link: DeviceLink, reply_timeout_ms: int = 1500, window: int = 2):
+        super().__init__()
+        self.link = link
+        self.reply_timeout_ms = reply_timeout_ms
+        self.window = window
+        self.jobs: Dict[str, PollJob] = {}
+        self._heap: List[_Queued] = []
+        self._queued_keys: Dict[Tuple[str, ...], str] = {}
+        self._seq = itertools.count()
+        self._in_flight: Dict[str, Tuple[PollJob, float]] = {}   # serie -> (job, vence)
+        self._foreground: Dict[str, float] = {}                 # serie -> vence
+        self._tx_parser = FrameParser()
+        self._sending = False
+        self._running = False
+
+        self._sweep = QTimer(self)
+        self._sweep.setInterval(100)
+        self._sweep.timeout.connect(self._expire)
+
+        link.manager.data_sent.connect(self._on_data_sent)
+        link.manager.connection_changed.connect(self._on_connection_changed)
+        link.frame_received.connect(self._on_frame)
+
+    # -------------
+    # JOBS
+    # -------------
+    def add_poll(self, name: str, keyword: str, *args: str, interval_ms: int,
+                 device_id: Optional[str] = None, max_age_ms: Optional[int] = None,
+                 priority: int = DEFAULT_POLL_PRIORITY) -> PollJob:
+        self.remove_poll(name)
+        job = PollJob(name, (keyword.upper(), *args), interval_ms, device_id, max_age_ms, priority)
+        job.timer = QTimer(self)
+        job.timer.setInterval(interval_ms)
+        job.timer.timeout.connect(lambda: self.enqueue(job))
+        self.jobs[name] = job
+        if self._running:
+            job.timer.start()
+        return job
+
+    def remove_poll(self, name: str) -> None:
+        job = self.jobs.pop(name, None)
+        if job is not None and job.timer is not None:
+            job.timer.stop()
+            job.timer.deleteLater()
+
+    def start(self) -> None:
+        self._running = True
+        for job in self.jobs.values():
+            job.timer.start()
+            self.enqueue(job)
+
+    def stop(self) -> None:
+        self._running = False
+        for job in self.jobs.values():
+            job.timer.stop()
+        self._heap.clear()
+        self._queued_keys.clear()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    # -------------
+    # COLA
+    # -------------
+    def enqueue(self, job: PollJob) -> bool:
+        """Encola la consulta del job. False si ya hay una idéntica pendiente o en vuelo."""
+        if not self._running or not self.link.manager.is_connected():
+            return False
+        key = job.key(self.link)
+        if key in self._queued_keys or any(j.key(self.link) == key for j, _ in self._in_flight.values()):
+            return False
+        self._queued_keys[key] = job.name
+        heapq.heappush(self._heap, _Queued(job.priority, next(self._seq), time.monotonic(), job))
+        self._dispatch()
+        return True
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self._heap and not self._foreground and len(self._in_flight) < self.window:
+            item = heapq.heappop(self._heap)
+            job = item.job
+            self._queued_keys.pop(job.key(self.link), None)
+            if job.name not in self.jobs:
+                continue
+            max_age = job.max_age_ms if job.max_age_ms is not None else job.interval_ms
+            if (now - item.enqueued) * 1000.0 > max_age:
+                self.poll_dropped.emit(job.name, "stale")
+                continue
+            self._sending = True
+            try:
+                serial = self.link.send_command(*job.command, device_id=job.device_id)
+            finally:
+                self._sending = False
+            if not serial:
+                break
+            self._in_flight[serial] = (job, now + self.reply_timeout_ms / 1000.0)
+        if (self._in_flight or self._foreground) and not self._sweep.isActive():
+            self._sweep.start()
+
+    # -------------
+    # TRÁFICO
+    # -------------
+    def _on_data_sent(self, data: bytes, port: str) -> None:
+        frames = self._tx_parser.feed(data)
+        if self._sending:
+            return
+        deadline = time.monotonic() + self.reply_timeout_ms / 1000.0
+        for f in frames:
+            self._foreground[f.serial] = deadline
+        if frames and not self._sweep.isActive():
+            self._sweep.start()
+
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        entry = self._in_flight.pop(frame.serial, None)
+        if entry is not None:
+            self.link.latency.matched(frame)
+            self.poll_result.emit(entry[0].name, frame, port)
+        elif self._foreground.pop(frame.serial, None) is None:
+            return
+        self._dispatch()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for serial, (job, deadline) in list(self._in_flight.items()):
+            if deadline <= now:
+                del self._in_flight[serial]
+                self.poll_dropped.emit(job.name, "timeout")
+        for serial, deadline in list(self._foreground.items()):
+            if deadline <= now:
+                del self._foreground[serial]
+        if not self._in_flight and not self._foreground:
+            self._sweep.stop()
+        self._dispatch()
+
+    def _on_connection_changed(self, connected: bool, port: str) -> None:
+        self._tx_parser.reset()
+        self._heap.clear()
+        self._queued_keys.clear()
+        self._in_flight.clear()
+        self._foreground.clear()
+        self._sweep.stop()
+        if connected:
+            for job in list(self.jobs.values()):
+                self.enqueue(job)
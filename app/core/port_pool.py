@@ -0,0 +1,233 @@
+# app/core/port_pool.py — puertos repartidos en procesos trabajadores (lado GUI)
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.port_worker import (
+    CMD_CLOCK_SYNC, CMD_JOURNAL, CMD_PROVISION, CMD_PROVISION_STOP, CMD_RAW, CMD_SEND, CMD_STOP,
+    EV_CLOCK, EV_CONNECTION, EV_ERROR, EV_JOURNAL, EV_PROGRESS, EV_UNIT, FLUSH_MS, HEARTBEAT_MS,
+    group_ports, run_worker, unpack_frame,
+)
+from app.core.provisioning import Journal
+
+DRAIN_MS = 20                  # cada cuánto el GUI vacía las tuberías
+MAX_BATCHES_PER_DRAIN = 32     # por trabajador y tic: un trabajador muy activo no acapara el GUI
+STALL_TIMEOUT_S = 10.0         # sin lotes (ni latidos) en este tiempo -> se reinicia el trabajador
+
+
+@dataclass
+class _Worker:
+    index: int
+    ports: List[str]
+    process: Any = None
+    conn: Any = None
+    last_seen: float = 0.0
+    restarts: int = 0
+    frames: int = 0
+    alive: bool = False
+    connected: Dict[str, bool] = field(default_factory=dict)
+
+
+class PortPool(QObject):
+    """
+    Modo multiproceso: cada grupo de puertos corre su SerialManager + DeviceLink
+    (y el aprovisionamiento) en un proceso aparte, así el parseo de 16+ adaptadores
+    usa varios núcleos y un puerto que se porta mal sólo frena a su grupo.
+    - Los trabajadores mandan lotes compactos (tramas como tuplas + eventos) por una
+      tubería cada ~20 ms; acá se reparten en señales con la misma forma que DeviceLink.
+    - Un trabajador que muere o deja de latir se reemplaza (hasta `max_restarts`),
+      retomando el aprovisionamiento si estaba activo.
+    - La bitácora la escribe sólo este proceso (eventos EV_JOURNAL); cada registro se
+      reenvía a los demás trabajadores para que salten ese IMEI y cuenten el avance total.
+    """
+
+    frames_received = pyqtSignal(list)               # [(puerto, Frame), ...] de un lote
+    connection_changed = pyqtSignal(bool, str)       # estado, puerto
+    error_occurred = pyqtSignal(str, str)            # mensaje, puerto
+    unit_finished = pyqtSignal(str, str, bool, str)  # puerto, imei, ok, mensaje
+    progress = pyqtSignal(str, int, int)             # puerto, hechos, total
+    clock_synced = pyqtSignal(str, dict)             # puerto, resultado (como ClockSyncJob.port_finished)
+    worker_exited = pyqtSignal(int, list, bool)      # índice, puertos, reiniciado
+
+    def __init__(self, ports: Sequence[str], workers: Optional[int] = None,
+                 settings: Optional[Dict[str, Any]] = None, flush_ms: int = FLUSH_MS,
+                 heartbeat_ms: int = HEARTBEAT_MS, stall_timeout_s: float = STALL_TIMEOUT_S,
+                 max_restarts: int = 3):
+        super().__init__()
+        count = workers if workers is not None else (os.cpu_count() or 1)
+        self.settings = dict(settings or {})
+        self.flush_ms = flush_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_timeout_s = stall_timeout_s
+        self.max_restarts = max_restarts
+        self.workers = [_Worker(i, group) for i, group in enumerate(group_ports(ports, count))]
+        self._by_port = {port: w for w in self.workers for port in w.ports}
+        self._provisioning: Optional[str] = None          # CSV en curso
+        self.journal: Optional[Journal] = None
+        # "spawn" en todos los SO: hacer fork de un proceso con Qt no es seguro
+        self._ctx = multiprocessing.get_context("spawn")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(DRAIN_MS)
+        self._timer.timeout.connect(self._drain)
+
+    # -------------
+    # CONTROL
+    # -------------
+    def start(self) -> None:
+        for w in self.workers:
+            if not w.alive:
+                self._spawn(w)
+        self._timer.start()
+
+    def stop(self, timeout_s: float = 3.0) -> None:
+        """Pide a cada trabajador que cierre sus puertos; termina los que no respondan."""
+        self._timer.stop()
+        for w in self.workers:
+            self._send(w, (CMD_STOP,))
+        deadline = time.monotonic() + timeout_s
+        for w in self.workers:
+            if w.process is not None:
+                w.process.join(max(0.0, deadline - time.monotonic()))
+            self._reap(w)
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def ports(self) -> List[str]:
+        return list(self._by_port)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Estado por trabajador (para diagnóstico)."""
+        return [{"index": w.index, "ports": list(w.ports), "alive": w.alive, "restarts": w.restarts,
+                 "frames": w.frames, "pid": w.process.pid if w.process is not None else None}
+                for w in self.workers]
+
+    # -------------
+    # ENVÍO
+    # -------------
+    def send_command(self, port: str, keyword: str, *args: str) -> bool:
+        """Encola un comando para el puerto. False si el puerto no es del pool o su trabajador no corre."""
+        w = self._by_port.get(port)
+        return w is not None and self._send(w, (CMD_SEND, port, keyword, tuple(args)))
+
+    def send_data_bytes(self, port: str, data: bytes) -> bool:
+        w = self._by_port.get(port)
+        return w is not None and self._send(w, (CMD_RAW, port, bytes(data)))
+
+    def start_provisioning(self, csv_path: str, journal_path: Optional[str] = None) -> None:
+        """Aprovisiona desde el CSV en todos los puertos (cada trabajador con sus propios jobs)."""
+        self.journal = Journal(journal_path or csv_path + ".journal.jsonl")
+        self._provisioning = csv_path
+        for w in self.workers:
+            self._send(w, (CMD_PROVISION, csv_path, tuple(self.journal.done())))
+
+    def stop_provisioning(self) -> None:
+        self._provisioning = None
+        for w in self.workers:
+            self._send(w, (CMD_PROVISION_STOP,))
+
+    def sync_clocks(self) -> int:
+        """SYN en todos los puertos conectados del pool. Devuelve cuántos puertos lo reciben."""
+        return sum(sum(w.connected.values()) for w in self.workers if self._send(w, (CMD_CLOCK_SYNC,)))
+
+    # -------------
+    # INTERNOS
+    # -------------
+    def _spawn(self, w: _Worker) -> None:
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        w.process = self._ctx.Process(
+            target=run_worker, name=f"port-worker-{w.index}", daemon=True,
+            args=(child_conn, w.ports, self.settings, self.flush_ms, self.heartbeat_ms))
+        w.process.start()
+        child_conn.close()                   # sólo el hijo lo usa: así EOF llega cuando muere
+        w.conn = parent_conn
+        w.last_seen = time.monotonic()
+        w.alive = True
+        if self._provisioning is not None:
+            self._send(w, (CMD_PROVISION, self._provisioning, tuple(self.journal.done())))
+
+    def _send(self, w: _Worker, cmd: tuple) -> bool:
+        if not w.alive:
+            return False
+        try:
+            w.conn.send(cmd)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _drain(self) -> None:
+        now = time.monotonic()
+        for w in self.workers:
+            if not w.alive:
+                continue
+            try:
+                for _ in range(MAX_BATCHES_PER_DRAIN):
+                    if not w.conn.poll():
+                        break
+                    frames, events = w.conn.recv()
+                    w.last_seen = now
+                    self._dispatch(w, frames, events)
+            except (EOFError, OSError):
+                self._lost(w)
+                continue
+            if now - w.last_seen > self.stall_timeout_s:
+                self._lost(w)                # colgado (p.ej. un driver que no vuelve): se reemplaza
+
+    def _dispatch(self, w: _Worker, frames: list, events: list) -> None:
+        if frames:
+            w.frames += len(frames)
+            self.frames_received.emit([unpack_frame(f) for f in frames])
+        for ev in events:
+            kind = ev[0]
+            if kind == EV_CONNECTION:
+                w.connected[ev[1]] = ev[2]
+                self.connection_changed.emit(ev[2], ev[1])
+            elif kind == EV_ERROR:
+                self.error_occurred.emit(ev[2], ev[1])
+            elif kind == EV_UNIT:
+                self.unit_finished.emit(ev[1], ev[2], ev[3], ev[4])
+            elif kind == EV_PROGRESS:
+                self.progress.emit(ev[1], ev[2], ev[3])
+            elif kind == EV_JOURNAL:
+                self._journal_record(w, ev[1], ev[2], ev[3])
+            elif kind == EV_CLOCK:
+                self.clock_synced.emit(ev[1], ev[2])
+
+    def _journal_record(self, source: _Worker, imei: str, status: str, msg: str) -> None:
+        if self.journal is None:
+            return
+        self.journal.record(imei, status, msg)
+        for w in self.workers:
+            if w is not source:
+                self._send(w, (CMD_JOURNAL, imei, status))
+
+    def _lost(self, w: _Worker) -> None:
+        self._reap(w)
+        restart = w.restarts < self.max_restarts
+        self.worker_exited.emit(w.index, list(w.ports), restart)
+        if restart:
+            w.restarts += 1
+            self._spawn(w)
+
+    def _reap(self, w: _Worker) -> None:
+        w.alive = False
+        if w.process is not None and w.process.is_alive():
+            w.process.terminate()
+            w.process.join(1.0)
+            if w.process.is_alive():
+                w.process.kill()
+                w.process.join(1.0)
+        if w.conn is not None:
+            w.conn.close()
+            w.conn = None
+        # Sus puertos quedaron cerrados con el proceso
+        for port, connected in list(w.connected.items()):
+            if connected:
+                w.connected[port] = False
+                self.connection_changed.emit(False, port)
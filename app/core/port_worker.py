@@ -0,0 +1,231 @@
+# app/core/port_worker.py — proceso trabajador: SerialManager + protocolo de un grupo de puertos
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer
+
+from app.core.clock_sync_job import ClockSyncJob
+from app.core.device_link import DeviceLink
+from app.core.identity import IdentityReader
+from app.core.protocol import Frame
+from app.core.provisioning import Journal
+from app.core.provisioning_job import ProvisioningJob
+from app.core.serial_manager import SerialManager
+
+FLUSH_MS = 20                  # cada cuánto se envía el lote acumulado al proceso GUI
+HEARTBEAT_MS = 1000            # lote vacío si no hubo nada: el GUI sabe que el trabajador vive
+
+# Comandos GUI -> trabajador (tuplas; la primera posición es el tipo)
+CMD_SEND = "send"              # (CMD_SEND, puerto, keyword, args)
+CMD_RAW = "raw"                # (CMD_RAW, puerto, bytes)
+CMD_PROVISION = "provision"    # (CMD_PROVISION, csv, IMEI ya hechos)
+CMD_PROVISION_STOP = "provision_stop"
+CMD_JOURNAL = "journal"        # (CMD_JOURNAL, imei, estado): registrado por otro trabajador
+CMD_CLOCK_SYNC = "clock_sync"  # (CMD_CLOCK_SYNC,): SYN en los puertos conectados del trabajador
+CMD_STOP = "stop"
+
+# Eventos trabajador -> GUI, dentro de cada lote
+EV_CONNECTION = "connection"   # (EV_CONNECTION, puerto, conectado)
+EV_ERROR = "error"             # (EV_ERROR, puerto, mensaje)
+EV_UNIT = "unit"               # (EV_UNIT, puerto, imei, ok, mensaje)
+EV_PROGRESS = "progress"       # (EV_PROGRESS, puerto, hechos, total)
+EV_JOURNAL = "journal"         # (EV_JOURNAL, imei, estado, mensaje): el GUI lo escribe en la bitácora
+EV_CLOCK = "clock"             # (EV_CLOCK, puerto, resultado de ClockSyncJob)
+
+# Trama compacta: (puerto, device_id, tipo, serie, keyword, args, raw, rx_ns, parsed_ns, matched_ns)
+# El reloj monotónico es del sistema, así que las marcas valen también en el proceso GUI
+PackedFrame = Tuple[str, str, str, str, str, Tuple[str, ...], str, int, int, int]
+# Lote: (tramas, eventos)
+Batch = Tuple[List[PackedFrame], List[tuple]]
+
+
+def pack_frame(frame: Frame, port: str) -> PackedFrame:
+    """Tupla plana: se serializa mucho más chica y rápido que el dataclass."""
+    return (port, frame.device_id, frame.type, frame.serial, frame.keyword, tuple(frame.args), frame.raw,
+            frame.rx_ns, frame.parsed_ns, frame.matched_ns)
+
+
+def unpack_frame(packed: PackedFrame) -> Tuple[str, Frame]:
+    port, device_id, type_, serial, keyword, args, raw, rx_ns, parsed_ns, matched_ns = packed
+    return port, Frame(device_id, type_, serial, keyword, list(args), raw, rx_ns, parsed_ns, matched_ns)
+
+
+def group_ports(ports: Sequence[str], workers: int) -> List[List[str]]:
+    """
+    Reparte los puertos en `workers` grupos de tamaño parejo (como mucho uno por puerto).
+    El orden se conserva dentro de cada grupo.
+    """
+    ports = list(ports)
+    n = max(1, min(workers, len(ports)))
+    return [ports[i::n] for i in range(n)] if ports else []
+
+
+class WorkerJournal(Journal):
+    """
+    Bitácora del trabajador: sólo en memoria. Cada registro sale por `sink` y lo escribe
+    el proceso GUI en el único archivo; así N procesos nunca escriben a la vez en él.
+    """
+
+    def __init__(self, done: Iterable[str], sink: Callable[[str, str, str], None]):
+        super().__init__(None, done)
+        self.sink = sink
+
+    def record(self, imei: str, status: str, msg: str = "") -> None:
+        super().record(imei, status, msg)
+        self.sink(imei, status, msg)
+
+
+class PortWorker(QObject):
+    """
+    Corre en el proceso hijo: un SerialManager + DeviceLink por puerto y, si se pide,
+    un ProvisioningJob por puerto o una sincronización de hora de todo el grupo (la
+    medición de RTT se hace acá, junto al puerto, no a través de la tubería). Todo lo recibido se acumula y sale en un único
+    lote (`Batch`) cada `flush_ms`; los comandos del GUI se leen en el mismo tic.
+    """
+
+    def __init__(self, conn, ports: Sequence[str], settings: Optional[Dict[str, Any]] = None,
+                 flush_ms: int = FLUSH_MS, heartbeat_ms: int = HEARTBEAT_MS):
+        super().__init__()
+        self.conn = conn
+        self.ports = list(ports)
+        self.settings = settings or {}
+        self.heartbeat_s = heartbeat_ms / 1000.0
+        self.managers: Dict[str, SerialManager] = {}
+        self.links: Dict[str, DeviceLink] = {}
+        self.jobs: Dict[str, ProvisioningJob] = {}
+        self.journal: Optional[WorkerJournal] = None
+        self.clock_sync = ClockSyncJob()
+        self.clock_sync.port_finished.connect(lambda port, r: self._events.append((EV_CLOCK, port, r)))
+        self._frames: List[PackedFrame] = []
+        self._events: List[tuple] = []
+        self._last_sent = 0.0
+        self._stopped = False
+
+        for port in self.ports:
+            manager = SerialManager(auto_reconnect=True)
+            link = DeviceLink(manager)
+            link.frame_received.connect(self._on_frame)
+            manager.connection_changed.connect(
+                lambda connected, p, port=port: self._events.append((EV_CONNECTION, p or port, connected)))
+            manager.error_occurred.connect(
+                lambda msg, p, port=port: self._events.append((EV_ERROR, p or port, msg)))
+            self.managers[port] = manager
+            self.links[port] = link
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_ms)
+        self._timer.timeout.connect(self._tick)
+
+    # -------------
+    # CONTROL
+    # -------------
+    def start(self) -> None:
+        for port, manager in self.managers.items():
+            manager.open_port(port, self.settings)
+        self._timer.start()
+        self._flush(force=True)              # primer latido: el GUI sabe que arrancó
+
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        self._timer.stop()
+        self.stop_provisioning()
+        self.clock_sync.stop()
+        for manager in self.managers.values():
+            manager.shutdown()
+        self._flush(force=bool(self._frames or self._events))
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.quit()
+
+    def start_provisioning(self, csv_path: str, done: Iterable[str] = ()) -> None:
+        """Un job por puerto, todos sobre la misma bitácora en memoria (partiendo de `done`)."""
+        self.stop_provisioning()
+        self.journal = WorkerJournal(done, lambda imei, status, msg: self._events.append(
+            (EV_JOURNAL, imei, status, msg)))
+        for port, link in self.links.items():
+            job = ProvisioningJob(link, IdentityReader(link), csv_path, journal=self.journal)
+            job.unit_finished.connect(
+                lambda imei, ok, msg, port=port: self._events.append((EV_UNIT, port, imei, ok, msg)))
+            job.progress.connect(
+                lambda done, total, port=port: self._events.append((EV_PROGRESS, port, done, total)))
+            self.jobs[port] = job
+            job.start()
+
+    def stop_provisioning(self) -> None:
+        for job in self.jobs.values():
+            job.stop()
+        self.jobs.clear()
+
+    # -------------
+    # INTERNOS
+    # -------------
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        self._frames.append(pack_frame(frame, port))
+
+    def _tick(self) -> None:
+        self._read_commands()
+        self._flush()
+
+    def _read_commands(self) -> None:
+        try:
+            while not self._stopped and self.conn.poll():
+                self._handle(self.conn.recv())
+        except (EOFError, OSError):
+            self.stop()                       # el GUI cerró la tubería: no hay a quién reportar
+
+    def _handle(self, cmd: tuple) -> None:
+        kind = cmd[0]
+        if kind == CMD_SEND:
+            _, port, keyword, args = cmd
+            if port in self.links:
+                self.links[port].send_command(keyword, *args)
+        elif kind == CMD_RAW:
+            _, port, data = cmd
+            if port in self.managers:
+                self.managers[port].send_data_bytes(data)
+        elif kind == CMD_PROVISION:
+            try:
+                self.start_provisioning(cmd[1], cmd[2])
+            except (OSError, ValueError) as e:
+                for port in self.ports:
+                    self._events.append((EV_ERROR, port, f"CSV: {e}"))
+        elif kind == CMD_PROVISION_STOP:
+            self.stop_provisioning()
+        elif kind == CMD_JOURNAL:
+            if self.journal is not None:
+                self.journal.mark(cmd[1], cmd[2])
+                for port, job in self.jobs.items():     # el avance es de todo el CSV, no del trabajador
+                    self._events.append((EV_PROGRESS, port, job.done_count(), len(job.index)))
+        elif kind == CMD_CLOCK_SYNC:
+            self.clock_sync.start(list(self.links.values()))
+        elif kind == CMD_STOP:
+            self.stop()
+
+    def _flush(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not (force or self._frames or self._events or now - self._last_sent >= self.heartbeat_s):
+            return
+        batch: Batch = (self._frames, self._events)
+        self._frames, self._events = [], []
+        self._last_sent = now
+        try:
+            self.conn.send(batch)
+        except (OSError, ValueError):
+            if not self._stopped:
+                self.stop()
+
+
+def run_worker(conn, ports: Sequence[str], settings: Optional[Dict[str, Any]] = None,
+               flush_ms: int = FLUSH_MS, heartbeat_ms: int = HEARTBEAT_MS) -> None:
+    """Punto de entrada del proceso hijo (debe ser importable: se usa con el método "spawn")."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    worker = PortWorker(conn, ports, settings, flush_ms, heartbeat_ms)
+    QTimer.singleShot(0, worker.start)
+    try:
+        app.exec()
+    finally:
+        worker.stop()
+        conn.close()
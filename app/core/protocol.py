@@ -0,0 +1,176 @@
+# app/core/protocol.py — tramas de texto JT705A (construcción y parseo)
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Formato de comando: (ID,TIPO,SERIE,KEYWORD,arg1,arg2,...)
+# p.ej. "(700160818000,1,001,BASE,1)". El equipo responde con la misma cabecera
+# (ID, tipo, número de serie y keyword), por lo que la serie sirve para correlacionar.
+DEFAULT_DEVICE_ID = "000000000000"   # comodín: responde el equipo conectado, sea cual sea su ID
+COMMAND_TYPE = "1"
+FRAME_START = b"("
+FRAME_END = b")"
+MAX_FRAME_LEN = 1024                 # descarta basura sin cierre para no crecer sin límite
+
+# Consultas de identidad: campo de BasicInfoPanel -> (keyword, args...)
+IDENTITY_QUERIES: Dict[str, Tuple[str, ...]] = {
+    "id": ("BASE", "1"),
+    "imei": ("IMEI",),
+    "ccid": ("CCID",),
+    "version": ("VERSION",),
+}
+
+# Estado en vivo (sondeo periódico): campo -> (keyword, args...).
+# Ajustar a la hoja de comandos del firmware si algún keyword difiere.
+STATUS_QUERIES: Dict[str, Tuple[str, ...]] = {
+    "battery": ("BATTERY",),
+    "signal": ("CSQ",),
+    "gps": ("GPS",),
+}
+
+# Configuración: keyword -> campos (en el orden en que viajan como argumentos).
+# Una trama sin argumentos es una consulta; con argumentos, una escritura.
+CONFIG_LAYOUT: Dict[str, Tuple[str, ...]] = {
+    "IP1": ("main_ip", "main_port"),
+    "IP2": ("sub_ip", "sub_port"),
+    "APN": ("apn", "apn_user", "apn_pass"),
+    "GMT": ("time_diff",),
+    "TIMER": ("upload_interval",),
+    "WAKEUP": ("wake_interval",),
+    "VIP": ("vip1", "vip2", "vip3", "vip4", "vip5"),
+}
+# Campos que pueden ir vacíos en una escritura (viajan como argumento vacío); el resto del
+# grupo de un keyword es obligatorio: el equipo reescribe todos los argumentos a la vez.
+# La lista VIP se escribe entera; un número vacío deja ese lugar libre.
+OPTIONAL_FIELDS = ("apn_user", "apn_pass", "vip2", "vip3", "vip4", "vip5")
+NET_KEYWORDS = ("IP1", "IP2", "APN")
+TIME_KEYWORDS = ("GMT", "TIMER", "WAKEUP")
+VIP_KEYWORDS = ("VIP",)
+RESET_KEYWORD = "FACTORY"            # args: ALL | IP | COMMON
+WAKE_BYTES = b"\r\n\r\n"             # actividad en RX que saca al equipo del modo sueño
+CLOCK_KEYWORD = "SYN"                # sin args: consulta la hora UTC; con "yyyyMMddHHmmss": la fija
+
+
+@dataclass
+class Frame:
+    """Trama ya separada en campos."""
+    device_id: str
+    type: str
+    serial: str
+    keyword: str
+    args: List[str] = field(default_factory=list)
+    raw: str = ""
+    # Marcas de reloj monotónico (ns) para medir latencias; no cuentan en la igualdad
+    rx_ns: int = field(default=0, compare=False)        # readyRead del lote que la completó
+    parsed_ns: int = field(default=0, compare=False)    # salida del FrameParser
+    matched_ns: int = field(default=0, compare=False)   # correlacionada con su comando
+
+    @property
+    def value(self) -> str:
+        """Último argumento (donde el equipo deja el valor consultado)."""
+        return self.args[-1] if self.args else ""
+
+
+class SerialCounter:
+    """Número de serie de comando 001..999 (vuelve a 001)."""
+
+    def __init__(self, start: int = 1):
+        self._n = max(1, min(999, start)) - 1
+
+    def next(self) -> str:
+        self._n = self._n % 999 + 1
+        return f"{self._n:03d}"
+
+
+def build_command(device_id: str, serial: str, keyword: str, *args: str) -> str:
+    """Arma la trama de texto del comando (sin salto de línea)."""
+    fields = [device_id or DEFAULT_DEVICE_ID, COMMAND_TYPE, serial, keyword.upper(), *[str(a) for a in args]]
+    return "(" + ",".join(fields) + ")"
+
+
+def parse_frame(text: str) -> Optional[Frame]:
+    """Convierte "(ID,TIPO,SERIE,KEYWORD,...)" en Frame. Devuelve None si no es válida."""
+    s = text.strip()
+    if s.startswith("(") and s.endswith(")"):
+        s = s[1:-1]
+    parts = [p.strip() for p in s.split(",")]
+    if len(parts) < 4 or not parts[0]:
+        return None
+    return Frame(parts[0], parts[1], parts[2], parts[3].upper(), parts[4:], text)
+
+
+class FrameParser:
+    """
+    Separa un flujo de bytes en tramas completas.
+    Acepta lecturas parciales (readyRead puede cortar una trama en varias).
+    """
+
+    def __init__(self, encoding: str = "latin-1"):
+        self._buf = bytearray()
+        self._encoding = encoding
+
+    def reset(self) -> None:
+        self._buf.clear()
+
+    def feed(self, data: bytes, rx_ns: int = 0) -> List[Frame]:
+        """Agrega bytes y devuelve las tramas completas, marcadas con `rx_ns` (llegada del lote)."""
+        self._buf += data
+        frames: List[Frame] = []
+        while True:
+            start = self._buf.find(FRAME_START)
+            if start < 0:
+                self._buf.clear()
+                break
+            end = self._buf.find(FRAME_END, start)
+            if end < 0:
+                # Trama incompleta: conserva desde el inicio
+                del self._buf[:start]
+                if len(self._buf) > MAX_FRAME_LEN:
+                    self._buf.clear()
+                break
+            raw = bytes(self._buf[start:end + 1]).decode(self._encoding, errors="replace")
+            del self._buf[:end + 1]
+            frame = parse_frame(raw)
+            if frame is not None:
+                frames.append(frame)
+        if frames:
+            now = time.monotonic_ns()
+            for frame in frames:
+                frame.rx_ns = rx_ns or now
+                frame.parsed_ns = now
+        return frames
+
+
+def is_write(frame: Frame) -> bool:
+    """True si la trama modifica la configuración del equipo (escritura o reset de fábrica)."""
+    if frame.keyword == RESET_KEYWORD:
+        return True
+    return frame.keyword in CONFIG_LAYOUT and bool(frame.args)
+
+
+def config_from_frame(frame: Frame) -> Dict[str, str]:
+    """Extrae los campos de configuración de una respuesta (vacío si no es de configuración)."""
+    fields = CONFIG_LAYOUT.get(frame.keyword)
+    if not fields:
+        return {}
+    return dict(zip(fields, frame.args))
+
+
+def config_commands(config: Dict[str, object], keywords: Optional[Tuple[str, ...]] = None) -> List[Tuple[str, ...]]:
+    """
+    Convierte un dict de configuración en comandos de escritura (keyword, args...).
+    Solo genera los keywords con todos sus campos obligatorios con valor (None o "" cuentan
+    como faltantes; `validate_profile` informa el grupo incompleto campo por campo).
+    Los campos opcionales vacíos viajan como argumento vacío.
+    """
+    commands: List[Tuple[str, ...]] = []
+    for keyword, fields in CONFIG_LAYOUT.items():
+        if keywords is not None and keyword not in keywords:
+            continue
+        values = ["" if config.get(f) is None else str(config.get(f)).strip() for f in fields]
+        if any(v == "" for f, v in zip(fields, values) if f not in OPTIONAL_FIELDS):
+            continue
+        commands.append((keyword, *values))
+    return commands
@@ -0,0 +1,143 @@
+# app/core/provisioning.py — perfiles CSV por IMEI y bitácora de avance (sin Qt)
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from app.core.protocol import CONFIG_LAYOUT
+
+# Columnas reconocidas: "imei" + los campos de protocol.CONFIG_LAYOUT
+CONFIG_FIELDS = tuple(f for fields in CONFIG_LAYOUT.values() for f in fields)
+IMEI_COLUMN = "imei"
+
+
+class ProfileIndex:
+    """
+    Índice IMEI -> posición en el CSV. Recorre el archivo una sola vez
+    guardando solo offsets; la fila se relee del disco cuando se necesita.
+    Un CSV de decenas de miles de filas ocupa unos pocos MB de índice.
+    Limitación: no admite campos entre comillas con saltos de línea.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8-sig"):
+        self.path = path
+        self.encoding = encoding
+        self.header: List[str] = []
+        self._offsets: Dict[str, int] = {}
+        self.duplicates: List[str] = []
+        self._build()
+
+    def _build(self) -> None:
+        with open(self.path, "rb") as f:
+            first = f.readline()
+            self.header = [h.strip().lower() for h in self._split(first)]
+            if IMEI_COLUMN not in self.header:
+                raise ValueError(f"El CSV no tiene columna '{IMEI_COLUMN}'")
+            col = self.header.index(IMEI_COLUMN)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                values = self._split(line)
+                if len(values) <= col:
+                    continue
+                imei = values[col].strip()
+                if not imei:
+                    continue
+                if imei in self._offsets:
+                    self.duplicates.append(imei)   # gana la última fila
+                self._offsets[imei] = offset
+
+    def _split(self, raw: bytes) -> List[str]:
+        text = raw.decode(self.encoding, errors="replace").rstrip("\r\n")
+        return next(csv.reader([text]), [])
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, imei: str) -> bool:
+        return imei in self._offsets
+
+    def imeis(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        """Recorre todas las filas en streaming (para validar el lote completo)."""
+        with open(self.path, "r", encoding=self.encoding, newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for values in reader:
+                if values:
+                    yield {k: v.strip() for k, v in zip(self.header, values)}
+
+    def row(self, imei: str) -> Optional[Dict[str, str]]:
+        offset = self._offsets.get(imei)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            values = self._split(f.readline())
+        return {k: v.strip() for k, v in zip(self.header, values)}
+
+
+def row_to_config(row: Dict[str, str]) -> Dict[str, str]:
+    """Solo los campos de configuración con valor (una celda vacía no se escribe)."""
+    return {k: v for k, v in row.items() if k in CONFIG_FIELDS and v != ""}
+
+
+class Journal:
+    """
+    Bitácora append-only (JSON por línea) del aprovisionamiento.
+    Cada línea: {"ts", "imei", "status": "done"|"failed", "msg"}.
+    Al reanudar, los IMEI cuyo último estado es "done" se saltan.
+    Sin `path` vive sólo en memoria (partiendo de `done`): la usa un proceso trabajador,
+    cuyo archivo escribe un único proceso (ver port_pool).
+    """
+
+    def __init__(self, path: Optional[str], done: Iterable[str] = ()):
+        self.path = path
+        self._status: Dict[str, str] = {imei: "done" for imei in done}
+        self._needs_newline = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._needs_newline = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # última línea truncada por un corte
+                    if isinstance(entry, dict) and entry.get("imei"):
+                        self._status[entry["imei"]] = entry.get("status", "")
+        except OSError:
+            pass
+
+    def done(self) -> Set[str]:
+        return {imei for imei, st in self._status.items() if st == "done"}
+
+    def is_done(self, imei: str) -> bool:
+        return self._status.get(imei) == "done"
+
+    def record(self, imei: str, status: str, msg: str = "") -> None:
+        if self.path:
+            entry = {"ts": round(time.time(), 3), "imei": imei, "status": status, "msg": msg}
+            with open(self.path, "a", encoding="utf-8") as f:
+                if self._needs_newline:
+                    f.write("\n")
+                    self._needs_newline = False
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self._status[imei] = status
+
+    def mark(self, imei: str, status: str) -> None:
+        """Estado registrado en otra parte (otro trabajador): sólo se actualiza la memoria."""
+        self._status[imei] = status
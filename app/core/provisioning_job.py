@@ -0,0 +1,142 @@
+# app/core/provisioning_job.py — aprovisionamiento masivo desde CSV, equipo por equipo
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.identity import IdentityReader
+from app.core.protocol import Frame, config_commands
+from app.core.provisioning import Journal, ProfileIndex, row_to_config
+from app.core.validation import RowError, validate_profile, validate_rows
+
+
+class ProvisioningJob(QObject):
+    """
+    Aplica a cada equipo conectado la fila del CSV que corresponde a su IMEI.
+    - Al conectar un equipo fuerza la lectura de identidad (puede ser otra unidad en el mismo puerto).
+    - Envía la configuración en una sola escritura y espera el eco de cada comando.
+    - Registra el resultado en la bitácora; al reanudar, los IMEI ya hechos se saltan.
+    """
+
+    unit_finished = pyqtSignal(str, bool, str)   # imei, ok, mensaje
+    progress = pyqtSignal(int, int)              # hechos, total
+
+    def __init__(self, link: DeviceLink, identity: IdentityReader, csv_path: str,
+                 journal_path: Optional[str] = None, timeout_ms: int = 5000,
+                 journal: Optional[Journal] = None):
+        super().__init__()
+        self.link = link
+        self.identity = identity
+        self.index = ProfileIndex(csv_path)
+        # `journal` permite compartir una bitácora entre jobs (p.ej. los puertos de un trabajador)
+        self.journal = journal or Journal(journal_path or csv_path + ".journal.jsonl")
+        self._running = False
+        self._imei = ""
+        self._pending: Dict[str, str] = {}       # serie -> keyword
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(timeout_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+    # -------------
+    # CONTROL
+    # -------------
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.identity.identity_ready.connect(self._on_identity)
+        self.link.frame_received.connect(self._on_frame)
+        self.link.manager.connection_changed.connect(self._on_connection_changed)
+        self._emit_progress()
+        if self.link.manager.is_connected():
+            self.identity.refresh(force=True)
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self._timer.stop()
+        self._pending.clear()
+        for sig, slot in ((self.identity.identity_ready, self._on_identity),
+                          (self.link.frame_received, self._on_frame),
+                          (self.link.manager.connection_changed, self._on_connection_changed)):
+            try:
+                sig.disconnect(slot)
+            except Exception:
+                pass
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def validate(self) -> List[RowError]:
+        """Valida el CSV completo en una pasada (fila 1 = primera fila de datos)."""
+        return validate_rows(self.index.iter_rows(), start=1)
+
+    def done_count(self) -> int:
+        return sum(1 for imei in self.journal.done() if imei in self.index)
+
+    # -------------
+    # INTERNOS
+    # -------------
+    def _emit_progress(self) -> None:
+        self.progress.emit(self.done_count(), len(self.index))
+
+    def _on_connection_changed(self, connected: bool, port: str) -> None:
+        if not connected:
+            if self._pending:
+                self._fail("Puerto cerrado durante la escritura")
+            return
+        self.identity.refresh(force=True)
+
+    def _on_identity(self, data: dict, port: str) -> None:
+        imei = data.get("imei", "")
+        if self._pending or not imei:
+            return
+        if self.journal.is_done(imei):
+            self.unit_finished.emit(imei, True, "Ya aprovisionado (bitácora)")
+            return
+        row = self.index.row(imei)
+        if row is None:
+            self.unit_finished.emit(imei, False, "IMEI no está en el CSV")
+            return
+        config = row_to_config(row)
+        errors = validate_profile(config)
+        if errors:
+            msg = "; ".join(f"{k}: {v}" for k, v in errors.items())
+            self.journal.record(imei, "failed", msg)
+            self.unit_finished.emit(imei, False, msg)
+            return
+        commands = config_commands(config)
+        if not commands:
+            self.journal.record(imei, "done", "Fila sin campos de configuración")
+            self.unit_finished.emit(imei, True, "Fila sin campos de configuración")
+            self._emit_progress()
+            return
+        serials = self.link.send_batch(commands)
+        if not serials:
+            return
+        self._imei = imei
+        self._pending = {s: c[0] for s, c in zip(serials, commands)}
+        self._timer.start()
+
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        if self._pending.pop(frame.serial, None) is None:
+            return
+        self.link.latency.matched(frame)
+        if not self._pending:
+            self._timer.stop()
+            self.journal.record(self._imei, "done")
+            self.unit_finished.emit(self._imei, True, "Configuración aplicada")
+            self._emit_progress()
+
+    def _on_timeout(self) -> None:
+        self._fail("Sin respuesta para: " + ", ".join(sorted(self._pending.values())))
+
+    def _fail(self, msg: str) -> None:
+        self._timer.stop()
+        self._pending.clear()
+        self.journal.record(self._imei, "failed", msg)
+        self.unit_finished.emit(self._imei, False, msg)
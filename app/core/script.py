@@ -0,0 +1,115 @@
+# app/core/script.py — guiones de comandos para AdvancedTab (parseo, sin Qt)
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+DEFAULT_REPLY_TIMEOUT_MS = 3000
+MAX_EXPANDED_STEPS = 100_000          # tope para @repeat anidados
+
+_VAR_RX = re.compile(r"\$\{(\w+)\}")
+
+SCRIPT_HELP = """\
+# Una línea = un comando. Directivas:
+#   @timeout 3000          timeout por defecto de espera de respuesta (ms)
+#   @auto_wait on|off      esperar la respuesta de cada comando (on por defecto)
+#   @wait_reply [ms]       esperar la próxima respuesta
+#   @wait /regex/ [ms]     esperar texto recibido que cumpla la regex
+#   @delay 500             pausa fija (ms)
+#   @repeat 3 [var] ... @end
+#   @set nombre valor
+# Variables: ${id} ${serial} ${imei} ${i} y las definidas con @set
+"""
+
+
+class ScriptError(ValueError):
+    """Error de sintaxis en el guion (con número de línea)."""
+
+
+@dataclass
+class Step:
+    kind: str                   # send | wait_reply | wait_pattern | delay | set | timeout | auto_wait
+    arg: str = ""
+    ms: int = 0
+    line: int = 0
+
+
+def substitute(text: str, variables: Dict[str, str]) -> str:
+    """Reemplaza ${nombre}; variables desconocidas quedan tal cual."""
+    return _VAR_RX.sub(lambda m: str(variables.get(m.group(1), m.group(0))), text)
+
+
+def _int(value: str, line: int) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ScriptError(f"Línea {line}: se esperaba un número, no {value!r}") from None
+
+
+def _parse_wait(rest: str, line: int) -> Tuple[str, int]:
+    m = re.match(r"^/(.*)/\s*(\d+)?\s*$", rest)
+    if not m:
+        raise ScriptError(f"Línea {line}: uso: @wait /regex/ [ms]")
+    try:
+        re.compile(m.group(1))
+    except re.error as e:
+        raise ScriptError(f"Línea {line}: regex inválida: {e}") from None
+    return m.group(1), int(m.group(2)) if m.group(2) else 0
+
+
+def parse_script(text: str) -> List[Step]:
+    """Convierte el texto en pasos; los @repeat se expanden aquí."""
+    root: List[Step] = []
+    stack: List[Tuple[List[Step], int, str, int]] = []   # (lista padre, veces, var, línea)
+    current = root
+
+    for n, raw in enumerate(text.splitlines(), start=1):
+        s = raw.strip()
+        if not s or s.startswith("#"):
+            continue
+        if not s.startswith("@"):
+            current.append(Step("send", s, line=n))
+            continue
+
+        name, _, rest = s[1:].partition(" ")
+        name, rest = name.lower(), rest.strip()
+        if name == "repeat":
+            parts = rest.split()
+            if not parts:
+                raise ScriptError(f"Línea {n}: uso: @repeat N [var]")
+            stack.append((current, _int(parts[0], n), parts[1] if len(parts) > 1 else "i", n))
+            current = []
+        elif name == "end":
+            if not stack:
+                raise ScriptError(f"Línea {n}: @end sin @repeat")
+            body = current
+            current, times, var, _ = stack.pop()
+            for k in range(times):
+                current.append(Step("set", f"{var} {k + 1}", line=n))
+                current.extend(body)
+                if len(current) > MAX_EXPANDED_STEPS:
+                    raise ScriptError(f"Línea {n}: el guion expandido supera {MAX_EXPANDED_STEPS} pasos")
+        elif name == "delay":
+            current.append(Step("delay", ms=_int(rest, n), line=n))
+        elif name == "timeout":
+            current.append(Step("timeout", ms=_int(rest, n), line=n))
+        elif name == "wait_reply":
+            current.append(Step("wait_reply", ms=_int(rest, n) if rest else 0, line=n))
+        elif name == "wait":
+            pattern, ms = _parse_wait(rest, n)
+            current.append(Step("wait_pattern", pattern, ms=ms, line=n))
+        elif name == "set":
+            if " " not in rest:
+                raise ScriptError(f"Línea {n}: uso: @set nombre valor")
+            current.append(Step("set", rest, line=n))
+        elif name == "auto_wait":
+            if rest.lower() not in ("on", "off"):
+                raise ScriptError(f"Línea {n}: uso: @auto_wait on|off")
+            current.append(Step("auto_wait", rest.lower(), line=n))
+        else:
+            raise ScriptError(f"Línea {n}: directiva desconocida @{name}")
+
+    if stack:
+        raise ScriptError(f"Línea {stack[-1][3]}: @repeat sin @end")
+    return root
@@ -0,0 +1,178 @@
+# app/core/script_runner.py — ejecución de guiones con ritmo marcado por las respuestas
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.protocol import Frame, parse_frame
+from app.core.script import DEFAULT_REPLY_TIMEOUT_MS, ScriptError, Step, parse_script, substitute
+
+RX_WINDOW = 8192                      # texto recibido que se conserva para @wait /regex/
+
+
+class ScriptRunner(QObject):
+    """
+    Ejecuta un guion de AdvancedTab paso a paso. Cada comando espera su respuesta
+    (misma serie si es una trama, o cualquier dato si es texto libre) y el siguiente
+    sale en cuanto llega: el guion avanza al ritmo real del equipo y los timeouts
+    solo cuentan cuando el equipo no contesta.
+    """
+
+    step_started = pyqtSignal(int, str)          # línea, texto enviado/directiva
+    finished = pyqtSignal(bool, str)             # ok, mensaje
+
+    def __init__(self, link: DeviceLink):
+        super().__init__()
+        self.link = link
+        self._steps: List[Step] = []
+        self._idx = 0
+        self._vars: Dict[str, str] = {}
+        self._timeout_ms = DEFAULT_REPLY_TIMEOUT_MS
+        self._auto_wait = True
+        self._waiting = ""                      # "" | reply | pattern | delay | next
+        self._wait_line = 0
+        self._expect_serial: Optional[str] = None
+        self._expect_frame = False
+        self._pattern: Optional[re.Pattern] = None
+        self._rx_text = ""
+        self._run_id = 0                        # descarta avances pendientes de un guion anterior
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timer)
+
+        link.frame_received.connect(self._on_frame)
+        link.manager.data_received.connect(self._on_data)
+
+    # -------------
+    # API
+    # -------------
+    def start(self, text: str, variables: Optional[Dict[str, str]] = None) -> bool:
+        if self.is_running():
+            return False
+        try:
+            self._steps = parse_script(text)
+        except ScriptError as e:
+            self.finished.emit(False, str(e))
+            return False
+        self._idx = 0
+        self._vars = {k: str(v) for k, v in (variables or {}).items()}
+        self._timeout_ms = DEFAULT_REPLY_TIMEOUT_MS
+        self._auto_wait = True
+        self._rx_text = ""
+        self._run_id += 1
+        self._schedule_advance()
+        return True
+
+    def stop(self) -> None:
+        if self.is_running():
+            self._finish(False, "Guion detenido")
+
+    def is_running(self) -> bool:
+        return bool(self._waiting)
+
+    # -------------
+    # MOTOR
+    # -------------
+    def _advance(self) -> None:
+        if self._waiting not in ("next", "delay"):
+            return  # detenido mientras esperaba el siguiente ciclo
+        self._waiting = ""
+        self._timer.stop()
+        while self._idx < len(self._steps):
+            step = self._steps[self._idx]
+            self._idx += 1
+            if step.kind == "set":
+                name, _, value = step.arg.partition(" ")
+                self._vars[name] = substitute(value.strip(), self._variables())
+            elif step.kind == "timeout":
+                self._timeout_ms = step.ms
+            elif step.kind == "auto_wait":
+                self._auto_wait = step.arg == "on"
+            elif step.kind == "send":
+                if not self._send(step):
+                    return
+                if self._auto_wait:
+                    self._wait("reply", step.line, self._timeout_ms)
+                    return
+            elif step.kind == "delay":
+                self.step_started.emit(step.line, f"@delay {step.ms}")
+                self._wait("delay", step.line, step.ms)
+                return
+            elif step.kind == "wait_reply":
+                self._expect_serial, self._expect_frame = None, False
+                self._wait("reply", step.line, step.ms or self._timeout_ms)
+                return
+            elif step.kind == "wait_pattern":
+                self._pattern = re.compile(step.arg)
+                if self._pattern.search(self._rx_text):
+                    continue  # ya llegó desde el último envío
+                self._wait("pattern", step.line, step.ms or self._timeout_ms)
+                return
+        self._finish(True, f"Guion completado ({len(self._steps)} pasos)")
+
+    def _variables(self) -> Dict[str, str]:
+        return {"id": self.link.device_id, **self._vars}
+
+    def _send(self, step: Step) -> bool:
+        variables = self._variables()
+        if "${serial}" in step.arg:
+            variables["serial"] = self.link.next_serial()
+        text = substitute(step.arg, variables)
+        if not self.link.manager.is_connected():
+            self._finish(False, f"Línea {step.line}: puerto no abierto")
+            return False
+        frame = parse_frame(text) if text.startswith("(") else None
+        self._expect_frame = frame is not None
+        self._expect_serial = frame.serial if frame else None
+        self._rx_text = ""
+        self.step_started.emit(step.line, text)
+        self.link.manager.send_data_str(text)
+        return True
+
+    def _wait(self, what: str, line: int, ms: int) -> None:
+        self._waiting = what
+        self._wait_line = line
+        self._timer.start(max(0, ms))
+
+    def _schedule_advance(self) -> None:
+        # Avanza después de que todos los receptores procesen este lote de datos
+        self._waiting = "next"
+        self._timer.stop()
+        run_id = self._run_id
+        QTimer.singleShot(0, lambda: run_id == self._run_id and self._advance())
+
+    def _finish(self, ok: bool, msg: str) -> None:
+        self._timer.stop()
+        self._waiting = ""
+        self._run_id += 1
+        self._steps = []
+        self.finished.emit(ok, msg)
+
+    # -------------
+    # EVENTOS
+    # -------------
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        if self._waiting != "reply" or not self._expect_frame:
+            return
+        if self._expect_serial is None or frame.serial == self._expect_serial:
+            self._schedule_advance()
+
+    def _on_data(self, data: bytes, port: str) -> None:
+        if not self._waiting:
+            return
+        self._rx_text = (self._rx_text + data.decode("latin-1", errors="replace"))[-RX_WINDOW:]
+        if self._waiting == "pattern" and self._pattern.search(self._rx_text):
+            self._schedule_advance()
+        elif self._waiting == "reply" and not self._expect_frame:
+            self._schedule_advance()
+
+    def _on_timer(self) -> None:
+        if self._waiting == "delay":
+            self._advance()
+        elif self._waiting == "reply":
+            self._finish(False, f"Línea {self._wait_line}: sin respuesta en {self._timer.interval()} ms")
+        elif self._waiting == "pattern":
+            self._finish(False, f"Línea {self._wait_line}: no llegó /{self._pattern.pattern}/")
@@ -0,0 +1,256 @@
+# app/core/serial_gateway.py — pasarela serie <-> socket local con varios clientes
+#
+#   python -m app.core.serial_gateway /dev/ttyUSB0 --tcp 127.0.0.1:7000 --local configver-gw
+#
+# Un solo proceso abre el puerto; guiones de prueba, monitores y la GUI se conectan
+# por TCP (o socket local: Unix en Linux, named pipe en Windows) y ven el mismo flujo.
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+from typing import Dict, List, Optional, Union
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QHostAddress, QLocalServer, QLocalSocket, QTcpServer, QTcpSocket
+
+from app.core.serial_manager import SerialManager
+
+MAX_BUFFER = 256 * 1024        # bytes pendientes por cliente antes de considerarlo lento
+MAX_LINE = 4096                # una escritura sin fin de línea más larga se reenvía igual
+MAX_CLIENTS = 32
+POLICY_DROP = "drop"           # cliente lento: se desconecta
+POLICY_SKIP = "skip"           # cliente lento: pierde lo que no entra (queda contado en `skipped`)
+
+_Socket = Union[QTcpSocket, QLocalSocket]
+
+
+class _Client:
+    def __init__(self, name: str, sock: _Socket):
+        self.name = name
+        self.sock = sock
+        self.partial = bytearray()             # escritura sin completar (sin "\n" todavía)
+        self.queued: List[bytes] = []          # líneas en espera del turno de escritura
+        self.queued_bytes = 0
+        self.skipped = 0                       # bytes RX que no se le entregaron (política skip)
+        self.rejected = 0                      # bytes TX descartados por cola llena
+
+
+class SerialGateway(QObject):
+    """
+    Dueña única del puerto: reparte lo recibido a todos los clientes y arbitra sus escrituras.
+    - Cada cliente tiene un buffer de salida acotado (`max_buffer`); si no lee a tiempo se
+      desconecta (POLICY_DROP) o se le saltean datos (POLICY_SKIP), sin frenar a los demás.
+    - Las escrituras se reenvían por líneas completas, así dos clientes nunca intercalan
+      medio comando cada uno.
+    - Con `lease_ms` > 0 quien escribe retiene el turno ese tiempo (para esperar su respuesta);
+      las líneas de los demás esperan en cola y se envían por turnos al liberarse.
+    """
+
+    client_connected = pyqtSignal(str)           # nombre del cliente
+    client_dropped = pyqtSignal(str, str)        # nombre, motivo
+
+    def __init__(self, manager: SerialManager, max_buffer: int = MAX_BUFFER,
+                 slow_policy: str = POLICY_DROP, lease_ms: int = 0, max_clients: int = MAX_CLIENTS):
+        super().__init__()
+        if slow_policy not in (POLICY_DROP, POLICY_SKIP):
+            raise ValueError(f"Política desconocida: {slow_policy}")
+        self.manager = manager
+        self.max_buffer = max_buffer
+        self.slow_policy = slow_policy
+        self.max_clients = max_clients
+        self.clients: Dict[str, _Client] = {}
+        self._seq = 0
+        self._holder: Optional[str] = None       # cliente con el turno de escritura
+        self._tcp: Optional[QTcpServer] = None
+        self._local: Optional[QLocalServer] = None
+
+        self._lease = QTimer(self)
+        self._lease.setSingleShot(True)
+        self._lease.setInterval(lease_ms)
+        self._lease.timeout.connect(self._next_turn)
+        self.lease_ms = lease_ms
+
+        manager.data_received.connect(self._on_data)
+
+    # -------------
+    # ESCUCHA
+    # -------------
+    def listen_tcp(self, host: str = "127.0.0.1", port: int = 0) -> bool:
+        """Escucha en TCP (por defecto sólo localhost; port=0 elige uno libre)."""
+        self._tcp = QTcpServer(self)
+        self._tcp.newConnection.connect(self._accept_tcp)
+        return self._tcp.listen(QHostAddress(host), port)
+
+    def tcp_port(self) -> int:
+        return self._tcp.serverPort() if self._tcp is not None and self._tcp.isListening() else 0
+
+    def listen_local(self, name: str) -> bool:
+        """Escucha en un socket local (ruta o nombre; named pipe en Windows)."""
+        QLocalServer.removeServer(name)          # socket huérfano de una ejecución anterior
+        self._local = QLocalServer(self)
+        self._local.newConnection.connect(self._accept_local)
+        return self._local.listen(name)
+
+    def local_name(self) -> str:
+        return self._local.fullServerName() if self._local is not None and self._local.isListening() else ""
+
+    def close(self) -> None:
+        for server in (self._tcp, self._local):
+            if server is not None:
+                server.close()
+        for name in list(self.clients):
+            self._drop(name, "Pasarela cerrada")
+        self._lease.stop()
+
+    # -------------
+    # CLIENTES
+    # -------------
+    def _accept_tcp(self) -> None:
+        while self._tcp.hasPendingConnections():
+            sock = self._tcp.nextPendingConnection()
+            self._add(sock, f"tcp:{sock.peerAddress().toString()}:{sock.peerPort()}")
+
+    def _accept_local(self) -> None:
+        while self._local.hasPendingConnections():
+            self._add(self._local.nextPendingConnection(), "local")
+
+    def _add(self, sock: _Socket, label: str) -> None:
+        if len(self.clients) >= self.max_clients:
+            sock.abort()
+            sock.deleteLater()
+            return
+        self._seq += 1
+        name = f"{label}#{self._seq}"
+        self.clients[name] = _Client(name, sock)
+        sock.readyRead.connect(lambda name=name: self._on_client_data(name))
+        sock.disconnected.connect(lambda name=name: self._drop(name, "Desconectado"))
+        self.client_connected.emit(name)
+
+    def _drop(self, name: str, reason: str) -> None:
+        client = self.clients.pop(name, None)
+        if client is None:
+            return
+        try:
+            client.sock.disconnected.disconnect()
+            client.sock.readyRead.disconnect()
+        except Exception:
+            pass
+        client.sock.abort()
+        client.sock.deleteLater()
+        if self._holder == name:
+            self._lease.stop()
+            self._next_turn()
+        self.client_dropped.emit(name, reason)
+
+    # -------------
+    # RX: puerto -> clientes
+    # -------------
+    def _on_data(self, data: bytes, port: str) -> None:
+        for name, client in list(self.clients.items()):
+            if client.sock.bytesToWrite() + len(data) > self.max_buffer:
+                if self.slow_policy == POLICY_DROP:
+                    self._drop(name, "Cliente lento (buffer lleno)")
+                else:
+                    client.skipped += len(data)
+                continue
+            client.sock.write(data)
+
+    # -------------
+    # TX: clientes -> puerto
+    # -------------
+    def _on_client_data(self, name: str) -> None:
+        client = self.clients.get(name)
+        if client is None:
+            return
+        client.partial += bytes(client.sock.readAll())
+        end = client.partial.rfind(b"\n") + 1
+        if end == 0 and len(client.partial) > MAX_LINE:
+            end = len(client.partial)            # binario / sin fin de línea: no se retiene sin límite
+        if end == 0:
+            return
+        chunk = bytes(client.partial[:end])
+        del client.partial[:end]
+        self._write(client, chunk)
+
+    def _write(self, client: _Client, chunk: bytes) -> None:
+        if self.lease_ms <= 0 or self._holder in (None, client.name):
+            self._grant(client.name)
+            self.manager.send_data_bytes(chunk)
+            return
+        if client.queued_bytes + len(chunk) > self.max_buffer:
+            client.rejected += len(chunk)
+            return
+        client.queued.append(chunk)
+        client.queued_bytes += len(chunk)
+
+    def _grant(self, name: str) -> None:
+        if self.lease_ms > 0:
+            self._holder = name
+            self._lease.start()
+
+    def _next_turn(self) -> None:
+        """Libera el turno y lo pasa al siguiente cliente con escrituras en cola (por orden de llegada)."""
+        previous = self._holder
+        self._holder = None
+        names = list(self.clients)
+        if previous in names:                    # rota: el que lo tuvo queda último
+            i = names.index(previous) + 1
+            names = names[i:] + names[:i]
+        for name in names:
+            client = self.clients[name]
+            if client.queued:
+                chunk = b"".join(client.queued)
+                client.queued.clear()
+                client.queued_bytes = 0
+                self._grant(name)
+                self.manager.send_data_bytes(chunk)
+                return
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Comparte un puerto serie por TCP y/o socket local.")
+    parser.add_argument("port", help="puerto serie (COM7, /dev/ttyUSB0, ...)")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--tcp", help="HOST:PUERTO (p.ej. 127.0.0.1:7000)")
+    parser.add_argument("--local", help="nombre o ruta del socket local")
+    parser.add_argument("--max-buffer", type=int, default=MAX_BUFFER, help="bytes pendientes por cliente")
+    parser.add_argument("--policy", choices=(POLICY_DROP, POLICY_SKIP), default=POLICY_DROP)
+    parser.add_argument("--lease-ms", type=int, default=0, help="turno de escritura por cliente (0 = sin turnos)")
+    args = parser.parse_args(argv)
+    if not args.tcp and not args.local:
+        parser.error("indica --tcp y/o --local")
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    manager = SerialManager(auto_reconnect=True)
+    gateway = SerialGateway(manager, args.max_buffer, args.policy, args.lease_ms)
+    manager.error_occurred.connect(lambda msg, port: print(f"[{port}] {msg}", file=sys.stderr))
+    gateway.client_connected.connect(lambda name: print(f"+ {name}", file=sys.stderr))
+    gateway.client_dropped.connect(lambda name, why: print(f"- {name}: {why}", file=sys.stderr))
+
+    if args.tcp:
+        host, _, port = args.tcp.rpartition(":")
+        if not gateway.listen_tcp(host or "127.0.0.1", int(port)):
+            print(f"No se pudo escuchar en {args.tcp}", file=sys.stderr)
+            return 2
+        print(f"TCP {host or '127.0.0.1'}:{gateway.tcp_port()}", file=sys.stderr)
+    if args.local:
+        if not gateway.listen_local(args.local):
+            print(f"No se pudo crear el socket local {args.local}", file=sys.stderr)
+            return 2
+        print(f"Local {gateway.local_name()}", file=sys.stderr)
+    if not manager.open_port(args.port, {'baud_rate': args.baud}):
+        return 2
+
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    poll = QTimer()                              # deja que Python atienda Ctrl+C
+    poll.timeout.connect(lambda: None)
+    poll.start(200)
+    try:
+        return app.exec()
+    finally:
+        gateway.close()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 # app/serial_manager.py
 from __future__ import annotations
 
+import time
 from typing import Optional, Dict, Any, List
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal, QIODevice
 from PyQt6.QtSerialPort import QSerialPort, QSerialPortInfo
@@ -14,11 +15,14 @@ class SerialManager(QObject):
     - Reconexión opcional si el mismo puerto reaparece (auto_reconnect=True).
       * Si el usuario cierra manualmente, NO reconecta.
     - Señales: data_received, data_sent, error_occurred, connection_changed, ports_updated.
+      `data_received_ns` es la misma recepción con la marca de llegada (time.monotonic_ns)
+      tomada en readyRead; se emite antes que `data_received`.
     - Cierre seguro: limpia buffers, baja DTR/RTS, espera escritura, desconecta señales.
     """
 
     # Señales Qt
     data_received = pyqtSignal(bytes, str)           # datos, puerto
+    data_received_ns = pyqtSignal(bytes, str, 'qint64')  # datos, puerto, llegada (ns monotónico)
     data_sent = pyqtSignal(bytes, str)               # datos, puerto
     error_occurred = pyqtSignal(str, str)            # mensaje, puerto
     connection_changed = pyqtSignal(bool, str)       # estado, puerto
@@ -51,12 +55,13 @@ class SerialManager(QObject):
         self.serial: Optional[QSerialPort] = None
         self.port_name: str = ""                     # puerto objetivo (puede estar cerrado)
         self._last_ports: List[str] = []             # cache para emitir ports_updated solo en cambios
+        self._ports_info: Dict[str, Dict[str, Any]] = {}  # info del último escaneo (una sola enumeración)
         self._scan_interval_ms = scan_interval_ms
         self._auto_reconnect = auto_reconnect
         self._shutting_down = False
 
         self._scan_timer = QTimer(self)
-        self._scan_timer.timeout.connect(self._scan_ports)
+        self._scan_timer.timeout.connect(self.scan_ports)
         self._scan_timer.start(self._scan_interval_ms)
 
     # QObjects y __del__ no son confiables, pero lo dejamos de red de seguridad
@@ -69,29 +74,38 @@ class SerialManager(QObject):
     # --------------------
     # ESCANEO DE PUERTOS
     # --------------------
-    def _scan_ports(self) -> None:
-        ports = self.get_list_ports()
+    def scan_ports(self) -> None:
+        """Escanea ya (sin esperar al timer): emite ports_updated si la lista cambió y reintenta reconectar."""
+        available = QSerialPortInfo.availablePorts()
+        self._ports_info = {p.portName(): self._info_dict(p) for p in available}
+        ports = list(self._ports_info)
         if ports != self._last_ports:
             self._last_ports = ports
             self.ports_updated.emit(ports)
-        self._try_reconnect()
+        self._try_reconnect(ports)
 
     def get_list_ports(self) -> list[str]:
         """Devuelve los nombres de los puertos disponibles (p.ej., ['COM7', 'COM11'])."""
         return [port.portName() for port in QSerialPortInfo.availablePorts()]
 
+    @staticmethod
+    def _info_dict(port: QSerialPortInfo) -> Dict[str, Any]:
+        return {
+            'description': port.description(),
+            'manufacturer': port.manufacturer(),
+            'serial_number': port.serialNumber(),
+            'vendor_id': port.vendorIdentifier() if port.hasVendorIdentifier() else None,
+            'product_id': port.productIdentifier() if port.hasProductIdentifier() else None,
+            'system_location': port.systemLocation(),
+        }
+
     def get_port_info(self, port_name: str) -> Dict[str, Any]:
-        """Devuelve información detallada de un puerto."""
+        """Devuelve información detallada de un puerto (del último escaneo si está)."""
+        if port_name in self._ports_info:
+            return dict(self._ports_info[port_name])
         for port in QSerialPortInfo.availablePorts():
             if port.portName() == port_name:
-                return {
-                    'description': port.description(),
-                    'manufacturer': port.manufacturer(),
-                    'serial_number': port.serialNumber(),
-                    'vendor_id': port.vendorIdentifier(),
-                    'product_id': port.productIdentifier(),
-                    'system_location': port.systemLocation(),
-                }
+                return self._info_dict(port)
         return {}
 
     # -------------
@@ -145,8 +159,14 @@ class SerialManager(QObject):
     def close_port(self, _restart_scan: bool = True, user_requested: bool = True) -> None:
         """
         Cierra el puerto si está abierto y limpia correctamente.
-        Si user_requested=True, se limpia `port_name` para no reconectar automáticamente.
+        Si user_requested=True, se limpia `port_name` para no reconectar automáticamente
+        (antes de emitir `connection_changed`, así los receptores distinguen el cierre manual).
         """
+        name = self.port_name
+        if user_requested:
+            # El usuario cerró: no intentes reconectar a este puerto
+            self.port_name = ""
+
         if self.serial:
             try:
                 # Evita callbacks durante cierre
@@ -184,7 +204,6 @@ class SerialManager(QObject):
                     except Exception:
                         pass
 
-                    name = self.port_name
                     self.serial.close()
                     self.connection_changed.emit(False, name)
             finally:
@@ -194,10 +213,6 @@ class SerialManager(QObject):
                     pass
                 self.serial = None
 
-        if user_requested:
-            # El usuario cerró: no intentes reconectar a este puerto
-            self.port_name = ""
-
         if _restart_scan and not self._shutting_down:
             self._scan_timer.start(self._scan_interval_ms)
 
@@ -206,12 +221,12 @@ class SerialManager(QObject):
         if self.port_name:
             self.open_port(self.port_name)
 
-    def _try_reconnect(self) -> None:
+    def _try_reconnect(self, ports: Optional[List[str]] = None) -> None:
         """Reconecta automáticamente si `auto_reconnect=True` y el puerto reaparece."""
         if not self._auto_reconnect:
             return
         if not self.is_connected() and self.port_name:
-            if self.port_name in self.get_list_ports():
+            if self.port_name in (ports if ports is not None else self.get_list_ports()):
                 self.open_port(self.port_name)
 
     # -------------
@@ -234,6 +249,27 @@ class SerialManager(QObject):
             'flow_control': self.serial.flowControl(),
         }
 
+    def set_control_lines(self, dtr: Optional[bool] = None, rts: Optional[bool] = None) -> bool:
+        """Fija DTR/RTS (p.ej. para el pin de despertar del equipo). False si no se pudo."""
+        if not self.is_connected():
+            return False
+        # Sin líneas de control (pty, algunos adaptadores) Qt emite UnsupportedOperationError:
+        # no es un fallo del puerto, así que no se propaga a error_occurred
+        self.serial.blockSignals(True)
+        try:
+            ok = True
+            if dtr is not None:
+                ok = self.serial.setDataTerminalReady(dtr) and ok
+            if rts is not None:
+                ok = self.serial.setRequestToSend(rts) and ok
+            if not ok:
+                self.serial.clearError()
+            return ok
+        except Exception:
+            return False
+        finally:
+            self.serial.blockSignals(False)
+
     # -------------
     # ENVÍO
     # -------------
@@ -281,9 +317,11 @@ class SerialManager(QObject):
     # RECEPCIÓN
     # -------------
     def _handle_ready_read(self) -> None:
+        rx_ns = time.monotonic_ns()                  # antes de leer: incluye la copia de readAll
         if self.serial and self.serial.isOpen():
             data = bytes(self.serial.readAll())
             if data:
+                self.data_received_ns.emit(data, self.port_name, rx_ns)
                 self.data_received.emit(data, self.port_name)
 
     # -------------
@@ -0,0 +1,190 @@
+# app/core/session_db.py — historial persistente de comandos y respuestas en SQLite (sin Qt)
+from __future__ import annotations
+
+import getpass
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.protocol import Frame
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    started   REAL NOT NULL,
+    operator  TEXT NOT NULL,
+    host      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frames (
+    id         INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    ts         REAL NOT NULL,
+    direction  TEXT NOT NULL,          -- 'tx' | 'rx'
+    port       TEXT NOT NULL,
+    device_id  TEXT NOT NULL,
+    imei       TEXT NOT NULL,
+    serial     TEXT NOT NULL,
+    keyword    TEXT NOT NULL,
+    args       TEXT NOT NULL,          -- argumentos separados por coma
+    raw        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frames_imei_ts ON frames (imei, ts);
+CREATE INDEX IF NOT EXISTS frames_keyword_ts ON frames (keyword, ts);
+CREATE INDEX IF NOT EXISTS frames_ts ON frames (ts);
+"""
+
+_COLUMNS = ("session_id", "ts", "direction", "port", "device_id", "imei", "serial", "keyword", "args", "raw")
+_INSERT = f"INSERT INTO frames ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+class SessionDB:
+    """
+    Historial de tramas enviadas y recibidas, por equipo (IMEI) y operador.
+    - `log_frame()` solo encola (no toca el disco): se puede llamar desde el hilo GUI.
+    - Un hilo escritor inserta por lotes en una transacción (WAL, synchronous=NORMAL).
+    - Las consultas usan su propia conexión de lectura; WAL permite leer mientras se escribe.
+    """
+
+    def __init__(self, path: str, operator: Optional[str] = None,
+                 batch_size: int = 1000, flush_interval_s: float = 0.25):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.dropped = 0                                # filas perdidas por error de escritura
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._local = threading.local()
+        self._closed = False
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                cur = conn.execute("INSERT INTO sessions (started, operator, host) VALUES (?, ?, ?)",
+                                   (time.time(), operator or _operator(), socket.gethostname()))
+            self.session_id = cur.lastrowid
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="session-db", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -------------
+    # ESCRITURA (cualquier hilo)
+    # -------------
+    def log_frame(self, direction: str, port: str, frame: Frame, imei: str = "") -> None:
+        if self._closed:
+            return
+        self._queue.put((self.session_id, time.time(), direction, port, frame.device_id, imei,
+                         frame.serial, frame.keyword, ",".join(frame.args), frame.raw))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera a que todo lo encolado hasta ahora esté en disco."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout=5.0)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -------------
+    # HILO ESCRITOR
+    # -------------
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                rows: List[Tuple] = []
+                waiters: List[threading.Event] = []
+                deadline = time.monotonic() + self.flush_interval_s
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        rows.append(item)
+                    if stop or len(rows) >= self.batch_size:
+                        break
+                    try:
+                        # Junta lo que llegue hasta llenar el lote o vencer el intervalo
+                        remaining = deadline - time.monotonic()
+                        item = self._queue.get(timeout=remaining) if remaining > 0 and not waiters \
+                            else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if rows:
+                    try:
+                        with conn:
+                            conn.executemany(_INSERT, rows)
+                    except sqlite3.Error:
+                        self.dropped += len(rows)
+                for w in waiters:
+                    w.set()
+        finally:
+            conn.close()
+
+    # -------------
+    # CONSULTAS (hilo que llama)
+    # -------------
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    def history(self, imei: Optional[str] = None, keyword: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                operator: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Tramas más recientes primero, filtradas por IMEI, comando, rango de tiempo u operador."""
+        where, params = [], []
+        if imei:
+            where.append("f.imei = ?")
+            params.append(imei)
+        if keyword:
+            where.append("f.keyword = ?")
+            params.append(keyword.upper())
+        if since is not None:
+            where.append("f.ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("f.ts < ?")
+            params.append(until)
+        if operator:
+            where.append("s.operator = ?")
+            params.append(operator)
+        sql = ("SELECT f.*, s.operator FROM frames f JOIN sessions s ON s.id = f.session_id"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY f.ts DESC LIMIT ?")
+        params.append(limit)
+        return [dict(r) for r in self._reader().execute(sql, params)]
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM frames").fetchone()[0]
+
+
+def _operator() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return os.environ.get("USERNAME", "") or "?"
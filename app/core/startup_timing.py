@@ -0,0 +1,152 @@
+# app/core/startup_timing.py — medición de arranque en frío (imports y primer pintado)
+from __future__ import annotations
+
+import importlib.abc
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+ENV_REPORT = "CONFIGVER_STARTUP_REPORT"      # "1" -> imprime el informe en stderr
+ENV_BUDGET = "CONFIGVER_STARTUP_BUDGET_MS"   # presupuesto hasta el primer pintado
+DEFAULT_BUDGET_MS = 1500.0
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """
+    Envuelve el loader real y mide `create_module` + `exec_module`
+    (en extensiones C como PyQt6.QtWidgets el coste está en create_module).
+    """
+
+    def __init__(self, loader, name: str, timer: "ImportTimer"):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+        self._created = (0.0, 0.0)              # (total, hijos) de create_module
+
+    def _timed(self, fn, *args):
+        stack = self._timer._stack
+        stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            total = time.perf_counter() - t0
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            self._last = (total, children)
+
+    def create_module(self, spec):
+        module = self._timed(self._loader.create_module, spec)
+        self._created = self._last
+        return module
+
+    def exec_module(self, module):
+        # Que el módulo vea su loader original (algunos lo inspeccionan)
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        try:
+            self._timed(self._loader.exec_module, module)
+        finally:
+            total = self._last[0] + self._created[0]
+            children = self._last[1] + self._created[1]
+            self._timer.modules[self._name] = (total - children, total)
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Finder en sys.meta_path que registra el tiempo de import de cada módulo."""
+
+    def __init__(self):
+        self.modules: Dict[str, Tuple[float, float]] = {}   # nombre -> (propio, inclusivo) en s
+        self._stack: List[float] = []
+        self._busy = False
+
+    def find_spec(self, fullname, path, target=None):
+        if self._busy:
+            return None
+        self._busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, fullname, self)
+                    return spec
+            return None
+        finally:
+            self._busy = False
+
+    def install(self) -> None:
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class StartupTimer:
+    """
+    Marcas de tiempo del arranque desde la creación del objeto (~inicio del proceso).
+    `report()` devuelve el texto con las marcas, los imports más lentos y el
+    veredicto frente al presupuesto del primer pintado.
+    """
+
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS, track_imports: bool = True):
+        self.t0 = time.perf_counter()
+        self.budget_ms = budget_ms
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: Optional[ImportTimer] = ImportTimer() if track_imports else None
+        if self.imports:
+            self.imports.install()
+
+    @classmethod
+    def from_env(cls) -> Optional["StartupTimer"]:
+        """Activo solo si CONFIGVER_STARTUP_REPORT=1 (sin coste en uso normal)."""
+        if os.environ.get(ENV_REPORT, "") not in ("1", "true", "yes"):
+            return None
+        try:
+            budget = float(os.environ.get(ENV_BUDGET, DEFAULT_BUDGET_MS))
+        except ValueError:
+            budget = DEFAULT_BUDGET_MS
+        return cls(budget_ms=budget)
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, (time.perf_counter() - self.t0) * 1000.0))
+
+    def elapsed_ms(self, name: str) -> Optional[float]:
+        for n, ms in self.marks:
+            if n == name:
+                return ms
+        return None
+
+    def finish(self) -> None:
+        if self.imports:
+            self.imports.uninstall()
+
+    def over_budget(self) -> bool:
+        first_paint = self.elapsed_ms("first_paint")
+        return first_paint is not None and first_paint > self.budget_ms
+
+    def report(self, top: int = 15) -> str:
+        lines = ["== Startup timing =="]
+        for name, ms in self.marks:
+            lines.append(f"  {name:<24} {ms:8.1f} ms")
+        if self.imports and self.imports.modules:
+            mods = sorted(self.imports.modules.items(), key=lambda kv: kv[1][0], reverse=True)
+            total = sum(own for own, _ in self.imports.modules.values()) * 1000.0
+            lines.append(f"-- imports: {len(mods)} módulos, {total:.1f} ms (top {top} por tiempo propio)")
+            for name, (own, incl) in mods[:top]:
+                lines.append(f"  {name:<40} {own * 1000:7.1f} ms  (incl. {incl * 1000:7.1f})")
+        first_paint = self.elapsed_ms("first_paint")
+        if first_paint is not None:
+            verdict = "OVER BUDGET" if self.over_budget() else "ok"
+            lines.append(f"-- first paint {first_paint:.1f} ms / budget {self.budget_ms:.0f} ms: {verdict}")
+        return "\n".join(lines)
@@ -0,0 +1,162 @@
+# app/core/tracing.py — trazado opcional de handlers y exportación a Chrome trace (sin Qt)
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ENV_TRACE = "CONFIGVER_TRACE"                # ruta del .json -> activa el trazado
+MAX_EVENTS = 500_000                          # buffer circular (~40 MB en el peor caso)
+
+# (módulo, clase, métodos, categoría). Los métodos que no existan se ignoran,
+# así se pueden listar etapas del parser que aún no están escritas.
+DEFAULT_TARGETS: Tuple[Tuple[str, str, Tuple[str, ...], str], ...] = (
+    ("app.core.serial_manager", "SerialManager",
+     ("_handle_ready_read", "scan_ports", "send_data_bytes", "_handle_error",
+      "open_port", "close_port", "_try_reconnect"), "serial"),
+    ("app.core.protocol", "FrameParser", ("feed",), "parser"),
+    ("app.core.device_link", "DeviceLink", ("_on_data", "send_batch"), "link"),
+    ("app.core.identity", "IdentityReader", ("refresh", "_on_frame"), "identity"),
+    ("app.core.config_reader", "ConfigReader", ("read", "_on_frame"), "config"),
+    ("app.core.provisioning_job", "ProvisioningJob", ("_on_identity", "_on_frame"), "provisioning"),
+    ("app.core.script_runner", "ScriptRunner", ("_advance", "_on_frame", "_on_data"), "script"),
+    ("app.ui.main_window", "MainWindow",
+     ("_append_log", "_log_traffic", "_on_data_sent", "_on_identity_ready", "_on_config_ready"), "ui"),
+)
+
+# (nombre, categoría, inicio µs, duración µs, tid)
+_Event = Tuple[str, str, float, float, int]
+
+
+class Tracer:
+    """
+    Registra spans (inicio + duración, hilo) de los métodos instrumentados y los
+    exporta como trace-event JSON (chrome://tracing, Perfetto, speedscope).
+    La instrumentación reemplaza métodos en la clase, así que debe instalarse
+    antes de crear los objetos que conectan esos métodos a señales.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = MAX_EVENTS):
+        self.path = path
+        self.events: Deque[_Event] = deque(maxlen=capacity)
+        self._t0 = time.perf_counter_ns()
+        self._threads: Dict[int, str] = {}
+        self._patched: List[Tuple[type, str, object]] = []
+
+    @classmethod
+    def from_env(cls) -> Optional["Tracer"]:
+        """Activo solo si CONFIGVER_TRACE apunta a un archivo de salida."""
+        path = os.environ.get(ENV_TRACE, "").strip()
+        return cls(path) if path else None
+
+    # -------------
+    # REGISTRO
+    # -------------
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._t0) / 1000.0
+
+    def _record(self, name: str, cat: str, start_us: float) -> None:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self.events.append((name, cat, start_us, self._now_us() - start_us, tid))
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app") -> Iterator[None]:
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._record(name, cat, start)
+
+    def wrap(self, fn: Callable, name: str, cat: str = "app") -> Callable:
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            start = self._now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, cat, start)
+        return traced
+
+    # -------------
+    # INSTRUMENTACIÓN
+    # -------------
+    def instrument(self, cls: type, methods: Sequence[str], cat: str = "app") -> int:
+        """Envuelve `cls.<método>` para cada nombre existente. Devuelve cuántos se envolvieron."""
+        count = 0
+        for name in methods:
+            original = cls.__dict__.get(name)
+            if original is None:
+                continue
+            label = f"{cls.__name__}.{name}"
+            if isinstance(original, staticmethod):
+                replacement = staticmethod(self.wrap(original.__func__, label, cat))
+            elif callable(original):
+                replacement = self.wrap(original, label, cat)
+            else:
+                continue
+            setattr(cls, name, replacement)
+            self._patched.append((cls, name, original))
+            count += 1
+        return count
+
+    def install(self, targets=DEFAULT_TARGETS) -> int:
+        count = 0
+        for module_name, class_name, methods, cat in targets:
+            cls = getattr(importlib.import_module(module_name), class_name, None)
+            if cls is not None:
+                count += self.instrument(cls, methods, cat)
+        return count
+
+    def uninstall(self) -> None:
+        while self._patched:
+            cls, name, original = self._patched.pop()
+            setattr(cls, name, original)
+
+    # -------------
+    # SALIDA
+    # -------------
+    def trace_events(self) -> List[dict]:
+        pid = os.getpid()
+        out: List[dict] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+            for tid, tname in list(self._threads.items())
+        ]
+        out.extend(
+            {"name": name, "cat": cat, "ph": "X", "ts": round(ts, 3), "dur": round(dur, 3),
+             "pid": pid, "tid": tid}
+            for name, cat, ts, dur, tid in list(self.events)
+        )
+        return out
+
+    def export(self, path: Optional[str] = None) -> int:
+        """Escribe el JSON (formato objeto con traceEvents). Devuelve la cantidad de spans."""
+        path = path or self.path
+        if not path:
+            raise ValueError("Sin ruta de salida para el trace")
+        events = self.trace_events()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+        return sum(1 for e in events if e["ph"] == "X")
+
+    def summary(self, top: int = 15) -> str:
+        """Tabla por handler: llamadas, total y máximo (ms), ordenada por total."""
+        stats: Dict[str, List[float]] = {}
+        for name, _cat, _ts, dur, _tid in list(self.events):
+            s = stats.setdefault(name, [0, 0.0, 0.0])
+            s[0] += 1
+            s[1] += dur
+            s[2] = max(s[2], dur)
+        lines = ["== Trace summary =="]
+        for name, (n, total, worst) in sorted(stats.items(), key=lambda kv: kv[1][1], reverse=True)[:top]:
+            lines.append(f"  {name:<40} {int(n):7d} x  {total / 1000:9.1f} ms  (max {worst / 1000:7.2f})")
+        return "\n".join(lines)
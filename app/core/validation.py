@@ -0,0 +1,140 @@
+# app/core/validation.py — reglas de validación compartidas (widgets y lotes CSV)
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.protocol import CONFIG_LAYOUT, OPTIONAL_FIELDS
+
+# Patrones en texto: los usan tanto `re` (lotes) como QRegularExpression (widgets)
+IPV4_PATTERN = (
+    r"^((25[0-5]|2[0-4]\d|[01]?\d?\d)\.){3}"
+    r"(25[0-5]|2[0-4]\d|[01]?\d?\d)$"
+)
+PHONE_PATTERN = r"^\+?\d{5,20}$"                              # 5 a 20 dígitos con opcional +
+APN_PATTERN = (
+    r"^(?=.{1,100}$)[A-Za-z0-9](?:[A-Za-z0-9\-]{0,61}[A-Za-z0-9])?"
+    r"(?:\.[A-Za-z0-9](?:[A-Za-z0-9\-]{0,61}[A-Za-z0-9])?)*$"
+)
+CREDENTIAL_PATTERN = r"^[^,()\r\n]{0,32}$"                    # sin separadores de trama
+
+# Rangos numéricos (mínimo, máximo, sufijo); también fijan los QSpinBox de BaseInfoTab
+PORT_RANGE = (1, 65535)
+TIME_DIFF_RANGE = (-10_000, 10_000)
+INTERVAL_SEC_RANGE = (0, 86_400)
+INTERVAL_MIN_RANGE = (0, 86_400)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Regla de un campo: patrón precompilado o rango entero."""
+    message: str
+    pattern: Optional[str] = None
+    bounds: Optional[Tuple[int, int]] = None
+
+    def __post_init__(self):
+        if self.pattern is not None:
+            object.__setattr__(self, "_rx", re.compile(self.pattern))
+
+    def check(self, value: str) -> Optional[str]:
+        """Devuelve el mensaje de error, o None si el valor es válido."""
+        if self.pattern is not None and not self._rx.match(value):
+            return self.message
+        if self.bounds is not None:
+            try:
+                n = int(value)
+            except (TypeError, ValueError):
+                return self.message
+            if not self.bounds[0] <= n <= self.bounds[1]:
+                return self.message
+        return None
+
+
+RULES: Dict[str, Rule] = {
+    "main_ip": Rule("IPv4 inválida", pattern=IPV4_PATTERN),
+    "sub_ip": Rule("IPv4 inválida", pattern=IPV4_PATTERN),
+    "main_port": Rule(f"Puerto fuera de rango {PORT_RANGE[0]}-{PORT_RANGE[1]}", bounds=PORT_RANGE),
+    "sub_port": Rule(f"Puerto fuera de rango {PORT_RANGE[0]}-{PORT_RANGE[1]}", bounds=PORT_RANGE),
+    "apn": Rule("APN inválido", pattern=APN_PATTERN),
+    "apn_user": Rule("Usuario APN inválido (máx. 32, sin ',' ni paréntesis)", pattern=CREDENTIAL_PATTERN),
+    "apn_pass": Rule("Clave APN inválida (máx. 32, sin ',' ni paréntesis)", pattern=CREDENTIAL_PATTERN),
+    "time_diff": Rule("Diferencia horaria fuera de rango", bounds=TIME_DIFF_RANGE),
+    "upload_interval": Rule("Intervalo fuera de rango", bounds=INTERVAL_SEC_RANGE),
+    "wake_interval": Rule("Intervalo fuera de rango", bounds=INTERVAL_MIN_RANGE),
+    **{f"vip{i}": Rule("Número inválido (5 a 20 dígitos, '+' opcional)", pattern=PHONE_PATTERN) for i in range(1, 6)},
+}
+
+
+def validate_value(field: str, value: object) -> Optional[str]:
+    """Valida un campo suelto. Campos sin regla o vacíos se aceptan (vacío = no escribir)."""
+    rule = RULES.get(field)
+    text = "" if value is None else str(value).strip()
+    if rule is None or text == "":
+        return None
+    return rule.check(text)
+
+
+def missing_fields(profile: Dict[str, object]) -> Dict[str, str]:
+    """
+    Campos obligatorios que faltan en grupos a medio llenar: {campo: mensaje}.
+    Un keyword se escribe completo: sin el puerto, IP1 borraría el que tiene el equipo.
+    Misma regla para la GUI y los lotes CSV (ver protocol.OPTIONAL_FIELDS).
+    """
+    errors: Dict[str, str] = {}
+    for keyword, fields in CONFIG_LAYOUT.items():
+        filled = {f for f in fields if str(profile.get(f) or "").strip()}
+        if not filled:
+            continue
+        required = [f for f in fields if f not in OPTIONAL_FIELDS]
+        for f in required:
+            if f not in filled:
+                errors[f] = f"Falta: {keyword} se escribe completo ({', '.join(required)})"
+    return errors
+
+
+def validate_profile(profile: Dict[str, object]) -> Dict[str, str]:
+    """Errores de un perfil: {campo: mensaje} (vacío si es válido)."""
+    errors: Dict[str, str] = {}
+    for field, value in profile.items():
+        msg = validate_value(field, value)
+        if msg:
+            errors[field] = msg
+    errors.update(missing_fields(profile))
+    return errors
+
+
+@dataclass
+class RowError:
+    row: int            # índice de fila (según `start` de validate_rows)
+    field: str
+    value: str
+    message: str
+
+
+def validate_rows(rows: Iterable[Dict[str, object]], start: int = 0) -> List[RowError]:
+    """
+    Valida muchas filas en una pasada y devuelve el informe de errores por fila.
+    Los lotes repiten mucho (misma IP, APN y puertos en cientos de filas), así que
+    cada par (campo, valor) se valida una sola vez y el resultado se reutiliza.
+    """
+    memo: Dict[Tuple[str, str], Optional[str]] = {}
+    report: List[RowError] = []
+    for i, row in enumerate(rows, start=start):
+        for field, value in row.items():
+            rule = RULES.get(field)
+            if rule is None:
+                continue
+            text = "" if value is None else str(value).strip()
+            if text == "":
+                continue
+            key = (field, text)
+            if key in memo:
+                msg = memo[key]
+            else:
+                msg = memo[key] = rule.check(text)
+            if msg:
+                report.append(RowError(i, field, text, msg))
+        for field, msg in missing_fields(row).items():
+            report.append(RowError(i, field, "", msg))
+    return report
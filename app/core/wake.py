@@ -0,0 +1,72 @@
+# app/core/wake.py — latencias de despertar aprendidas por versión de firmware (sin Qt)
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional
+
+UNKNOWN_FIRMWARE = "?"
+HISTORY = 20                      # últimas muestras por versión
+
+
+class WakeStats:
+    """
+    Tiempo que tarda cada versión de firmware en contestar tras la secuencia de
+    despertar (segundos). Se usa para no sondear antes de lo que el equipo suele
+    tardar; se guarda en JSON (tmp + rename) para aprovecharlo entre sesiones.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._samples: Dict[str, List[float]] = {}
+        self._load()
+
+    def record(self, firmware: str, latency_s: float) -> None:
+        samples = self._samples.setdefault(firmware or UNKNOWN_FIRMWARE, [])
+        samples.append(round(latency_s, 4))
+        del samples[:-HISTORY]
+        self._save()
+
+    def samples(self, firmware: str) -> List[float]:
+        return list(self._samples.get(firmware or UNKNOWN_FIRMWARE, ()))
+
+    def quantile(self, firmware: str, q: float) -> Optional[float]:
+        data = sorted(self.samples(firmware))
+        if not data:
+            return None
+        return data[min(len(data) - 1, int(q * len(data)))]
+
+    def first_probe_delay(self, firmware: str) -> float:
+        """
+        Espera antes del primer sondeo: el percentil 20 de lo aprendido (casi nunca
+        antes de tiempo, rara vez de más). Sin historial: sondear de inmediato.
+        """
+        p20 = self.quantile(firmware, 0.2)
+        return 0.0 if p20 is None else p20
+
+    # -------------
+    # PERSISTENCIA
+    # -------------
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._samples = {k: [float(x) for x in v][-HISTORY:] for k, v in data.items()
+                                 if isinstance(v, list)}
+        except (OSError, ValueError, TypeError):
+            self._samples = {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._samples, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,222 @@
+# app/core/wake_manager.py — despertar de equipos dormidos (PA0) antes de enviarles comandos
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.device_link import DeviceLink
+from app.core.protocol import IDENTITY_QUERIES, WAKE_BYTES, Frame, FrameParser
+from app.core.wake import WakeStats
+
+STATE_UNKNOWN = "unknown"
+STATE_AWAKE = "awake"
+STATE_ASLEEP = "asleep"
+STATE_WAKING = "waking"
+
+
+class WakeManager(QObject):
+    """
+    El JT705A duerme entre ciclos de `wake_interval` y no contesta mientras tanto.
+    - Un comando (de cualquier origen) sin respuesta en `reply_timeout_ms` marca el equipo como dormido.
+    - `when_awake(fn)` ejecuta `fn` si el equipo contestó hace poco; si no, la encola y despierta al equipo.
+    - Despertar: pulso en DTR (cableado a PA0) + bytes en RX, y consultas VERSION con timeout corto
+      que crece x1.5 hasta que contesta. La primera consulta espera lo que esa versión de firmware
+      suele tardar (WakeStats), así no se gastan sondeos ni se espera de más.
+    - Al despertar se vacía la cola en orden. Si una acción se ejecutó de inmediato y sus
+      comandos quedan sin respuesta (el equipo se durmió justo), se reencola una vez.
+    """
+
+    state_changed = pyqtSignal(str)
+    woke = pyqtSignal(float, int)                # latencia (ms), sondeos usados
+    wake_failed = pyqtSignal(str)
+
+    def __init__(self, link: DeviceLink, stats: WakeStats, awake_window_ms: int = 20_000,
+                 reply_timeout_ms: int = 2000, probe_timeout_ms: int = 150,
+                 max_probe_timeout_ms: int = 1000, budget_ms: int = 15_000, pulse_ms: int = 50):
+        super().__init__()
+        self.link = link
+        self.stats = stats
+        self.firmware = ""                           # lo fija la identidad (o la respuesta al sondeo)
+        self.awake_window_ms = awake_window_ms
+        self.reply_timeout_ms = reply_timeout_ms
+        self.probe_timeout_ms = probe_timeout_ms
+        self.max_probe_timeout_ms = max_probe_timeout_ms
+        self.budget_ms = budget_ms
+        self.pulse_ms = pulse_ms
+
+        self._state = STATE_UNKNOWN
+        self._queue: Deque[Callable[[], object]] = deque()
+        self._retry: Optional[Callable[[], object]] = None   # última acción inmediata (se reintenta una vez)
+        self._last_rx = 0.0
+        self._foreground: Dict[str, float] = {}      # serie -> vence (comandos de otros)
+        self._tx_parser = FrameParser()
+        self._sending = False
+        self._started = 0.0
+        self._probes = 0
+        self._probe_serial = ""
+        self._timeout_ms = probe_timeout_ms
+
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setSingleShot(True)
+        self._probe_timer.timeout.connect(self._on_probe_timeout)
+        self._first_probe = QTimer(self)
+        self._first_probe.setSingleShot(True)
+        self._first_probe.timeout.connect(self._probe)
+        self._sweep = QTimer(self)
+        self._sweep.setInterval(200)
+        self._sweep.timeout.connect(self._expire)
+
+        link.frame_received.connect(self._on_frame)
+        link.manager.data_sent.connect(self._on_data_sent)
+        link.manager.connection_changed.connect(self._on_connection_changed)
+
+    # -------------
+    # API
+    # -------------
+    def state(self) -> str:
+        return self._state
+
+    def is_awake(self) -> bool:
+        return (self._state == STATE_AWAKE
+                and (time.monotonic() - self._last_rx) * 1000.0 < self.awake_window_ms)
+
+    def when_awake(self, fn: Callable[[], object]) -> bool:
+        """Ejecuta `fn` ya (True) o al despertar el equipo (False)."""
+        if self.is_awake():
+            self._retry = fn
+            fn()
+            return True
+        self._queue.append(fn)
+        if self._state != STATE_WAKING:
+            self.wake()
+        return False
+
+    def wake(self) -> bool:
+        if not self.link.manager.is_connected():
+            self._fail("Puerto no abierto")
+            return False
+        if self._state == STATE_WAKING:
+            return True
+        self._set_state(STATE_WAKING)
+        self._started = time.monotonic()
+        self._probes = 0
+        self._timeout_ms = self.probe_timeout_ms
+        self._pulse()
+        self._first_probe.start(int(self.stats.first_probe_delay(self.firmware) * 1000))
+        return True
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    # -------------
+    # DESPERTAR
+    # -------------
+    def _pulse(self) -> None:
+        manager = self.link.manager
+        if manager.set_control_lines(dtr=True):
+            QTimer.singleShot(self.pulse_ms, lambda: manager.set_control_lines(dtr=False))
+        self._sending = True
+        try:
+            manager.send_data_bytes(WAKE_BYTES)
+        finally:
+            self._sending = False
+
+    def _probe(self) -> None:
+        if self._state != STATE_WAKING:
+            return
+        if (time.monotonic() - self._started) * 1000.0 > self.budget_ms:
+            self._fail(f"El equipo no despertó en {self.budget_ms / 1000:.0f} s ({self._probes} sondeos)")
+            return
+        self._probes += 1
+        self._sending = True
+        try:
+            self._probe_serial = self.link.send_command(*IDENTITY_QUERIES["version"])
+        finally:
+            self._sending = False
+        if not self._probe_serial:
+            self._fail("Puerto no abierto")
+            return
+        self._probe_timer.start(self._timeout_ms)
+
+    def _on_probe_timeout(self) -> None:
+        self._probe_serial = ""
+        self._timeout_ms = min(self.max_probe_timeout_ms, int(self._timeout_ms * 1.5))
+        self._pulse()
+        self._probe()
+
+    def _woke(self, frame: Frame) -> None:
+        latency_s = time.monotonic() - self._started
+        self._probe_timer.stop()
+        self._first_probe.stop()
+        if frame.serial == self._probe_serial and not self.firmware:
+            self.firmware = frame.value
+        self._probe_serial = ""
+        self.stats.record(self.firmware, latency_s)
+        self._set_state(STATE_AWAKE)
+        self.woke.emit(latency_s * 1000.0, self._probes)
+        while self._queue and self._state == STATE_AWAKE:
+            self._queue.popleft()()
+
+    def _fail(self, msg: str) -> None:
+        self._probe_timer.stop()
+        self._first_probe.stop()
+        self._probe_serial = ""
+        self._queue.clear()
+        self._set_state(STATE_ASLEEP if self.link.manager.is_connected() else STATE_UNKNOWN)
+        self.wake_failed.emit(msg)
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            self._state = state
+            self.state_changed.emit(state)
+
+    # -------------
+    # TRÁFICO
+    # -------------
+    def _on_frame(self, frame: Frame, port: str) -> None:
+        self._last_rx = time.monotonic()
+        self._retry = None
+        self._foreground.pop(frame.serial, None)
+        if self._state == STATE_WAKING:
+            self._woke(frame)          # cualquier respuesta prueba que ya despertó
+        else:
+            self._set_state(STATE_AWAKE)
+
+    def _on_data_sent(self, data: bytes, port: str) -> None:
+        frames = self._tx_parser.feed(data)
+        if self._sending or not frames:
+            return
+        deadline = time.monotonic() + self.reply_timeout_ms / 1000.0
+        for f in frames:
+            self._foreground[f.serial] = deadline
+        if not self._sweep.isActive():
+            self._sweep.start()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [s for s, deadline in self._foreground.items() if deadline <= now]
+        for serial in expired:
+            del self._foreground[serial]
+        if expired and self._state != STATE_WAKING:
+            self._set_state(STATE_ASLEEP)
+            if self._retry is not None:
+                self._queue.append(self._retry)
+                self._retry = None
+                self.wake()
+        if not self._foreground:
+            self._sweep.stop()
+
+    def _on_connection_changed(self, connected: bool, port: str) -> None:
+        self._tx_parser.reset()
+        self._foreground.clear()
+        self._sweep.stop()
+        if self._state == STATE_WAKING:
+            self._fail("Puerto cerrado mientras despertaba")
+        self._queue.clear()
+        self._retry = None
+        if not connected:
+            # Al conectar no: la identidad cacheada puede haberlo fijado ya (su slot corre antes)
+            self.firmware = ""
+        self._set_state(STATE_UNKNOWN)
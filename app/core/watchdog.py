@@ -0,0 +1,159 @@
+# app/core/watchdog.py — vigilancia de bloqueos del event loop de Qt
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Deque, List, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))   # .../app
+MAX_SAMPLES_PER_STALL = 5
+ENV_THRESHOLD = "CONFIGVER_STALL_MS"         # umbral de bloqueo (ms) para la app
+DEFAULT_THRESHOLD_MS = 250
+DEFAULT_HEARTBEAT_MS = 50
+
+
+@dataclass
+class StallRecord:
+    started: float                  # epoch (s)
+    duration_ms: float
+    handler: str                    # función de la app más interna en la primera muestra
+    samples: List[str] = field(default_factory=list)   # pilas del hilo GUI durante el bloqueo
+
+    def summary(self) -> str:
+        ts = time.strftime("%H:%M:%S", time.localtime(self.started))
+        return f"{ts}  {self.duration_ms:7.0f} ms  {self.handler}"
+
+
+def _handler_of(frame) -> str:
+    """Función más interna que pertenece a la app (el slot/handler en ejecución)."""
+    fallback = ""
+    while frame is not None:
+        code = frame.f_code
+        where = f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+        if not fallback:
+            fallback = where
+        if os.path.abspath(code.co_filename).startswith(APP_DIR) and not code.co_filename.endswith("watchdog.py"):
+            return where
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class StallWatchdog(QObject):
+    """
+    Mide continuamente la latencia del event loop con un latido (QTimer) en el hilo GUI.
+    Un hilo aparte revisa el latido; si se atrasa más de `threshold_ms`, toma muestras
+    de la pila del hilo GUI (qué slot estaba corriendo). Al terminar el bloqueo se guarda
+    un StallRecord en un buffer circular y se emite `stall_detected`.
+    """
+
+    stall_detected = pyqtSignal(object)          # StallRecord
+
+    def __init__(self, threshold_ms: int = DEFAULT_THRESHOLD_MS, heartbeat_ms: int = DEFAULT_HEARTBEAT_MS,
+                 capacity: int = 200):
+        super().__init__()
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.records: Deque[StallRecord] = deque(maxlen=capacity)
+        self.last_latency_ms = 0.0               # atraso del último latido
+        self.max_latency_ms = 0.0
+
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._samples: List[str] = []
+        self._handler = ""
+        self._next_sample_ms = float(threshold_ms)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+
+    @classmethod
+    def from_env(cls) -> "StallWatchdog":
+        """
+        Umbral desde CONFIGVER_STALL_MS. Un valor que no es un número no debe impedir que
+        la app arranque: se usa el de defecto. Tampoco baja de un latido (daría falsos bloqueos).
+        """
+        try:
+            threshold = int(os.environ.get(ENV_THRESHOLD, DEFAULT_THRESHOLD_MS))
+        except ValueError:
+            threshold = DEFAULT_THRESHOLD_MS
+        return cls(threshold_ms=max(threshold, DEFAULT_HEARTBEAT_MS))
+
+    # -------------
+    # CONTROL
+    # -------------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def dump(self, path: str) -> int:
+        """Guarda el buffer en JSON. Devuelve la cantidad de registros escritos."""
+        data = [asdict(r) for r in self.records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"threshold_ms": self.threshold_ms, "max_latency_ms": round(self.max_latency_ms, 1),
+                       "stalls": data}, f, indent=1)
+        return len(data)
+
+    # -------------
+    # HILO GUI
+    # -------------
+    def _beat(self) -> None:
+        now = time.monotonic()
+        gap_ms = (now - self._last_beat) * 1000.0
+        self._last_beat = now
+        self.last_latency_ms = max(0.0, gap_ms - self.heartbeat_ms)
+        self.max_latency_ms = max(self.max_latency_ms, self.last_latency_ms)
+        with self._lock:
+            samples, handler = self._samples, self._handler
+            self._samples, self._handler = [], ""
+            self._next_sample_ms = float(self.threshold_ms)
+        if self.last_latency_ms < self.threshold_ms:
+            return
+        record = StallRecord(time.time() - gap_ms / 1000.0, self.last_latency_ms, handler or "?", samples)
+        self.records.append(record)
+        self.stall_detected.emit(record)
+
+    # -------------
+    # HILO MONITOR
+    # -------------
+    def _monitor(self) -> None:
+        period = max(0.01, self.threshold_ms / 4000.0)
+        while not self._stop.wait(period):
+            late_ms = (time.monotonic() - self._last_beat) * 1000.0 - self.heartbeat_ms
+            # Muestras a 1x, 2x, 4x... el umbral: cubren bloqueos cortos y largos
+            if late_ms < self._next_sample_ms or len(self._samples) >= MAX_SAMPLES_PER_STALL:
+                continue
+            frame = sys._current_frames().get(self._gui_ident)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            handler = _handler_of(frame)
+            del frame
+            with self._lock:
+                if not self._handler:
+                    self._handler = handler
+                self._samples.append(f"+{late_ms:.0f} ms\n{stack}")
+                self._next_sample_ms = late_ms * 2
@@ -1,21 +1,48 @@
 # main.py — entry point de la aplicación
+import multiprocessing
 import sys
+
+# Primero: mide el resto de imports si CONFIGVER_STARTUP_REPORT=1
+from app.core.startup_timing import StartupTimer
+_timing = StartupTimer.from_env()
+
 from PyQt6 import QtCore, QtWidgets, QtGui
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QSettings, QObject, QEvent, QTimer
 from PyQt6.QtWidgets import QApplication
 
 from app.ui.main_window import MainWindow      # Tu ventana principal
-from app.themes.styles import get_qss          # get_qss("dark"|"light")
+from app.themes.theme_manager import theme_manager, normalize_theme
+from app.core.tracing import Tracer
+
+if _timing:
+    _timing.mark("imports")
+
+
+class _FirstPaintProbe(QObject):
+    """Marca el primer evento Paint de la app e imprime el informe de arranque."""
+
+    def __init__(self, timing: StartupTimer):
+        super().__init__()
+        self._timing = timing
+
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Type.Paint:
+            QApplication.instance().removeEventFilter(self)
+            self._timing.mark("first_paint")
+            self._timing.finish()
+            QTimer.singleShot(0, lambda: print(self._timing.report(), file=sys.stderr))
+        return False
+
+
+def _export_trace(tracer: Tracer) -> None:
+    n = tracer.export()
+    print(tracer.summary(), file=sys.stderr)
+    print(f"-- {n} spans -> {tracer.path}", file=sys.stderr)
 
 
 def apply_theme(app: QApplication, theme: str) -> None:
-    """Aplica Fusion + QSS Hunter a toda la app."""
-    app.setStyle("Fusion")               # base neutral
-    app.setPalette(QtGui.QPalette())     # reset paleta a la de Fusion (fresco)
-    theme = (theme or "dark").lower()
-    if theme not in ("dark", "light"):
-        theme = "dark"
-    app.setStyleSheet(get_qss(theme))
+    """Aplica Fusion + QSS Hunter a toda la app (una sola vez por tema)."""
+    theme_manager(app).apply(theme)
 
 
 def main():
@@ -34,21 +61,29 @@ def main():
             setter(HDSFRP.PassThrough)
 
     app = QtWidgets.QApplication(sys.argv)
+    if _timing:
+        _timing.mark("qapplication")
+        probe = _FirstPaintProbe(_timing)
+        app.installEventFilter(probe)
 
-    settings = QSettings("Hunter", "ConfigVer")
-    initial_theme = (settings.value("ui/theme", "dark") or "dark").lower()
-    if initial_theme not in ("dark", "light"):
-        initial_theme = "dark"
+    # CONFIGVER_TRACE=ruta.json: instrumenta antes de crear la ventana y exporta al salir
+    tracer = Tracer.from_env()
+    if tracer:
+        tracer.install()
+        app.aboutToQuit.connect(lambda: _export_trace(tracer))
 
-    app.setStyle("Fusion")
-    app.setPalette(QtGui.QPalette())  # reset limpio
-    app.setStyleSheet(get_qss(initial_theme))
+    settings = QSettings("Hunter", "ConfigVer")
+    apply_theme(app, normalize_theme(settings.value("ui/theme", "dark")))
 
     win = MainWindow(settings)
+    if _timing:
+        _timing.mark("main_window")
     win.show()
     sys.exit(app.exec())
 
 
 
 if __name__ == "__main__":
+    # Ejecutable congelado: los procesos trabajadores (PortPool) arrancan por acá
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,73 @@
+# theme_manager.py — aplicación de temas con caché y sin restyles redundantes
+import time
+from typing import Dict, Optional
+
+from PyQt6 import QtGui
+from PyQt6.QtWidgets import QApplication
+
+from app.themes.styles import get_qss
+
+THEMES = ("dark", "light")
+
+
+def normalize_theme(theme: Optional[str]) -> str:
+    theme = (theme or "dark").lower()
+    return theme if theme in THEMES else "dark"
+
+
+class ThemeManager:
+    """
+    Único punto que toca `setStyle`/`setPalette`/`setStyleSheet`:
+    - Fusion + paleta limpia se aplican una sola vez (la primera vez).
+    - La QSS de cada tema se arma una vez y queda en caché.
+    - Aplicar el tema ya activo no hace nada (cada setStyleSheet re-pule todos los widgets).
+    `last_switch_ms` guarda lo que tardó el último cambio real.
+
+    Nota: cambiar solo la paleta no sirve con esta QSS; las referencias palette(...)
+    de una hoja de estilos se resuelven al pulir el widget y no siguen a setPalette.
+    """
+
+    def __init__(self, app: QApplication):
+        self.app = app
+        self.current: Optional[str] = None
+        self.last_switch_ms: Optional[float] = None
+        self._qss: Dict[str, str] = {}
+        self._base_done = False
+
+    def qss(self, theme: str) -> str:
+        theme = normalize_theme(theme)
+        if theme not in self._qss:
+            self._qss[theme] = get_qss(theme)
+        return self._qss[theme]
+
+    def apply(self, theme: Optional[str]) -> bool:
+        """Aplica el tema. Devuelve False si ya estaba activo (no se tocó nada)."""
+        theme = normalize_theme(theme)
+        if theme == self.current:
+            return False
+        qss = self.qss(theme)
+        t0 = time.perf_counter()
+        if not self._base_done:
+            self.app.setStyle("Fusion")               # base neutral
+            self.app.setPalette(QtGui.QPalette())     # reset paleta a la de Fusion (fresco)
+            self._base_done = True
+        self.app.setStyleSheet(qss)
+        self.last_switch_ms = (time.perf_counter() - t0) * 1000.0
+        self.current = theme
+        return True
+
+    def toggle(self) -> str:
+        self.apply("light" if self.current == "dark" else "dark")
+        return self.current
+
+
+_managers: Dict[int, ThemeManager] = {}
+
+
+def theme_manager(app: Optional[QApplication] = None) -> ThemeManager:
+    """ThemeManager de la QApplication (uno por instancia)."""
+    app = app or QApplication.instance()
+    mgr = _managers.get(id(app))
+    if mgr is None or mgr.app is not app:
+        mgr = _managers[id(app)] = ThemeManager(app)
+    return mgr
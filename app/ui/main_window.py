@@ -1,8 +1,11 @@
 
 
 # main_window.py — definición de la ventana principal
+import os
+from collections import deque
+
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer
 from PyQt6.QtGui import QIcon, QAction, QKeySequence
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QFileDialog,
@@ -17,12 +20,63 @@ from app.ui.pages.advanced_tab import AdvancedTab
 
 # Widgets
 from app.ui.widgets.panels import ComPanel, BasicInfoPanel
+from app.ui.widgets.lazy_tab import LazyTab
+from app.themes.theme_manager import theme_manager, normalize_theme
+
+# Núcleo serie
+from app.core.gateway_client import GatewayManager
+from app.core.serial_manager import SerialManager
+from app.core.device_link import DeviceLink
+from app.core.identity import IdentityReader
+from app.core.config_reader import ConfigReader
+from app.core.device_cache import DeviceCache, cache_key
+from app.core.paths import data_dir
+from app.core.provisioning_job import ProvisioningJob
+from app.core.port_pool import PortPool
+from app.core.script_runner import ScriptRunner
+from app.core.poll_scheduler import PollScheduler
+from app.core.clock_sync_job import ClockSyncJob
+from app.core.wake import WakeStats
+from app.core.wake_manager import WakeManager
+from app.core.session_db import SessionDB
+from app.core.validation import validate_profile
+from app.core.watchdog import StallWatchdog
+from app.ui.stall_dialog import StallDialog
+from app.core.protocol import (
+    FrameParser, config_commands, is_write,
+    NET_KEYWORDS, TIME_KEYWORDS, VIP_KEYWORDS, RESET_KEYWORD, STATUS_QUERIES,
+)
 
 
 class MainWindow(QMainWindow):
+    LOG_BACKLOG_MAX = 5000                   # líneas guardadas mientras la pestaña de log no existe
+
     def __init__(self, settings: QSettings):
         super().__init__()
         self.settings = settings
+        # Subsistema serie: se crea después del primer pintado (ver _init_device_stack)
+        self.serial: SerialManager | None = None
+        self.link: DeviceLink | None = None
+        self.identity: IdentityReader | None = None
+        self.config_reader: ConfigReader | None = None
+        self.script_runner: ScriptRunner | None = None
+        self.device_cache: DeviceCache | None = None
+        self.session_db: SessionDB | None = None
+        self.poller: PollScheduler | None = None
+        self.wake: WakeManager | None = None
+        self.clock_sync = ClockSyncJob()
+        self.clock_sync.port_finished.connect(self._on_clock_synced)
+        self._live_status: dict[str, str] = {}
+        self._device_key = ""                    # IMEI del equipo conectado
+        self._confirmed: set[str] = set()        # equipos con configuración leída en esta sesión
+        self._tx_parser = FrameParser()
+        self.provisioning: ProvisioningJob | None = None
+        self.port_pool: PortPool | None = None     # aprovisionamiento multiproceso (todos los puertos)
+        self._log_backlog: deque[str] = deque(maxlen=self.LOG_BACKLOG_MAX)
+        self.watchdog = StallWatchdog.from_env()
+        self.watchdog.stall_detected.connect(
+            lambda rec: self._sb_msg.setText(f"UI stall {rec.duration_ms:.0f} ms in {rec.handler}"))
+        self._stall_dialog: StallDialog | None = None
         self.setWindowTitle("Config-Ver — PyQt6 (UI only)")
         self.resize(1200, 650)
 
@@ -41,14 +95,17 @@ class MainWindow(QMainWindow):
         top.addWidget(self.com_panel,1)
         top.addWidget(self.basic_panel, 3)
 
-        # --- Tabs ---
+        # --- Tabs (cada página se construye la primera vez que se muestra) ---
         tabs = QTabWidget()
         tabs.setDocumentMode(True)
         tabs.setTabPosition(QTabWidget.TabPosition.North)
-        self.baseinfo_tab = BaseInfoTab()
-        self.advanced_tab = AdvancedTab()
-        tabs.addTab(self.baseinfo_tab, "BaseInfo Config")
-        tabs.addTab(self.advanced_tab, "Advanced Operations")
+        self._baseinfo_page = LazyTab(BaseInfoTab)
+        self._advanced_page = LazyTab(AdvancedTab)
+        self._baseinfo_page.built.connect(self._wire_baseinfo_tab)
+        self._advanced_page.built.connect(self._wire_advanced_tab)
+        tabs.addTab(self._baseinfo_page, "BaseInfo Config")
+        tabs.addTab(self._advanced_page, "Advanced Operations")
+        self.tabs = tabs
 
         outer.addLayout(top)
         outer.addWidget(tabs, 1)
@@ -57,19 +114,112 @@ class MainWindow(QMainWindow):
         sb = QStatusBar()
         self.setStatusBar(sb)
         self._sb_msg = QLabel("Ready.")
+        self._sb_status = QLabel()
+        sb.addPermanentWidget(self._sb_status)
         sb.addPermanentWidget(self._sb_msg)
 
         # --- Toolbar ---
         self._make_toolbar()
 
         # --- Conexiones mínimas (UI only) ---
-        self.com_panel.btn_open.toggled.connect(self._toggle_port_visual)
-        self.advanced_tab.btn_clear.clicked.connect(self.advanced_tab.resp_view.clear)
-        self.advanced_tab.btn_save.clicked.connect(self._save_log_placeholder)
+        self.com_panel.btn_open.toggled.connect(self._toggle_port)
+        self.basic_panel.btn_refresh.clicked.connect(self._refresh_identity)
 
         # --- Restaurar geometría/estado ---
         self._restore_window_state()
 
+        QTimer.singleShot(0, self._init_device_stack)
+        QTimer.singleShot(0, self.watchdog.start)
+
+    # ---- Páginas (construcción diferida) ----
+    @property
+    def baseinfo_tab(self) -> BaseInfoTab:
+        return self._baseinfo_page.widget()
+
+    @property
+    def advanced_tab(self) -> AdvancedTab:
+        return self._advanced_page.widget()
+
+    def _wire_baseinfo_tab(self, tab: BaseInfoTab):
+        # Comandos del operador: si el equipo duerme, se encolan y se despierta primero
+        awake = lambda fn: (lambda: self.wake.when_awake(fn))  # noqa: E731
+        tab.btn_read_net.clicked.connect(awake(lambda: self.config_reader.read(NET_KEYWORDS)))
+        tab.btn_read_time.clicked.connect(awake(lambda: self.config_reader.read(TIME_KEYWORDS)))
+        tab.btn_vip_read.clicked.connect(awake(lambda: self.config_reader.read(VIP_KEYWORDS)))
+        tab.btn_write_net.clicked.connect(awake(lambda: self._write_config(NET_KEYWORDS)))
+        tab.btn_write_time.clicked.connect(awake(lambda: self._write_config(TIME_KEYWORDS)))
+        tab.btn_vip_write.clicked.connect(awake(lambda: self._write_config(VIP_KEYWORDS)))
+        tab.btn_reset.clicked.connect(awake(lambda: self.link.send_command(RESET_KEYWORD, tab.reset_scope())))
+        tab.btn_syn.clicked.connect(self._sync_clock)
+        tab.btn_pa0.clicked.connect(lambda: self.wake.wake())
+
+    def _wire_advanced_tab(self, tab: AdvancedTab):
+        tab.btn_clear.clicked.connect(self._clear_log)
+        tab.btn_save.clicked.connect(self._save_log_placeholder)
+        tab.btn_send.clicked.connect(self._send_advanced)
+        tab.btn_stop.clicked.connect(lambda: self.script_runner.stop())
+        if self._log_backlog:
+            tab.resp_view.appendPlainText("\n".join(self._log_backlog))
+            self._log_backlog.clear()
+
+    # ---- Subsistema serie ----
+    def _init_device_stack(self):
+        if self.serial is not None:
+            return
+        # Con "serial/gateway" (tcp:HOST:PUERTO o local:NOMBRE) el puerto lo tiene la pasarela
+        # y la ventana lo comparte con guiones y monitores (ver serial_gateway.py)
+        gateway = str(self.settings.value("serial/gateway", "") or "")
+        self.serial = GatewayManager(gateway) if gateway else SerialManager()
+        self.link = DeviceLink(self.serial)
+        self.identity = IdentityReader(self.link)
+        self.config_reader = ConfigReader(self.link)
+        self.script_runner = ScriptRunner(self.link)
+        self.device_cache = DeviceCache(os.path.join(data_dir(), "device_cache.json"))
+        self.session_db = SessionDB(os.path.join(data_dir(), "sessions.sqlite3"))
+
+        # --- Historial (SQLite, escritura en segundo plano) ---
+        self.link.frame_received.connect(
+            lambda frame, port: self.session_db.log_frame("rx", port, frame, self._device_key))
+
+        # --- Guiones + log de tráfico ---
+        self.script_runner.step_started.connect(lambda line, text: self._append_log(f"[script:{line}] {text}"))
+        self.script_runner.finished.connect(self._on_script_finished)
+        self.serial.data_sent.connect(lambda data, port: self._log_traffic(">>", data))
+        self.serial.data_received.connect(lambda data, port: self._log_traffic("<<", data))
+        self.serial.error_occurred.connect(lambda msg, port: self._sb_msg.setText(f"{port}: {msg}"))
+
+        # --- Identidad del equipo (cacheada por puerto) ---
+        self.identity.identity_ready.connect(self._on_identity_ready)
+        self.identity.identity_failed.connect(lambda msg, port: self._sb_msg.setText(f"{port}: {msg}"))
+        self.serial.connection_changed.connect(self._on_connection_changed)
+
+        # --- Puertos: combo vivo + apertura real ---
+        self.serial.ports_updated.connect(lambda ports: self.com_panel.set_ports(ports, self.serial.get_port_info))
+        self.serial.connection_changed.connect(self._toggle_port_visual)
+        self.serial.scan_ports()
+
+        # --- Configuración: caché por IMEI ---
+        self.config_reader.config_ready.connect(self._on_config_ready)
+        self.config_reader.config_failed.connect(lambda msg, port: self._sb_msg.setText(f"{port}: {msg}"))
+        self.serial.data_sent.connect(self._on_data_sent)
+
+        # --- Despertar (PA0): latencias aprendidas por firmware ---
+        self.wake = WakeManager(self.link, WakeStats(os.path.join(data_dir(), "wake_stats.json")))
+        self.wake.state_changed.connect(lambda st: self._sb_msg.setText(f"Unit {st}") if st != "awake" else None)
+        self.wake.woke.connect(lambda ms, n: self._sb_msg.setText(f"Unit awake after {ms:.0f} ms ({n} probes)"))
+        self.wake.wake_failed.connect(lambda msg: self._sb_msg.setText(f"Wake up: {msg}"))
+
+        # --- Estado en vivo: sondeo en segundo plano (cede ante comandos interactivos) ---
+        # Se crea al final: en cada conexión la identidad sale antes que los sondeos
+        self.poller = PollScheduler(self.link)
+        interval = int(self.settings.value("poll/interval_ms", 10_000))
+        for name, (keyword, *args) in STATUS_QUERIES.items():
+            self.poller.add_poll(name, keyword, *args, interval_ms=interval)
+        self.poller.poll_result.connect(self._on_poll_result)
+        self.serial.connection_changed.connect(lambda connected, port: self._show_live_status(clear=not connected))
+        if self.act_live_status.isChecked():
+            self.poller.start()
+
     # ---- Toolbar / acciones ----
     def _make_toolbar(self):
         tb = QToolBar("Main")
@@ -108,42 +258,334 @@ class MainWindow(QMainWindow):
             self.act_clear_log.setShortcut(QKeySequence(QKeySequence.StandardKey.Delete))
         except Exception:
             self.act_clear_log.setShortcut(QKeySequence("Ctrl+L"))
-        self.act_clear_log.triggered.connect(self.advanced_tab.resp_view.clear)
+        self.act_clear_log.triggered.connect(self._clear_log)
         tb.addAction(self.act_clear_log)
 
+        tb.addSeparator()
+
+        # Aprovisionamiento masivo desde CSV (start/stop)
+        self.act_provision = QAction("Provision CSV…", self)
+        self.act_provision.setCheckable(True)
+        self.act_provision.toggled.connect(self._toggle_provisioning)
+        tb.addAction(self.act_provision)
+
+        # Lo mismo en todos los puertos libres, con procesos trabajadores
+        self.act_provision_all = QAction("Provision All Ports…", self)
+        self.act_provision_all.setCheckable(True)
+        self.act_provision_all.toggled.connect(self._toggle_port_pool)
+        tb.addAction(self.act_provision_all)
+
+        # Sondeo periódico de batería / señal / GPS
+        self.act_live_status = QAction("Live Status", self)
+        self.act_live_status.setCheckable(True)
+        self.act_live_status.setChecked(self.settings.value("poll/enabled", False, type=bool))
+        self.act_live_status.toggled.connect(self._toggle_live_status)
+        tb.addAction(self.act_live_status)
+
+        # Visor de bloqueos del event loop
+        self.act_stalls = QAction("Stalls…", self)
+        self.act_stalls.triggered.connect(self._show_stalls)
+        tb.addAction(self.act_stalls)
+
+        # Latencias por etapa de las tramas recibidas (llegada -> parseo -> correlación -> UI)
+        self.act_latency = QAction("Latency", self)
+        self.act_latency.triggered.connect(self._show_latency)
+        tb.addAction(self.act_latency)
+
 
     # ---- Persistencia ----
     def _restore_window_state(self):
-        geom = self.settings.value("win/geometry", b'', type=QtCore.QByteArray)
-        state = self.settings.value("win/state", b'', type=QtCore.QByteArray)
-        if geom:
+        # Sin `type=`: con la clave ausente PyQt6 no convierte el default b'' a QByteArray
+        geom = self.settings.value("win/geometry")
+        state = self.settings.value("win/state")
+        if isinstance(geom, QtCore.QByteArray) and not geom.isEmpty():
             self.restoreGeometry(geom)
-        if state:
+        if isinstance(state, QtCore.QByteArray) and not state.isEmpty():
             self.restoreState(state)
+        try:
+            self.tabs.setCurrentIndex(int(self.settings.value("ui/tab", 0)))
+        except (TypeError, ValueError):
+            pass
 
     def closeEvent(self, e: QtGui.QCloseEvent):
         self.settings.setValue("win/geometry", self.saveGeometry())
         self.settings.setValue("win/state", self.saveState())
+        self.settings.setValue("ui/tab", self.tabs.currentIndex())
+        self.watchdog.stop()
+        if self.port_pool is not None:
+            self.port_pool.stop()
+        if self.serial is not None:
+            self.serial.shutdown()
+        if self.session_db is not None:
+            self.session_db.close()
         super().closeEvent(e)
 
     # ---- UI helpers ----
-    def _toggle_port_visual(self, checked: bool):
-        self.com_panel.btn_open.setText("Close [O]" if checked else "Open [O]")
-        self.com_panel.indicator.setColor("#5cb85c" if checked else "#d9534f")
-        self._sb_msg.setText("Port: OPEN" if checked else "Port: CLOSED")
+    def _toggle_port(self, checked: bool):
+        if self.serial is None:
+            self.com_panel.set_connected(False)
+            return
+        if checked:
+            port = self.com_panel.selected_port()
+            if not self.serial.open_port(port, {'baud_rate': self.com_panel.baud_rate()}):
+                self.com_panel.set_connected(False)
+        else:
+            self.serial.close_port()
+
+    def _toggle_port_visual(self, connected: bool, port: str = ""):
+        # Estado real del SerialManager (incluye cierres por error y reconexiones)
+        self.com_panel.set_connected(connected)
+        self._sb_msg.setText(f"Port {port}: OPEN" if connected else f"Port {port}: CLOSED")
+
+    def _refresh_identity(self):
+        # Shift+clic fuerza la consulta aunque la identidad esté en caché
+        if self.identity is None:
+            return
+        mods = QtWidgets.QApplication.keyboardModifiers()
+        self.identity.refresh(force=bool(mods & Qt.KeyboardModifier.ShiftModifier))
+
+    def _on_connection_changed(self, connected: bool, port: str):
+        if connected:
+            # Reconexión del mismo equipo: sale de la caché sin consultar
+            self.identity.refresh()
+        elif not self.serial.get_port_name():
+            self.basic_panel.clear()
+            self._device_key = ""
+
+    def _on_identity_ready(self, data: dict, port: str):
+        self.basic_panel.set_values_from_dict(data)
+        self.link.latency.displayed(self.identity.last_frame)
+        key = cache_key(data)
+        self._device_key = key
+        self.wake.firmware = data.get("version", "")
+        self.device_cache.put_identity(key, data)
+        if key in self._confirmed:
+            self.basic_panel.set_freshness(True)
+            return
+        # Muestra lo último conocido al instante y confirma en segundo plano
+        cached = self.device_cache.get_config(key)
+        if cached:
+            self.baseinfo_tab.set_config_values(cached)
+            self.basic_panel.set_freshness(False, self.device_cache.config_age(key))
+        self.config_reader.read()
+
+    def _on_config_ready(self, config: dict, port: str):
+        self.baseinfo_tab.set_config_values(config)
+        self.link.latency.displayed(self.config_reader.last_frame)
+        if not self._device_key:
+            return
+        if self.config_reader.last_full:
+            self.device_cache.put_config(self._device_key, config, merge=False)
+            self._confirmed.add(self._device_key)
+            self.basic_panel.set_freshness(True)
+        elif self._device_key in self._confirmed:
+            # Una sección de un equipo ya confirmado: la caché sigue completa y al día
+            self.device_cache.put_config(self._device_key, config)
+        # Sección suelta sin lectura completa: no reconstruye la caché ni la marca fresca
+
+    def _on_data_sent(self, data: bytes, port: str):
+        frames = self._tx_parser.feed(data)
+        for f in frames:
+            self.session_db.log_frame("tx", port, f, self._device_key)
+        # Cualquier escritura o reset deja la caché del equipo desactualizada
+        if any(is_write(f) for f in frames) and self._device_key:
+            self.device_cache.invalidate(self._device_key)
+            self._confirmed.discard(self._device_key)
+            self.basic_panel.set_freshness(False, reading=False)
+
+    def _write_config(self, keywords: tuple):
+        # Mismas reglas que los lotes CSV: nada sale al equipo si el perfil no las cumple
+        profile = self.baseinfo_tab.config_profile(keywords)
+        errors = validate_profile(profile)
+        self.baseinfo_tab.set_field_errors(errors)
+        if errors:
+            msg = "; ".join(f"{field}: {error}" for field, error in errors.items())
+            self._sb_msg.setText(f"Not written — {msg}")
+            self._append_log(f"[write] not written — {msg}")
+            return
+        commands = config_commands(profile, keywords)
+        if not commands:
+            self._sb_msg.setText(f"Nothing to write: {', '.join(keywords)} fields are empty")
+            return
+        if self.link.send_batch(commands):
+            self._sb_msg.setText(f"Written: {', '.join(c[0] for c in commands)}")
+
+    def _toggle_provisioning(self, checked: bool):
+        if not checked:
+            if self.provisioning:
+                self.provisioning.stop()
+                self.provisioning = None
+            self._sb_msg.setText("Provisioning stopped")
+            return
+        if self.link is None:
+            self.act_provision.setChecked(False)
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Provisioning CSV", "", "CSV Files (*.csv)")
+        if not path:
+            self.act_provision.setChecked(False)
+            return
+        try:
+            job = ProvisioningJob(self.link, self.identity, path)
+        except (OSError, ValueError) as e:
+            self._sb_msg.setText(f"CSV error: {e}")
+            self.act_provision.setChecked(False)
+            return
+        errors = job.validate()
+        for err in errors[:50]:
+            self._append_log(f"[provision] row {err.row}: {err.field}={err.value!r} — {err.message}")
+        if len(errors) > 50:
+            self._append_log(f"[provision] … {len(errors) - 50} more invalid fields")
+        job.unit_finished.connect(self._on_unit_provisioned)
+        job.progress.connect(lambda done, total: self._sb_msg.setText(f"Provisioning: {done}/{total}"))
+        self.provisioning = job
+        job.start()
+
+    def _on_unit_provisioned(self, imei: str, ok: bool, msg: str):
+        self._append_log(f"[provision] {imei}: {'OK' if ok else 'FAIL'} — {msg}")
+
+    def _toggle_port_pool(self, checked: bool):
+        if not checked:
+            if self.port_pool:
+                self.port_pool.stop()
+                self.port_pool = None
+            self._sb_msg.setText("Provisioning (all ports) stopped")
+            return
+        # El puerto abierto en la ventana queda fuera: un puerto sólo se abre una vez
+        own = self.serial.get_port_name() if self.serial is not None else ""
+        ports = [p for p in (self.serial.get_list_ports() if self.serial is not None else []) if p != own]
+        if not ports:
+            self._sb_msg.setText("Provisioning: no free ports")
+            self.act_provision_all.setChecked(False)
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Provisioning CSV", "", "CSV Files (*.csv)")
+        if not path:
+            self.act_provision_all.setChecked(False)
+            return
+        workers = int(self.settings.value("provisioning/workers", 0) or 0) or None
+        pool = PortPool(ports, workers=workers, settings={'baud_rate': self.com_panel.baud_rate()})
+        results = {"ok": 0, "failed": 0}
+
+        def on_unit(port: str, imei: str, ok: bool, msg: str):
+            results["ok" if ok else "failed"] += 1
+            self._append_log(f"[provision {port}] {imei}: {'OK' if ok else 'FAIL'} — {msg}")
+            self._sb_msg.setText(f"Provisioning ({len(ports)} ports): {results['ok']} OK, {results['failed']} failed")
+
+        pool.unit_finished.connect(on_unit)
+        pool.clock_synced.connect(self._on_clock_synced)
+        pool.error_occurred.connect(lambda msg, port: self._append_log(f"[provision {port}] {msg}"))
+        pool.worker_exited.connect(lambda index, group, restarted: self._append_log(
+            f"[provision] worker {index} ({', '.join(group)}) exited" + (", restarted" if restarted else "")))
+        self.port_pool = pool
+        pool.start()
+        pool.start_provisioning(path)
+        self._sb_msg.setText(f"Provisioning {len(ports)} ports in {len(pool.workers)} worker processes")
+
+    def _send_advanced(self):
+        tab = self.advanced_tab
+        text = tab.cmd_edit.toPlainText()
+        if not text.strip():
+            return
+        if tab.chk_script.isChecked():
+            # Como los demás envíos: el primer paso no sale hasta que el equipo despierte
+            self.wake.when_awake(lambda: self._start_script(text))
+        else:
+            self.wake.when_awake(lambda: self.serial.send_data_str(text.strip()))
+
+    def _start_script(self, text: str):
+        variables = {"imei": self.basic_panel.ed_imei.text()}
+        if self.script_runner.start(text, variables):
+            self.advanced_tab.set_script_running(True)
+
+    def _on_script_finished(self, ok: bool, msg: str):
+        self.advanced_tab.set_script_running(False)
+        self._append_log(f"[script] {'OK' if ok else 'ERROR'}: {msg}")
+
+    def _log_traffic(self, direction: str, data: bytes):
+        text = data.decode("latin-1", errors="replace").rstrip("\r\n")
+        self._append_log(f"{direction} {text}")
+
+    def _append_log(self, line: str):
+        # Si la pestaña de log aún no se construyó, no la fuerza: guarda la línea
+        if self._advanced_page.is_built():
+            self.advanced_tab.resp_view.appendPlainText(line)
+        else:
+            self._log_backlog.append(line)
+
+    def _log_text(self) -> str:
+        if self._advanced_page.is_built():
+            return self.advanced_tab.resp_view.toPlainText()
+        return "\n".join(self._log_backlog)
+
+    def _clear_log(self):
+        self._log_backlog.clear()
+        if self._advanced_page.is_built():
+            self.advanced_tab.resp_view.clear()
+
+    def _sync_clock(self):
+        # El puerto de la ventana se sincroniza acá; los del pool, cada uno en su trabajador
+        count = self.clock_sync.start([self.link]) if self.link is not None else 0
+        if self.port_pool is not None:
+            count += self.port_pool.sync_clocks()
+        if not count:
+            self._sb_msg.setText("SYN: no open port (or a sync is already running)")
+            return
+        self._sb_msg.setText(f"SYN: measuring RTT on {count} port(s)…")
+
+    def _on_clock_synced(self, port: str, r: dict):
+        if r.get("ok"):
+            msg = (f"SYN {port}: residual {r['residual_ms']:+.0f} ± {r['uncertainty_ms']:.0f} ms "
+                   f"(RTT {r['rtt_ms']:.0f} ms, was {r.get('offset_before_ms', 0) / 1000:+.1f} s)")
+        else:
+            msg = f"SYN {port}: {r.get('message', 'failed')}"
+        self._sb_msg.setText(msg)
+        self._append_log(msg)
+
+    def _toggle_live_status(self, checked: bool):
+        self.settings.setValue("poll/enabled", checked)
+        if self.poller is None:
+            return
+        if checked:
+            self.poller.start()
+        else:
+            self.poller.stop()
+            self._show_live_status(clear=True)
+
+    def _on_poll_result(self, name: str, frame, port: str):
+        self._live_status[name] = frame.value
+        self._show_live_status()
+        self.link.latency.displayed(frame)
+
+    def _show_live_status(self, clear: bool = False):
+        if clear:
+            self._live_status.clear()
+        self._sb_status.setText("  ·  ".join(f"{k}: {v}" for k, v in self._live_status.items()))
+
+    def _show_stalls(self):
+        if self._stall_dialog is None:
+            self._stall_dialog = StallDialog(self.watchdog, self)
+        else:
+            self._stall_dialog.reload()
+        self._stall_dialog.show()
+        self._stall_dialog.raise_()
+
+    def _show_latency(self):
+        if self.link is None:
+            return
+        self._append_log(self.link.latency.summary())
+        worst = self.link.latency.snapshot()
+        self._sb_msg.setText("p99 " + ", ".join(f"{k} {v['p99_ms']:.1f} ms" for k, v in worst.items()))
 
     def _save_log_placeholder(self):
         path, _ = QFileDialog.getSaveFileName(self, "Save Log", "log.txt", "Text Files (*.txt)")
         if path:
             with open(path, "w", encoding="utf-8") as f:
-                f.write(self.advanced_tab.resp_view.toPlainText())
+                f.write(self._log_text())
             self._sb_msg.setText(f"Log saved: {path}")
 
     def _toggle_theme(self):
-        theme = (self.settings.value("ui/theme", "dark") or "dark").lower()
+        themes = theme_manager()
+        theme = themes.current or normalize_theme(self.settings.value("ui/theme", "dark"))
         new_theme = "light" if theme == "dark" else "dark"
-        app = QtWidgets.QApplication.instance()
-        from app.themes.styles import get_qss
-        app.setStyleSheet(get_qss(new_theme))
+        themes.apply(new_theme)
         self.settings.setValue("ui/theme", new_theme)
-        self._sb_msg.setText(f"Theme: {new_theme.capitalize()}")
+        self._sb_msg.setText(f"Theme: {new_theme.capitalize()} ({themes.last_switch_ms:.0f} ms)")
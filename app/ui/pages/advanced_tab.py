@@ -2,20 +2,11 @@
 
 
 # main.py — UI mejorada (PyQt6) con tema claro/oscuro, QSettings y validadores
-from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import Qt, QRegularExpression, QSettings
-from PyQt6.QtGui import QRegularExpressionValidator, QIcon, QAction
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPlainTextEdit, QSpinBox,
-    QGroupBox, QHBoxLayout, QVBoxLayout, QGridLayout, QTabWidget, QFileDialog,
-    QToolButton, QStyle, QCheckBox, QRadioButton, QPushButton, QComboBox, QSplitter,
-    QStatusBar, QToolBar
-)
+from PyQt6.QtWidgets import QWidget, QPlainTextEdit, QHBoxLayout, QVBoxLayout, QCheckBox, QPushButton
 
 from app.ui.widgets.group_box import    GroupBox
-from app.ui.widgets.icon_circle import IconCircle
-from app.ui.widgets.label_line import LabeledLine
-from app.ui.widgets.number_field import NumberField
+
+from app.core.script import SCRIPT_HELP
 
 
 class AdvancedTab(QWidget):
@@ -29,8 +20,15 @@ class AdvancedTab(QWidget):
         self.cmd_edit = QPlainTextEdit()
         self.cmd_edit.setPlaceholderText("Enter raw instruction here, e.g.\n(700160818000,1,001,BASE,1)")
         self.btn_send = QPushButton("Send")
+        self.chk_script = QCheckBox("Script mode")
+        self.chk_script.setToolTip(SCRIPT_HELP.replace("# ", "").strip())
+        self.chk_script.toggled.connect(self._on_script_toggled)
+        self.btn_stop = QPushButton("Stop")
+        self.btn_stop.setEnabled(False)
         top = QHBoxLayout()
         top.addWidget(self.btn_send)
+        top.addWidget(self.btn_stop)
+        top.addWidget(self.chk_script)
         top.addStretch(1)
         v.addWidget(self.cmd_edit)
         v.addLayout(top)
@@ -52,4 +50,15 @@ class AdvancedTab(QWidget):
         resp_lay.addLayout(hb)
 
         lay.addWidget(cmd_box)
-        lay.addWidget(resp_box)
\ No newline at end of file
+        lay.addWidget(resp_box)
+
+    def _on_script_toggled(self, on: bool) -> None:
+        if on:
+            self.cmd_edit.setPlaceholderText(SCRIPT_HELP + "(${id},1,${serial},BASE,1)\n@delay 500")
+        else:
+            self.cmd_edit.setPlaceholderText("Enter raw instruction here, e.g.\n(700160818000,1,001,BASE,1)")
+
+    def set_script_running(self, running: bool) -> None:
+        self.btn_send.setEnabled(not running)
+        self.btn_stop.setEnabled(running)
+        self.cmd_edit.setReadOnly(running)
@@ -2,39 +2,52 @@
 
 
 # main.py — UI mejorada (PyQt6) con tema claro/oscuro, QSettings y validadores
-from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import Qt, QRegularExpression, QSettings
-from PyQt6.QtGui import QRegularExpressionValidator, QIcon, QAction
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import Qt, QRegularExpression
+from PyQt6.QtGui import QRegularExpressionValidator
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPlainTextEdit, QSpinBox,
-    QGroupBox, QHBoxLayout, QVBoxLayout, QGridLayout, QTabWidget, QFileDialog,
-    QToolButton, QStyle, QCheckBox, QRadioButton, QPushButton, QComboBox, QSplitter,
-    QStatusBar, QToolBar
+    QWidget, QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, QGridLayout,
+    QCheckBox, QRadioButton, QPushButton, QSplitter,
 )
 
 
 from app.ui.widgets.group_box import    GroupBox
-from app.ui.widgets.icon_circle import IconCircle
 from app.ui.widgets.label_line import LabeledLine
 from app.ui.widgets.number_field import NumberField
 
+from functools import lru_cache
+
+from app.core.protocol import CONFIG_LAYOUT
+from app.core.validation import (
+    IPV4_PATTERN, PHONE_PATTERN, APN_PATTERN, CREDENTIAL_PATTERN,
+    PORT_RANGE, TIME_DIFF_RANGE, INTERVAL_SEC_RANGE, INTERVAL_MIN_RANGE,
+)
+
 
 
 
 
 # ---------- Validadores reutilizables ----------
+# Mismos patrones que app.core.validation (lotes CSV); una instancia por patrón,
+# compartida por todos los campos (Qt permite un validador en varios QLineEdit).
+@lru_cache(maxsize=None)
+def _regex_validator(pattern: str) -> QRegularExpressionValidator:
+    return QRegularExpressionValidator(QRegularExpression(pattern))
+
 def ip_validator() -> QRegularExpressionValidator:
     # IPv4 estricta
-    rx = QRegularExpression(
-        r"^((25[0-5]|2[0-4]\d|[01]?\d?\d)\.){3}"
-        r"(25[0-5]|2[0-4]\d|[01]?\d?\d)$"
-    )
-    return QRegularExpressionValidator(rx)
+    return _regex_validator(IPV4_PATTERN)
 
 def phone_validator() -> QRegularExpressionValidator:
     # 5 a 20 dígitos con opcional +
-    rx = QRegularExpression(r"^\+?\d{5,20}$")
-    return QRegularExpressionValidator(rx)
+    return _regex_validator(PHONE_PATTERN)
+
+def apn_validator() -> QRegularExpressionValidator:
+    return _regex_validator(APN_PATTERN)
+
+def credential_validator() -> QRegularExpressionValidator:
+    # Sin ',' ni paréntesis: romperían la trama del comando
+    return _regex_validator(CREDENTIAL_PATTERN)
 
 
 
@@ -64,12 +77,12 @@ class BaseInfoTab(QWidget):
 
         
         self.main_ip = LabeledLine("Main IP Address:", placeholder="e.g., 52.21.34.100", validator=ip_validator())
-        self.main_port = NumberField("Main IP Port:", 0, 65535, default=11000)
+        self.main_port = NumberField("Main IP Port:", *PORT_RANGE, default=11000)
         self.sub_ip = LabeledLine("Sub IP Address:", placeholder="e.g., 10.0.0.12", validator=ip_validator())
-        self.sub_port = NumberField("Sub IP Port:", 0, 65535, default=11000)
-        self.apn = LabeledLine("APN:", placeholder="e.g., claro.pe")
-        self.apn_user = LabeledLine("APN User:", placeholder="(opcional)")
-        self.apn_pass = LabeledLine("APN Pass:")
+        self.sub_port = NumberField("Sub IP Port:", *PORT_RANGE, default=11000)
+        self.apn = LabeledLine("APN:", placeholder="e.g., claro.pe", validator=apn_validator())
+        self.apn_user = LabeledLine("APN User:", placeholder="(opcional)", validator=credential_validator())
+        self.apn_pass = LabeledLine("APN Pass:", validator=credential_validator())
         #self.apn_pass.edit.setEchoMode(QLineEdit.EchoMode.Password)
 
         rows: list[LabeledLine] = [ self.main_ip, self.main_port, self.sub_ip, self.sub_port, self.apn, self.apn_user, self.apn_pass]
@@ -98,9 +111,9 @@ class BaseInfoTab(QWidget):
         # Timing panel
         time_box = GroupBox("Timing")
         time_grid = QGridLayout(time_box)
-        self.time_diff = NumberField("Time Difference:", -10_000, 10_000, "min", 480)
-        self.upload_interval = NumberField("Tracking Upload Interval:", 0, 86_400, "sec", 60)
-        self.wake_interval = NumberField("Wake up Interval:", 0, 86_400, "min", 30)
+        self.time_diff = NumberField("Time Difference:", *TIME_DIFF_RANGE, "min", 480)
+        self.upload_interval = NumberField("Tracking Upload Interval:", *INTERVAL_SEC_RANGE, "sec", 60)
+        self.wake_interval = NumberField("Wake up Interval:", *INTERVAL_MIN_RANGE, "min", 30)
         self.btn_read_time = QPushButton("Read")
         self.btn_write_time = QPushButton("Write")
         time_grid.addWidget(self.time_diff, 0, 0, 1, 2)
@@ -176,6 +189,73 @@ class BaseInfoTab(QWidget):
 
         root.addWidget(self.split, 0, 0, 1, 1)
 
+        # Campos de configuración (nombres de protocol.CONFIG_LAYOUT) -> widget
+        self._text_fields: dict[str, LabeledLine] = {
+            "main_ip": self.main_ip, "sub_ip": self.sub_ip,
+            "apn": self.apn, "apn_user": self.apn_user, "apn_pass": self.apn_pass,
+        }
+        self._number_fields: dict[str, NumberField] = {
+            "main_port": self.main_port, "sub_port": self.sub_port,
+            "time_diff": self.time_diff, "upload_interval": self.upload_interval,
+            "wake_interval": self.wake_interval,
+        }
+
         
         # rows = [self.main_ip, self.apn, self.apn_user, self.apn_pass, self.sub_ip]
         # normalize_label_width(rows)
+
+    # ---- API de valores (dict con los nombres de campo del protocolo) ----
+    def config_values(self) -> dict:
+        data: dict = {k: w.text().strip() for k, w in self._text_fields.items()}
+        data.update({k: w.spin.value() for k, w in self._number_fields.items()})
+        for i, edit in enumerate(self.vip_edits, start=1):
+            data[f"vip{i}"] = edit.text().strip()
+        return data
+
+    def config_profile(self, keywords: tuple) -> dict:
+        """
+        Valores de `keywords` como un perfil de lote CSV: sin campos vacíos, para validarlos
+        con las mismas reglas. Un QSpinBox siempre tiene valor, así que un grupo con campos
+        de texto (p.ej. IP2) cuenta como lleno sólo si alguno de ellos lo está.
+        """
+        values = self.config_values()
+        profile: dict = {}
+        for keyword in keywords:
+            fields = CONFIG_LAYOUT[keyword]
+            texts = [f for f in fields if f not in self._number_fields]
+            if texts and not any(values[f] for f in texts):
+                continue
+            profile.update({f: values[f] for f in fields if values[f] != ""})
+        return profile
+
+    def set_field_errors(self, errors: dict) -> None:
+        """Marca los campos con error (borde rojo y el mensaje como tooltip) y limpia el resto."""
+        edits = {k: w.edit for k, w in self._text_fields.items()}
+        edits.update({k: w.spin for k, w in self._number_fields.items()})
+        edits.update({f"vip{i}": edit for i, edit in enumerate(self.vip_edits, start=1)})
+        for field, edit in edits.items():
+            msg = errors.get(field, "")
+            edit.setStyleSheet("border: 1px solid #d9534f;" if msg else "")
+            edit.setToolTip(msg)
+
+    def set_config_values(self, data: dict) -> None:
+        for k, w in self._text_fields.items():
+            if k in data:
+                w.setText(str(data[k]))
+        for k, w in self._number_fields.items():
+            if k in data:
+                try:
+                    w.spin.setValue(int(data[k]))
+                except (TypeError, ValueError):
+                    pass
+        for i, edit in enumerate(self.vip_edits, start=1):
+            if f"vip{i}" in data:
+                edit.setText(str(data[f"vip{i}"]))
+
+    def reset_scope(self) -> str:
+        """Alcance del reset de fábrica elegido: ALL | IP | COMMON."""
+        if self.rb_ip.isChecked():
+            return "IP"
+        if self.rb_common.isChecked():
+            return "COMMON"
+        return "ALL"
@@ -0,0 +1,68 @@
+# stall_dialog.py — visor del buffer de bloqueos del event loop
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QPlainTextEdit, QPushButton,
+    QLabel, QSplitter, QFileDialog,
+)
+
+from app.core.watchdog import StallWatchdog
+
+
+class StallDialog(QDialog):
+    """Lista de bloqueos (más reciente arriba) con las pilas muestreadas."""
+
+    def __init__(self, watchdog: StallWatchdog, parent=None):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.setWindowTitle("UI stalls")
+        self.resize(900, 500)
+
+        self.lbl_info = QLabel()
+        self.list = QListWidget()
+        self.detail = QPlainTextEdit()
+        self.detail.setReadOnly(True)
+        split = QSplitter(Qt.Orientation.Vertical)
+        split.addWidget(self.list)
+        split.addWidget(self.detail)
+
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_dump = QPushButton("Dump…")
+        self.btn_close = QPushButton("Close")
+        btns = QHBoxLayout()
+        btns.addWidget(self.lbl_info, 1)
+        btns.addWidget(self.btn_refresh)
+        btns.addWidget(self.btn_dump)
+        btns.addWidget(self.btn_close)
+
+        lay = QVBoxLayout(self)
+        lay.addWidget(split, 1)
+        lay.addLayout(btns)
+
+        self.list.currentRowChanged.connect(self._show_record)
+        self.btn_refresh.clicked.connect(self.reload)
+        self.btn_dump.clicked.connect(self._dump)
+        self.btn_close.clicked.connect(self.close)
+        self.reload()
+
+    def reload(self):
+        self._records = list(reversed(self.watchdog.records))
+        self.list.clear()
+        self.list.addItems([r.summary() for r in self._records])
+        self.lbl_info.setText(
+            f"{len(self._records)} stalls ≥ {self.watchdog.threshold_ms} ms — "
+            f"loop latency now {self.watchdog.last_latency_ms:.0f} ms, max {self.watchdog.max_latency_ms:.0f} ms")
+        if self._records:
+            self.list.setCurrentRow(0)
+        else:
+            self.detail.clear()
+
+    def _show_record(self, row: int):
+        if 0 <= row < len(self._records):
+            rec = self._records[row]
+            self.detail.setPlainText(f"{rec.summary()}\n\n" + "\n".join(rec.samples or ["(sin muestras)"]))
+
+    def _dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump stalls", "stalls.json", "JSON Files (*.json)")
+        if path:
+            n = self.watchdog.dump(path)
+            self.lbl_info.setText(f"{n} stalls written to {path}")
@@ -0,0 +1,35 @@
+# lazy_tab.py — contenedor que construye la página real la primera vez que se muestra
+from typing import Callable, Optional
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+
+class LazyTab(QWidget):
+    """
+    Marcador de pestaña: crea el widget con `factory()` en el primer showEvent
+    (o antes, si alguien llama a `widget()`). Emite `built(widget)` una sola vez.
+    """
+
+    built = pyqtSignal(QWidget)
+
+    def __init__(self, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._widget: Optional[QWidget] = None
+        self._lay = QVBoxLayout(self)
+        self._lay.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def widget(self) -> QWidget:
+        if self._widget is None:
+            self._widget = self._factory()
+            self._lay.addWidget(self._widget)
+            self.built.emit(self._widget)
+        return self._widget
+
+    def showEvent(self, e):
+        self.widget()
+        super().showEvent(e)
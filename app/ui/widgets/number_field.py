@@ -1,6 +1,5 @@
 
 
-from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtWidgets import (QWidget, QLabel,QSpinBox, QHBoxLayout)
 
 
@@ -5,21 +5,15 @@
 
 
 # main.py — UI mejorada (PyQt6) con tema claro/oscuro, QSettings y validadores
-from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import Qt, QRegularExpression, QSettings
-from PyQt6.QtGui import QRegularExpressionValidator, QIcon, QAction
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPlainTextEdit, QSpinBox,
-    QGroupBox, QHBoxLayout, QVBoxLayout, QGridLayout, QTabWidget, QFileDialog,
-    QToolButton, QStyle, QCheckBox, QRadioButton, QPushButton, QComboBox, QSplitter,
-    QStatusBar, QToolBar
-)
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QLabel, QGridLayout, QToolButton, QStyle, QPushButton, QComboBox
 
 
 from app.ui.widgets.group_box import    GroupBox
 from app.ui.widgets.icon_circle import IconCircle
 from app.ui.widgets.label_line import LabeledLine
-from app.ui.widgets.number_field import NumberField
+from app.ui.widgets.port_model import PortListModel, PORT_ROLE, normalize_port_name
 
 class ComPanel(GroupBox):
     def __init__(self):
@@ -34,7 +28,9 @@ class ComPanel(GroupBox):
         self.combo_port = QComboBox()
         self.combo_port.setEditable(True)
         self.combo_port.setToolTip("Escribe p.ej. '10' o 'COM10'")
-        self.combo_port.addItems([str(i) for i in range(1, 51)])
+        self.port_model = PortListModel(self)
+        self.combo_port.setModel(self.port_model)
+        self.combo_port.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
 
         self.label_baud = QLabel("Baud Rate")
         self.combo_baud = QComboBox()
@@ -56,6 +52,37 @@ class ComPanel(GroupBox):
         lay.addWidget(self.label_baud, 1, 0)
         lay.addWidget(self.combo_baud, 1, 1)
 
+    # ---- API ----
+    def set_ports(self, ports: list[str], info_fn) -> None:
+        """Aplica el resultado de un escaneo sin reconstruir el combo."""
+        typed = self.combo_port.currentText()
+        self.port_model.update_ports(ports, info_fn)
+        if self.combo_port.currentIndex() < 0 and typed:
+            self.combo_port.setEditText(typed)
+
+    def selected_port(self) -> str:
+        idx = self.combo_port.currentIndex()
+        text = self.combo_port.currentText()
+        if idx >= 0 and text == self.combo_port.itemText(idx):
+            return self.combo_port.itemData(idx, PORT_ROLE) or ""
+        row = self.port_model.row_of(normalize_port_name(text))
+        if row >= 0:
+            return self.port_model.item(row).data(PORT_ROLE)
+        return normalize_port_name(text)
+
+    def baud_rate(self) -> int:
+        return int(self.combo_baud.currentText())
+
+    def set_connected(self, connected: bool) -> None:
+        """Refleja el estado real del puerto (sin disparar `toggled`)."""
+        self.btn_open.blockSignals(True)
+        self.btn_open.setChecked(connected)
+        self.btn_open.blockSignals(False)
+        self.btn_open.setText("Close [O]" if connected else "Open [O]")
+        self.indicator.setColor("#5cb85c" if connected else "#d9534f")
+        self.combo_port.setEnabled(not connected)
+        self.combo_baud.setEnabled(not connected)
+
 
 
 
@@ -79,7 +106,7 @@ class BasicInfoPanel(GroupBox):
 
         self.btn_refresh = QToolButton()
         self.btn_refresh.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload))
-        self.btn_refresh.setToolTip("Refresh basic information")
+        self.btn_refresh.setToolTip("Refresh basic information (Shift+click: re-read from device)")
 
         # Tamaño mínimo (ejemplo: 32x32 px)
         #self.btn_refresh.setMinimumSize(32, 32)
@@ -104,6 +131,11 @@ class BasicInfoPanel(GroupBox):
         # Columna separada solo para el botón → ocupa 2 filas centrado
         grid.addWidget(self.btn_refresh, 0, 2, 2, 1, alignment=Qt.AlignmentFlag.AlignCenter)
 
+        # Origen de los datos mostrados (caché / equipo)
+        self.lbl_state = QLabel("")
+        self.lbl_state.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        grid.addWidget(self.lbl_state, 2, 0, 1, 3)
+
         # Que columnas 0 y 1 repartan el espacio de los campos
         grid.setColumnStretch(0, 1)
         grid.setColumnStretch(1, 1)
@@ -122,6 +154,20 @@ class BasicInfoPanel(GroupBox):
         self.ed_ccid.setText(data.get("ccid", ""))
         self.ed_version.setText(data.get("version", ""))
 
+    def set_freshness(self, fresh: bool, age_s: float | None = None, reading: bool = True) -> None:
+        """
+        Marca los datos como confirmados por el equipo (fresh) o tomados de la caché (stale).
+        `reading=False`: no hay lectura en curso (p.ej. tras escribir, hasta volver a leer).
+        """
+        if fresh:
+            self.lbl_state.setText("● fresh")
+            self.lbl_state.setStyleSheet("color: #5cb85c;")
+        else:
+            age = "" if age_s is None else f" ({int(age_s // 60)} min)"
+            self.lbl_state.setText(f"● stale — cached{age}, reading…" if reading else "● stale — written, read back to confirm")
+            self.lbl_state.setStyleSheet("color: #f0ad4e;")
+
     def clear(self) -> None:
         for w in (self.ed_id, self.ed_imei, self.ed_ccid, self.ed_version):
             w.setText("")
+        self.lbl_state.setText("")
@@ -0,0 +1,58 @@
+# port_model.py — modelo de puertos para ComPanel.combo_port (actualización por diferencias)
+import sys
+from typing import Any, Callable, Dict, List
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+
+PORT_ROLE = Qt.ItemDataRole.UserRole + 1      # nombre real del puerto ("COM7")
+
+
+def describe_port(name: str, info: Dict[str, Any]) -> str:
+    """Texto visible: 'COM7 — USB-SERIAL CH340 (1A86:7523)'."""
+    parts = [name]
+    desc = (info or {}).get("description") or ""
+    vid, pid = (info or {}).get("vendor_id"), (info or {}).get("product_id")
+    extra = desc
+    if vid is not None and pid is not None:
+        extra = f"{desc} ({vid:04X}:{pid:04X})".strip()
+    if extra:
+        parts.append(extra)
+    return " — ".join(parts)
+
+
+def normalize_port_name(text: str) -> str:
+    """'10' -> 'COM10' en Windows; el resto se deja tal cual."""
+    text = text.strip()
+    if text.isdigit() and sys.platform.startswith("win"):
+        return f"COM{text}"
+    return text
+
+
+class PortListModel(QStandardItemModel):
+    """
+    Lista de puertos que solo agrega/quita las filas que cambiaron en cada escaneo,
+    así el combo conserva su selección y no se reconstruye entero.
+    """
+
+    def update_ports(self, ports: List[str], info_fn: Callable[[str], Dict[str, Any]]) -> None:
+        wanted = set(ports)
+        # Quitar los que ya no están (de abajo hacia arriba para no mover índices pendientes)
+        for row in range(self.rowCount() - 1, -1, -1):
+            if self.item(row).data(PORT_ROLE) not in wanted:
+                self.removeRow(row)
+        present = {self.item(r).data(PORT_ROLE) for r in range(self.rowCount())}
+        for name in ports:
+            if name in present:
+                continue
+            info = info_fn(name)
+            item = QStandardItem(describe_port(name, info))
+            item.setData(name, PORT_ROLE)
+            item.setToolTip("\n".join(f"{k}: {v}" for k, v in info.items() if v not in (None, "")))
+            self.appendRow(item)
+
+    def row_of(self, name: str) -> int:
+        for row in range(self.rowCount()):
+            if self.item(row).data(PORT_ROLE) == name:
+                return row
+        return -1
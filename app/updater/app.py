@@ -43,8 +43,28 @@ class ToolClass(QtWidgets.QWidget, Ui_MainWindow):
         self.update.setVisible(False)
         self.ask.setVisible(False)
 
-        # Connect the "Check" button to the check_update function
+        # Connect the "Check" button to the check_update function; the check runs in the
+        # background and reports back through signals
         self.check.clicked.connect(lambda: self.updater.check_update(self.update, self.ask))
+        self.updater.update_available.connect(lambda tag: self.ask.setText(f"Version {tag} is available, please update."))
+        self.updater.up_to_date.connect(lambda tag: self.show_status(f"You already have the latest version ({tag})."))
+        self.updater.check_failed.connect(self.show_status)
+        self.updater.update_staged.connect(
+            lambda tag: self.show_status(f"Version {tag} is ready and will be used the next time the tool starts."))
+        self.updater.update_failed.connect(self.show_status)
+
+        # Old side-by-side versions are removed in the background, well after startup
+        self.updater.cleanup_old_versions()
+
+    def show_status(self, text):
+        """
+        Shows a short status message in the ask label instead of a modal box.
+
+        Args:
+            text (str): The message to show.
+        """
+        self.ask.setText(text)
+        self.ask.setVisible(True)
 
 if __name__ == "__main__":
     """
@@ -52,6 +72,9 @@ if __name__ == "__main__":
     initializes the PyQt application, and shows the main window.
     """
 
+    # Switch to a staged update (if any) before anything else is loaded
+    Updater.apply_staged_update()
+
     app = QtWidgets.QApplication(sys.argv)
     # Delete old versions
     Updater.delete_old_versions(current_version="v6.00")  # Replace with your tool's version
@@ -0,0 +1,302 @@
+# Description: Binary delta patches between consecutive releases. A patch copies the
+#              unchanged blocks from the installed executable and carries only the new
+#              bytes (LZMA compressed). Patches are applied as a stream, so neither file is
+#              loaded into memory, and the result is verified against the target SHA-256.
+#
+#              Release side:  python delta.py make <old.exe> <new.exe> <patch>
+#              Published as:  <asset>.<from_tag>-<to_tag>.delta, attached to the <to_tag> release.
+
+import hashlib
+import lzma
+import os
+import struct
+import sys
+
+MAGIC = b"CVDELTA1"
+HEADER = struct.Struct("<8s32s32sQ")        # magic, source sha256, target sha256, target size
+OP_COPY = b"C"                               # + offset (u64), length (u32): bytes from the old file
+OP_INSERT = b"I"                             # + length (u32), data: new bytes
+OP_END = b"E"
+COPY = struct.Struct("<QI")
+INSERT = struct.Struct("<I")
+
+BLOCK = 2048                                 # match granularity of `make_delta`
+MAX_INSERT = 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+
+class DeltaError(Exception):
+    """Raised when a patch is malformed or does not produce the expected file."""
+
+
+def file_sha256(path):
+    """
+    Returns the hex SHA-256 of a file, read in blocks.
+
+    Args:
+        path (str): The file to hash.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------ applying
+def read_header(patch_file):
+    """
+    Reads the patch header.
+
+    Returns:
+        tuple: (source sha256 hex, target sha256 hex, target size).
+
+    Raises:
+        DeltaError: If the file is not a patch in this format.
+    """
+    raw = patch_file.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise DeltaError("Truncated patch header")
+    magic, source, target, size = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise DeltaError("Not a delta patch")
+    return source.hex(), target.hex(), size
+
+
+def apply_patch(old_path, patch_path, out_path, check_source=True):
+    """
+    Rebuilds the new file from the old one and a patch, streaming both.
+
+    The output is written to `out_path + ".tmp"` and renamed only when its SHA-256 (computed
+    while writing) matches the target digest recorded in the patch.
+
+    Args:
+        old_path (str): The installed file the patch was made against.
+        patch_path (str): The patch file.
+        out_path (str): Where the rebuilt file goes.
+        check_source (bool): Verify first that `old_path` is the file the patch expects.
+
+    Returns:
+        str: The hex SHA-256 of the rebuilt file.
+
+    Raises:
+        DeltaError: If the source does not match, the patch is corrupt or the result is wrong.
+    """
+    tmp = out_path + ".tmp"
+    with open(patch_path, "rb") as patch:
+        source, target, size = read_header(patch)
+        if check_source and file_sha256(old_path) != source:
+            raise DeltaError("The installed file is not the version this patch applies to")
+        h = hashlib.sha256()
+        written = 0
+        try:
+            with open(old_path, "rb") as old, open(tmp, "wb") as out, lzma.open(patch, "rb") as ops:
+                while True:
+                    op = ops.read(1)
+                    if op == OP_END:
+                        break
+                    if op == OP_COPY:
+                        offset, length = _unpack(COPY, ops)
+                        old.seek(offset)
+                        while length:
+                            block = old.read(min(length, READ_SIZE))
+                            if not block:
+                                raise DeltaError("Patch copies past the end of the installed file")
+                            h.update(block)
+                            out.write(block)
+                            written += len(block)
+                            length -= len(block)
+                    elif op == OP_INSERT:
+                        (length,) = _unpack(INSERT, ops)
+                        data = ops.read(length)
+                        if len(data) != length:
+                            raise DeltaError("Truncated patch data")
+                        h.update(data)
+                        out.write(data)
+                        written += length
+                    else:
+                        raise DeltaError("Corrupt patch")
+                    if written > size:
+                        raise DeltaError("Patch output is larger than expected")
+        except (lzma.LZMAError, EOFError) as e:
+            _remove(tmp)
+            raise DeltaError(f"Corrupt patch: {e}") from e
+        except BaseException:
+            _remove(tmp)
+            raise
+
+    digest = h.hexdigest()
+    if written != size or digest != target:
+        _remove(tmp)
+        raise DeltaError("Patched file does not match the expected checksum")
+    os.replace(tmp, out_path)
+    return digest
+
+
+def _unpack(fmt, stream):
+    raw = stream.read(fmt.size)
+    if len(raw) != fmt.size:
+        raise DeltaError("Truncated patch")
+    return fmt.unpack(raw)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ------------------------------------------------------------------ chains
+def delta_assets(releases, asset_name):
+    """
+    Collects the published patches for `asset_name` from a list of releases.
+
+    Args:
+        releases (list): Release JSON objects (GitHub "releases" endpoint).
+        asset_name (str): Name of the full executable asset.
+
+    Returns:
+        dict: {(from_tag, to_tag): asset dict}.
+    """
+    prefix = asset_name + "."
+    found = {}
+    for release in releases:
+        for asset in release.get("assets", []):
+            name = asset.get("name", "")
+            if not (name.startswith(prefix) and name.endswith(".delta")):
+                continue
+            tag = release.get("tag_name", "")
+            span = name[len(prefix):-len(".delta")]
+            if tag and span.endswith("-" + tag) and len(span) > len(tag) + 1:
+                found[(span[:-len(tag) - 1], tag)] = asset
+    return found
+
+
+def delta_chain(releases, asset_name, current, latest, full_size=None):
+    """
+    Finds the shortest sequence of patches leading from `current` to `latest`.
+
+    Args:
+        releases (list): Release JSON objects.
+        asset_name (str): Name of the full executable asset.
+        current (str): Installed tag.
+        latest (str): Target tag.
+        full_size (int, optional): Size of the full download; a chain that is not smaller is discarded.
+
+    Returns:
+        list or None: Patch asset dicts in application order, or None if no useful chain exists.
+    """
+    edges = {}
+    for (src, dst), asset in delta_assets(releases, asset_name).items():
+        edges.setdefault(src, []).append((dst, asset))
+
+    paths = {current: []}
+    frontier = [current]
+    while frontier and latest not in paths:
+        following = []
+        for tag in frontier:
+            for dst, asset in edges.get(tag, []):
+                if dst not in paths:
+                    paths[dst] = paths[tag] + [asset]
+                    following.append(dst)
+        frontier = following
+
+    chain = paths.get(latest)
+    if not chain:
+        return None
+    if full_size and sum(a.get("size", 0) for a in chain) >= full_size:
+        return None
+    return chain
+
+
+# ------------------------------------------------------------------ making
+def _weak(data):
+    a = sum(data) & 0xFFFF
+    b = sum((len(data) - i) * c for i, c in enumerate(data)) & 0xFFFF
+    return a, b
+
+
+def make_delta(old_path, new_path, patch_path, block=BLOCK):
+    """
+    Writes a patch that turns `old_path` into `new_path` (release tooling, not time critical).
+
+    Blocks of the old file are indexed by an rsync-style rolling checksum; the new file is
+    scanned with the same checksum and matches are extended as far as the bytes agree.
+
+    Args:
+        old_path (str): The previous release.
+        new_path (str): The new release.
+        patch_path (str): Where the patch is written.
+        block (int): Match granularity in bytes.
+
+    Returns:
+        int: Size of the patch in bytes.
+    """
+    with open(old_path, "rb") as f:
+        old = f.read()
+    with open(new_path, "rb") as f:
+        new = f.read()
+
+    index = {}
+    for offset in range(0, len(old) - block + 1, block):
+        a, b = _weak(old[offset:offset + block])
+        index.setdefault((b << 16) | a, offset)
+
+    tmp = patch_path + ".tmp"
+    with open(tmp, "wb") as out:
+        out.write(HEADER.pack(MAGIC, hashlib.sha256(old).digest(), hashlib.sha256(new).digest(), len(new)))
+        with lzma.open(out, "wb", preset=9) as ops:
+            pending = bytearray()
+
+            def flush_insert():
+                for i in range(0, len(pending), MAX_INSERT):
+                    part = pending[i:i + MAX_INSERT]
+                    ops.write(OP_INSERT + INSERT.pack(len(part)) + part)
+                pending.clear()
+
+            pos, n = 0, len(new)
+            a = b = None
+            while pos < n:
+                if pos + block > n:
+                    pending += new[pos:]
+                    break
+                if a is None:
+                    a, b = _weak(new[pos:pos + block])
+                offset = index.get((b << 16) | a)
+                if offset is not None and old[offset:offset + block] == new[pos:pos + block]:
+                    length = block
+                    while (pos + length < n and offset + length < len(old)
+                           and old[offset + length] == new[pos + length]):
+                        length += 1
+                    flush_insert()
+                    ops.write(OP_COPY + COPY.pack(offset, length))
+                    pos += length
+                    a = None
+                    continue
+                # Roll the window one byte forward
+                out_byte = new[pos]
+                pending.append(out_byte)
+                if pos + block < n:
+                    in_byte = new[pos + block]
+                    a = (a - out_byte + in_byte) & 0xFFFF
+                    b = (b - block * out_byte + a) & 0xFFFF
+                else:
+                    a = None
+                pos += 1
+                if len(pending) >= MAX_INSERT:
+                    flush_insert()
+            flush_insert()
+            ops.write(OP_END)
+    os.replace(tmp, patch_path)
+    return os.path.getsize(patch_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] not in ("make", "apply"):
+        print("usage: delta.py make <old> <new> <patch> | delta.py apply <old> <patch> <out>")
+        sys.exit(2)
+    if sys.argv[1] == "make":
+        print(f"{make_delta(*sys.argv[2:])} bytes")
+    else:
+        print(apply_patch(*sys.argv[2:]))
@@ -0,0 +1,431 @@
+# Description: Download engine for the updater. Reuses pooled HTTP connections, resumes
+#              interrupted downloads with HTTP Range requests, adapts the read size to the
+#              measured throughput and can fetch large files as parallel range segments.
+#              The SHA-256 of the file is computed while it streams in, and the file only
+#              reaches its final name when that digest matches the published one.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+TARGET_READ_SECONDS = 0.25          # aim for one read every quarter second
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # smaller files are not worth splitting
+STATE_SAVE_INTERVAL = 1.0           # seconds between resume-state writes
+
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+    # Raised by raw.read() directly, without requests wrapping them
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed after all retries."""
+
+
+class DownloadCancelled(DownloadError):
+    """Raised when `DownloadEngine.cancel` stops a running download."""
+
+
+class IntegrityError(DownloadError):
+    """Raised when the downloaded file does not match the published digest or signature."""
+
+
+class _RangeIgnored(DownloadError):
+    """The server answered a Range request with the whole file (it changed since the probe)."""
+
+
+def make_session(pool_size=8):
+    """
+    Creates a requests Session whose connection pool can serve parallel segments.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def next_chunk_size(current, nbytes, seconds):
+    """
+    Picks the next read size so each read takes about TARGET_READ_SECONDS.
+
+    Args:
+        current (int): The read size that was just used.
+        nbytes (int): Bytes actually returned by that read.
+        seconds (float): Time the read took.
+
+    Returns:
+        int: A power of two between MIN_CHUNK and MAX_CHUNK, at most double the current size.
+    """
+    if seconds <= 0 or nbytes <= 0:
+        return min(MAX_CHUNK, current * 2)
+    wanted = nbytes / seconds * TARGET_READ_SECONDS
+    size = MIN_CHUNK
+    while size < wanted and size < MAX_CHUNK:
+        size *= 2
+    return max(MIN_CHUNK, min(size, current * 2, MAX_CHUNK))
+
+
+class StreamHasher:
+    """
+    SHA-256 fed with the chunks as they arrive, in file order.
+
+    Chunks that land ahead of the hashed prefix (parallel segments) are skipped here and
+    read back from disk by `catch_up` once the prefix reaches them; a sequential download
+    is hashed entirely from memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._hash = hashlib.sha256()
+            self.offset = 0
+
+    def feed(self, offset, data):
+        """Hashes `data` written at `offset` if it continues the hashed prefix."""
+        with self._lock:
+            end = offset + len(data)
+            if offset <= self.offset < end:
+                self._hash.update(memoryview(data)[self.offset - offset:])
+                self.offset = end
+
+    def catch_up(self, path, upto):
+        """Hashes bytes [offset, upto) of `path` that were not seen in memory."""
+        with self._lock:
+            if self.offset >= upto:
+                return
+            with open(path, "rb") as f:
+                f.seek(self.offset)
+                while self.offset < upto:
+                    block = f.read(min(MAX_CHUNK, upto - self.offset))
+                    if not block:
+                        break
+                    self._hash.update(block)
+                    self.offset += len(block)
+
+    def hexdigest(self):
+        with self._lock:
+            return self._hash.hexdigest()
+
+
+class _ResumeState:
+    """
+    Sidecar JSON next to the partial file: validator (ETag/Last-Modified), total size
+    and the byte ranges still to fetch, so an interrupted download continues where it stopped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        return self.data
+
+    def save(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._saved_at < STATE_SAVE_INTERVAL:
+                return
+            self._saved_at = now
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.replace(tmp, self.path)
+
+    def remove(self):
+        for p in (self.path, self.path + ".tmp"):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+class DownloadEngine:
+    """
+    Downloads a URL to a file with connection reuse, Range resume and optional parallel segments.
+
+    The data goes to `<dest>.part` (plus a `<dest>.part.json` resume state) and is renamed to
+    `dest` only when complete. Calling `download` again after a failure resumes from the
+    bytes already on disk, as long as the server still reports the same ETag/Last-Modified.
+    """
+
+    def __init__(self, session=None, segments=1, retries=5, timeout=(5, 30), backoff=0.5):
+        """
+        Args:
+            session (requests.Session, optional): Session to reuse; one is created if omitted.
+            segments (int): Parallel range requests for large files (1 = sequential).
+            retries (int): Reconnect attempts per segment after a dropped connection.
+            timeout (tuple): (connect, read) timeouts in seconds for each request.
+            backoff (float): Base delay in seconds for the exponential retry backoff.
+        """
+        self.session = session or make_session(pool_size=max(4, segments + 2))
+        self.segments = max(1, segments)
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self._cancel = threading.Event()
+        self._progress_lock = threading.Lock()
+        self._on_progress = None
+        self._segments = []
+        self._total = None
+        self._done = 0
+        self.hasher = StreamHasher()
+        self.sha256 = None
+
+    def cancel(self):
+        """Stops the running download; the partial file is kept for a later resume."""
+        self._cancel.set()
+
+    def download(self, url, dest, on_progress=None, expected_sha256=None, verify=None):
+        """
+        Downloads `url` into `dest`, resuming a previous partial download when possible.
+
+        Args:
+            url (str): The URL of the file.
+            dest (str): Final path of the downloaded file.
+            on_progress (callable, optional): Called as on_progress(done_bytes, total_bytes_or_None)
+                from the downloading thread(s).
+            expected_sha256 (str, optional): Hex SHA-256 the file must have.
+            verify (callable, optional): Called with the hex digest of the complete file;
+                returning False rejects it (e.g. a signature check over the digest).
+
+        Returns:
+            int: The number of bytes in the completed file. The digest is left in `self.sha256`.
+
+        Raises:
+            DownloadCancelled: If `cancel` was called.
+            IntegrityError: If the digest or the `verify` check failed; the partial file is discarded.
+            DownloadError: If the download failed after all retries.
+        """
+        self._cancel.clear()
+        self.sha256 = None
+        part = dest + ".part"
+        state = _ResumeState(part + ".json")
+        info = self._probe(url)
+        previous = state.load()
+
+        resumable = (
+            info["ranges"] and info["size"] is not None and os.path.exists(part)
+            and previous.get("size") == info["size"]
+            and previous.get("validator") == info["validator"] and info["validator"]
+        )
+        if not resumable:
+            state.data = {"size": info["size"], "validator": info["validator"],
+                          "pending": self._plan(info)}
+            with open(part, "wb") as f:
+                if info["size"]:
+                    f.truncate(info["size"])
+            state.save(force=True)
+
+        total = info["size"]
+        pending = [list(r) for r in state.data["pending"]]
+        self._total = total
+        self._segments = pending
+        self._done = (total - sum(end - start for start, end in pending)) if total is not None else 0
+        self._on_progress = on_progress
+        self.hasher.reset()
+        if total is not None and pending:
+            self.hasher.catch_up(part, pending[0][0])     # bytes kept from a previous run
+        self._report(0)
+
+        try:
+            if total is None or not info["ranges"]:
+                self._fetch_whole(url, part)
+            elif len(pending) == 1:
+                self._fetch_range(url, part, pending[0], state, info["validator"])
+            else:
+                self._fetch_parallel(url, part, pending, state, info["validator"])
+        except _RangeIgnored:
+            # The file changed under us: the partial data is useless, start over in one piece
+            self._cancel.clear()
+            state.remove()
+            total = None
+            self._fetch_whole(url, part)
+
+        size = os.path.getsize(part)
+        if total is not None and size != total:
+            raise DownloadError(f"Size mismatch: got {size} bytes, expected {total}")
+        self.hasher.catch_up(part, size)
+        digest = self.hasher.hexdigest()
+        if expected_sha256 and digest != expected_sha256.lower():
+            self._discard(part, state)
+            raise IntegrityError(f"Checksum mismatch: got sha256 {digest}, expected {expected_sha256}")
+        if verify is not None and not verify(digest):
+            self._discard(part, state)
+            raise IntegrityError("Signature verification failed")
+        self.sha256 = digest
+        os.replace(part, dest)
+        state.remove()
+        return size
+
+    @staticmethod
+    def _discard(part, state):
+        """A corrupt file must not be resumed either: drop the data and its state."""
+        state.remove()
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------ internals
+    def _probe(self, url):
+        """HEAD request: size, range support and a validator for safe resumes."""
+        try:
+            r = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            r.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise DownloadError(f"Download Failed: {e}") from e
+        length = r.headers.get("Content-Length")
+        return {
+            "size": int(length) if length is not None and length.isdigit() else None,
+            "ranges": r.headers.get("Accept-Ranges", "").lower() == "bytes",
+            "validator": r.headers.get("ETag") or r.headers.get("Last-Modified") or "",
+            "url": r.url,
+        }
+
+    def _plan(self, info):
+        size = info["size"]
+        if size is None:
+            return [[0, 0]]
+        if not info["ranges"] or self.segments == 1 or size < MIN_SEGMENT_SIZE:
+            return [[0, size]]
+        step = -(-size // self.segments)
+        return [[start, min(size, start + step)] for start in range(0, size, step)]
+
+    def _report(self, nbytes):
+        with self._progress_lock:
+            self._done += nbytes
+            done = self._done
+        if self._on_progress:
+            self._on_progress(done, self._total)
+
+    def _read_stream(self, response, write):
+        """Reads the response body with adaptive read sizes, passing each chunk to `write`."""
+        chunk = MIN_CHUNK
+        raw = response.raw
+        while True:
+            if self._cancel.is_set():
+                raise DownloadCancelled("Download cancelled")
+            t0 = time.perf_counter()
+            data = raw.read(chunk, decode_content=True)
+            if not data:
+                return
+            write(data)
+            self._report(len(data))
+            chunk = next_chunk_size(chunk, len(data), time.perf_counter() - t0)
+
+    def _retrying(self, attempt_fn):
+        for attempt in range(self.retries + 1):
+            if self._cancel.is_set():
+                raise DownloadCancelled("Download cancelled")
+            try:
+                return attempt_fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.retries:
+                    raise DownloadError(f"Download Failed: {e}") from e
+                time.sleep(self.backoff * (2 ** attempt))
+            except requests.exceptions.RequestException as e:
+                raise DownloadError(f"Download Failed: {e}") from e
+
+    def _fetch_whole(self, url, part):
+        """No size or no range support: plain GET, restarting from zero on a drop."""
+        self._total = None
+
+        def attempt():
+            with self._progress_lock:
+                self._done = 0
+            self.hasher.reset()
+            with self.session.get(url, stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                length = r.headers.get("Content-Length")
+                self._total = int(length) if length and length.isdigit() else None
+                with open(part, "wb") as f:
+
+                    def write(data):
+                        self.hasher.feed(f.tell(), data)
+                        f.write(data)
+
+                    self._read_stream(r, write)
+                if self._total is not None and os.path.getsize(part) < self._total:
+                    raise requests.exceptions.ChunkedEncodingError("Connection closed early")
+
+        self._retrying(attempt)
+
+    def _fetch_range(self, url, part, segment, state, validator):
+        """Fetches [segment[0], segment[1]) into `part`, updating `segment[0]` as bytes land."""
+        def attempt():
+            if segment[0] >= segment[1]:
+                return
+            headers = {"Range": f"bytes={segment[0]}-{segment[1] - 1}"}
+            if validator:
+                headers["If-Range"] = validator
+            with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                if r.status_code != 206:
+                    raise _RangeIgnored("Server ignored the Range request")
+                with open(part, "r+b") as f:
+                    f.seek(segment[0])
+
+                    def write(data):
+                        self.hasher.feed(segment[0], data)
+                        f.write(data)
+                        segment[0] += len(data)
+                        state.data["pending"] = [s for s in self._segments if s[0] < s[1]]
+                        state.save()
+
+                    self._read_stream(r, write)
+                if segment[0] < segment[1]:
+                    raise requests.exceptions.ChunkedEncodingError("Connection closed early")
+
+        try:
+            self._retrying(attempt)
+        finally:
+            state.data["pending"] = [s for s in self._segments if s[0] < s[1]]
+            state.save(force=True)
+
+    def _fetch_parallel(self, url, part, pending, state, validator):
+        errors = []
+
+        def worker(segment):
+            try:
+                self._fetch_range(url, part, segment, state, validator)
+            except DownloadError as e:
+                errors.append(e)
+                self._cancel.set()          # stop the sibling segments too
+
+        threads = [threading.Thread(target=worker, args=(seg,), daemon=True) for seg in pending]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            real = [e for e in errors if not isinstance(e, DownloadCancelled)]
+            raise (real or errors)[0]
@@ -0,0 +1,141 @@
+# Description: Integrity checks for downloaded releases. Finds the SHA-256 digest published
+#              with a GitHub release (asset `digest` field, a checksum asset or the release
+#              notes) and optionally verifies an Ed25519 signature over that digest.
+
+import base64
+import re
+
+import requests
+
+HEX_DIGEST = re.compile(r"\b([0-9a-fA-F]{64})\b")
+CHECKSUM_ASSETS = ("SHA256SUMS", "SHA256SUMS.txt", "checksums.txt")
+
+
+def parse_digest(text):
+    """
+    Extracts a SHA-256 hex digest from "sha256:<hex>" or a bare hex string.
+
+    Args:
+        text (str): The text to parse.
+
+    Returns:
+        str or None: The lowercase hex digest, or None if `text` holds none.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if text.lower().startswith("sha256:"):
+        text = text[len("sha256:"):]
+    match = HEX_DIGEST.fullmatch(text)
+    return match.group(1).lower() if match else None
+
+
+def find_in_checksums(text, name):
+    """
+    Looks up `name` in a sha256sum-style listing ("<hex>  <name>" per line).
+
+    Args:
+        text (str): The checksum listing.
+        name (str): The asset file name.
+
+    Returns:
+        str or None: The lowercase hex digest for `name`, if listed.
+    """
+    for line in text.splitlines():
+        parts = line.strip().split()
+        if len(parts) == 2 and parts[1].lstrip("*") == name:
+            return parse_digest(parts[0])
+        if len(parts) == 1 and HEX_DIGEST.fullmatch(parts[0]):
+            return parts[0].lower()          # "<name>.sha256" files often hold just the digest
+    return None
+
+
+def release_digest(release, asset, session=None, timeout=(5, 15)):
+    """
+    Finds the SHA-256 published for `asset` in the release metadata.
+
+    Looks, in order, at the asset's own `digest` field, a `<name>.sha256` asset, a
+    SHA256SUMS/checksums.txt asset and finally "<hex>  <name>" lines in the release notes.
+
+    Args:
+        release (dict): The release JSON from the GitHub API.
+        asset (dict): The asset to be downloaded, taken from `release['assets']`.
+        session (requests.Session, optional): Session used to fetch checksum assets.
+        timeout (tuple): (connect, read) timeouts for those requests.
+
+    Returns:
+        str or None: The lowercase hex digest, or None if the release publishes none.
+    """
+    digest = parse_digest(asset.get("digest") or "")
+    if digest:
+        return digest
+
+    name = asset.get("name", "")
+    by_name = {a.get("name"): a for a in release.get("assets", [])}
+    for candidate in (name + ".sha256",) + CHECKSUM_ASSETS:
+        checksum_asset = by_name.get(candidate)
+        if checksum_asset is None:
+            continue
+        try:
+            text = fetch_text(checksum_asset["browser_download_url"], session, timeout)
+        except requests.exceptions.RequestException:
+            continue
+        digest = find_in_checksums(text, name)
+        if digest:
+            return digest
+
+    return find_in_checksums(release.get("body") or "", name)
+
+
+def fetch_text(url, session=None, timeout=(5, 15)):
+    """
+    Downloads a small text asset (checksums, signatures).
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    r = (session or requests).get(url, timeout=timeout)
+    r.raise_for_status()
+    return r.text
+
+
+def signature_verifier(public_key, signature):
+    """
+    Builds a `verify(digest_hex)` callable for `DownloadEngine.download` that checks an
+    Ed25519 signature over the 32 raw bytes of the SHA-256 digest.
+
+    Args:
+        public_key (bytes or str): The 32-byte raw public key, or its base64 form.
+        signature (bytes or str): The 64-byte signature, or its base64 form.
+
+    Returns:
+        callable: Returns True when the signature matches the digest.
+
+    Raises:
+        RuntimeError: If the optional `cryptography` package is not installed.
+    """
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+    except ImportError as e:
+        raise RuntimeError("Signature checks need the 'cryptography' package") from e
+
+    key = Ed25519PublicKey.from_public_bytes(_raw(public_key, 32))
+    sig = _raw(signature, 64)
+
+    def verify(digest_hex):
+        try:
+            key.verify(sig, bytes.fromhex(digest_hex))
+            return True
+        except InvalidSignature:
+            return False
+
+    return verify
+
+
+def _raw(value, size):
+    if isinstance(value, str) or len(value) != size:
+        value = base64.b64decode(value.strip())
+    if len(value) != size:
+        raise ValueError(f"Expected {size} bytes, got {len(value)}")
+    return value
@@ -0,0 +1,337 @@
+# Description: Site-local distribution of releases. `AssetCache` stores verified release files
+#              under their SHA-256, and `MirrorServer` lets one station serve that cache (and
+#              the release metadata) to the other stations over HTTP, fetching each file from
+#              the internet only the first time any station asks for it.
+#
+#              python mirror.py --cache DIR [--port 8765] [--upstream-api URL]
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+try:
+    from .download import DownloadEngine, DownloadError, make_session
+    from .release_check import ReleaseCache, ReleaseCheckError, cached_json
+except ImportError:  # run as a script next to download.py
+    from download import DownloadEngine, DownloadError, make_session
+    from release_check import ReleaseCache, ReleaseCheckError, cached_json
+
+DEFAULT_PORT = 8765
+DEFAULT_ALLOWED_HOSTS = ("github.com", "objects.githubusercontent.com",
+                         "release-assets.githubusercontent.com")
+COPY_BLOCK = 1024 * 1024
+ASSET_PATH = re.compile(r"^/sha256/([0-9a-f]{64})$")
+
+
+def mirror_asset_url(mirror_url, digest, upstream_url=None):
+    """
+    URL of a release file on a mirror.
+
+    Args:
+        mirror_url (str): Base URL of the mirror, e.g. "http://station-01:8765".
+        digest (str): Hex SHA-256 of the file.
+        upstream_url (str, optional): Where the mirror can fetch the file if it lacks it.
+
+    Returns:
+        str: The content-addressed URL.
+    """
+    url = f"{mirror_url.rstrip('/')}/sha256/{digest.lower()}"
+    return url + "?url=" + quote(upstream_url, safe="") if upstream_url else url
+
+
+class AssetCache:
+    """
+    Content-addressed store: the file with digest D lives at <root>/sha256/D[:2]/D.
+
+    Files only enter the cache through `add`, after their digest has been verified, so a
+    name is a guarantee of content and entries never need revalidation.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        digest = digest.lower()
+        return os.path.join(self.root, "sha256", digest[:2], digest)
+
+    def has(self, digest):
+        return bool(digest) and os.path.isfile(self.path(digest))
+
+    def add(self, src, digest, move=False):
+        """
+        Stores a verified file under its digest.
+
+        Args:
+            src (str): The file to store.
+            digest (str): Its hex SHA-256, already checked by the caller.
+            move (bool): Move `src` into the cache instead of copying it.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        dest = self.path(digest)
+        if os.path.isfile(dest):
+            return dest
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{threading.get_ident()}.tmp"
+        if move:
+            shutil.move(src, tmp)
+        else:
+            try:
+                os.link(src, tmp)              # same volume: no copy at all
+            except OSError:
+                shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        return dest
+
+    def copy_to(self, digest, dest):
+        """
+        Copies a cached file to `dest` through a temporary file.
+
+        Returns:
+            bool: False if the digest is not cached.
+        """
+        if not self.has(digest):
+            return False
+        tmp = dest + ".part"
+        shutil.copyfile(self.path(digest), tmp)
+        os.replace(tmp, dest)
+        os.utime(self.path(digest))            # recently used: kept by `prune`
+        return True
+
+    def prune(self, max_bytes):
+        """
+        Deletes the least recently used files until the cache fits in `max_bytes`.
+
+        Returns:
+            int: Number of files removed.
+        """
+        entries = []
+        for folder, _, names in os.walk(os.path.join(self.root, "sha256")):
+            for name in names:
+                path = os.path.join(folder, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class MirrorServer:
+    """
+    HTTP server sharing an AssetCache with the other stations of a site.
+
+    Routes:
+        GET/HEAD /sha256/<digest>[?url=<upstream>]  File by content; on a miss the mirror downloads
+                                                  it from `url` (allowed hosts only), verifies the
+                                                  digest and caches it. Supports Range for resumes.
+        GET /releases/latest, /releases           Release metadata from `upstream_api` (if set), cached
+                                                  and revalidated like the stations' own checks.
+    """
+
+    def __init__(self, cache, host="0.0.0.0", port=DEFAULT_PORT, upstream_api=None,
+                 allowed_hosts=DEFAULT_ALLOWED_HOSTS, metadata_cache=None, session=None):
+        """
+        Args:
+            cache (AssetCache): Where the served files live.
+            host (str): Interface to listen on.
+            port (int): TCP port; 0 picks a free one.
+            upstream_api (str, optional): Base of the GitHub repository API used for release metadata,
+                e.g. "https://api.github.com/repos/<owner>/<repo>".
+            allowed_hosts (tuple): Hosts the mirror may download files from (not an open proxy).
+            metadata_cache (ReleaseCache, optional): Cache for release metadata; kept in the asset
+                cache folder by default.
+            session (requests.Session, optional): Pooled session shared by the upstream downloads.
+        """
+        self.cache = cache
+        self.upstream_api = upstream_api.rstrip("/") if upstream_api else None
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.metadata_cache = metadata_cache or ReleaseCache(os.path.join(cache.root, "releases.json"))
+        self.session = session or make_session()
+        self.upstream_fetches = 0
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def start(self):
+        """Serves in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="update-mirror", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    # ------------------------------------------------------------------ internals
+    def _lock_for(self, digest):
+        with self._locks_guard:
+            return self._locks.setdefault(digest, threading.Lock())
+
+    def ensure(self, digest, upstream_url):
+        """
+        Makes sure `digest` is cached, downloading it once even if many stations ask at the same time.
+
+        Returns:
+            bool: True if the file is (now) in the cache.
+        """
+        if self.cache.has(digest):
+            return True
+        if not upstream_url or urlsplit(upstream_url).hostname not in self.allowed_hosts:
+            return False
+        with self._lock_for(digest):
+            if self.cache.has(digest):
+                return True                    # another request fetched it meanwhile
+            tmp = self.cache.path(digest) + ".download"
+            os.makedirs(os.path.dirname(tmp), exist_ok=True)
+            try:
+                DownloadEngine(self.session).download(upstream_url, tmp, expected_sha256=digest)
+            except DownloadError:
+                return False
+            self.upstream_fetches += 1
+            self.cache.add(tmp, digest, move=True)
+            return True
+
+    def _handler(self):
+        mirror = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self._route(body=False)
+
+            def do_GET(self):
+                self._route(body=True)
+
+            def _route(self, body):
+                parts = urlsplit(self.path)
+                match = ASSET_PATH.match(parts.path)
+                if match:
+                    upstream = parse_qs(parts.query).get("url", [None])[0]
+                    self._serve_asset(match.group(1), upstream, body)
+                elif parts.path in ("/releases/latest", "/releases") and mirror.upstream_api:
+                    self._serve_metadata(parts.path, body)
+                else:
+                    self._empty(404)
+
+            def _empty(self, status):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _serve_asset(self, digest, upstream, body):
+                if not mirror.ensure(digest, upstream):
+                    self._empty(404 if not upstream else 502)
+                    return
+                path = mirror.cache.path(digest)
+                size = os.path.getsize(path)
+                etag = f'"{digest}"'
+                start, end, status = 0, size, 200
+                m = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+                if m and self.headers.get("If-Range", etag) == etag and int(m.group(1)) < size:
+                    start = int(m.group(1))
+                    end = min(size, int(m.group(2)) + 1) if m.group(2) else size
+                    status = 206
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("ETag", etag)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+                self.send_header("Content-Length", str(end - start))
+                self.end_headers()
+                if not body:
+                    return
+                with open(path, "rb") as f:
+                    f.seek(start)
+                    remaining = end - start
+                    while remaining:
+                        block = f.read(min(COPY_BLOCK, remaining))
+                        if not block:
+                            break
+                        self.wfile.write(block)
+                        remaining -= len(block)
+
+            def _serve_metadata(self, path, body):
+                try:
+                    data, _ = cached_json(mirror.upstream_api + path, mirror.metadata_cache, mirror.session)
+                except ReleaseCheckError:
+                    self._empty(502)
+                    return
+                payload = json.dumps(data).encode()
+                etag = '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(payload)
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cached releases to the other stations of a site.")
+    parser.add_argument("--cache", required=True, help="content-addressed cache folder")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--upstream-api",
+                        help="GitHub repository API base, e.g. https://api.github.com/repos/<owner>/<repo>")
+    args = parser.parse_args(argv)
+    server = MirrorServer(AssetCache(args.cache), args.host, args.port, args.upstream_api)
+    print(f"Serving {args.cache} on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
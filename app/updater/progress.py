@@ -0,0 +1,151 @@
+# Description: Download progress reporting. Turns the stream of per-chunk byte counts into a
+#              few progress events (throttled by time and by percent) that carry the bytes
+#              done, the total, a smoothed transfer rate and the remaining time. Servers that
+#              do not send a content-length get time-throttled events without a percentage.
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+MIN_INTERVAL_S = 0.1        # at most ~10 events per second
+MIN_PERCENT_STEP = 1        # and only when the integer percentage moved
+RATE_TIME_CONSTANT_S = 2.0  # smoothing of the transfer rate (exponential moving average)
+
+
+@dataclass
+class ProgressEvent:
+    """
+    One progress update.
+
+    Attributes:
+        done (int): Bytes transferred so far.
+        total (int or None): Expected bytes, None when the size is unknown (indeterminate).
+        rate (float): Smoothed throughput in bytes per second.
+        eta_s (float or None): Estimated seconds left, None when it cannot be estimated.
+        finished (bool): True for the last event of a transfer.
+    """
+    done: int
+    total: Optional[int]
+    rate: float
+    eta_s: Optional[float]
+    finished: bool = False
+
+    @property
+    def percent(self):
+        """Integer percentage, or None in indeterminate mode."""
+        if not self.total:
+            return None
+        return min(100, int(100 * self.done / self.total))
+
+    def describe(self):
+        """Short text such as "1.2 MB/s, 0:35 left" for a status line or progress bar."""
+        text = f"{format_bytes(self.rate)}/s"
+        if self.eta_s is not None and not self.finished:
+            text += f", {format_duration(self.eta_s)} left"
+        if self.total is None:
+            text = f"{format_bytes(self.done)} at {text}"
+        return text
+
+
+class RateEstimator:
+    """
+    Exponential moving average of the throughput with a time-based weight, so irregular chunk
+    timing (adaptive read sizes, bursts after stalls) does not make the estimate jump around.
+    """
+
+    def __init__(self, time_constant_s=RATE_TIME_CONSTANT_S):
+        self.time_constant_s = time_constant_s
+        self.rate = 0.0
+        self._last_time = None
+        self._last_done = 0
+
+    def update(self, done, now):
+        if self._last_time is None:
+            self._last_time, self._last_done = now, done
+            return self.rate
+        dt = now - self._last_time
+        if dt <= 0:
+            return self.rate
+        instant = max(0, done - self._last_done) / dt
+        if self.rate == 0.0:
+            self.rate = instant
+        else:
+            alpha = 1.0 - math.exp(-dt / self.time_constant_s)
+            self.rate += alpha * (instant - self.rate)
+        self._last_time, self._last_done = now, done
+        return self.rate
+
+
+class ProgressMeter:
+    """
+    Decides which byte counts become `ProgressEvent`s.
+
+    `update` is meant to be called for every chunk (from any thread); it returns an event only
+    when at least `min_interval_s` passed since the last one and, with a known total, the integer
+    percentage moved by `min_percent_step`. `finish` always returns a final event.
+    """
+
+    def __init__(self, min_interval_s=MIN_INTERVAL_S, min_percent_step=MIN_PERCENT_STEP,
+                 time_constant_s=RATE_TIME_CONSTANT_S, clock=time.monotonic):
+        self.min_interval_s = min_interval_s
+        self.min_percent_step = min_percent_step
+        self.clock = clock
+        self.estimator = RateEstimator(time_constant_s)
+        self._last_emit = None
+        self._last_percent = None
+        self._last = None
+        self._lock = threading.Lock()
+
+    def update(self, done, total):
+        """
+        Args:
+            done (int): Bytes transferred so far.
+            total (int or None): Expected bytes, None if unknown.
+
+        Returns:
+            ProgressEvent or None: The event to publish, if any.
+        """
+        with self._lock:
+            now = self.clock()
+            rate = self.estimator.update(done, now)
+            self._last = (done, total)
+            if self._last_emit is not None and now - self._last_emit < self.min_interval_s:
+                return None
+            event = self._event(done, total, rate)
+            percent = event.percent
+            if (self._last_emit is not None and percent is not None and self._last_percent is not None
+                    and percent - self._last_percent < self.min_percent_step):
+                return None
+            self._last_emit, self._last_percent = now, percent
+            return event
+
+    def finish(self):
+        """The final event, with the last byte count seen (which is also the total if it was unknown)."""
+        with self._lock:
+            done, total = self._last or (0, None)
+            event = self._event(done, total if total is not None else done, self.estimator.rate)
+        event.finished = True
+        event.eta_s = 0.0
+        return event
+
+    def _event(self, done, total, rate):
+        eta = None
+        if total and rate > 0:
+            eta = max(0.0, (total - done) / rate)
+        return ProgressEvent(done, total, rate, eta)
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
@@ -0,0 +1,127 @@
+# Description: Release metadata lookup for the updater. Keeps the last answer of the GitHub
+#              releases API on disk and revalidates it with conditional requests
+#              (If-None-Match / If-Modified-Since) once its TTL expires, so repeated checks
+#              from many stations cost a 304 or no request at all.
+
+import json
+import os
+import threading
+import time
+
+import requests
+
+DEFAULT_TTL = 15 * 60          # seconds a cached answer is used without asking the server
+DEFAULT_TIMEOUT = (3.05, 10)   # (connect, read) seconds
+
+
+class ReleaseCheckError(Exception):
+    """Raised when the release metadata cannot be obtained and nothing is cached."""
+
+
+class ReleaseCache:
+    """
+    JSON file mapping an API URL to its last response body and validators.
+
+    Entries look like {"etag": ..., "last_modified": ..., "fetched_at": epoch, "body": <json>}.
+    Writes go through a temporary file and os.replace, so a crash never leaves a torn cache.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        """
+        Args:
+            path (str): Location of the cache file; its folder is created when needed.
+            ttl (float): Seconds an entry is fresh enough to skip the network entirely.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        return self._load().get(url)
+
+    def put(self, url, entry):
+        with self._lock:
+            data = self._load()
+            data[url] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def is_fresh(self, entry, now):
+        return entry is not None and 0 <= now - entry.get("fetched_at", 0) < self.ttl
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+
+def latest_release(api_url, cache=None, session=None, timeout=DEFAULT_TIMEOUT, now=None):
+    """
+    Returns the latest release metadata, asking the server only when the cache is stale.
+
+    Args:
+        api_url (str): The GitHub "releases/latest" endpoint (or a mirror of it).
+        cache (ReleaseCache, optional): On-disk cache; without it every call hits the network.
+        session (requests.Session, optional): Session to reuse for the request.
+        timeout (tuple): (connect, read) timeouts in seconds.
+        now (float, optional): Current epoch time, for tests.
+
+    Returns:
+        tuple: (release dict, source) where source is "cache" (fresh, no request),
+        "not-modified" (304 revalidation), "network" (new body) or "stale" (the server
+        could not be reached and the last known answer is returned).
+
+    Raises:
+        ReleaseCheckError: If the request failed and there is no cached answer.
+    """
+    return cached_json(api_url, cache, session, timeout, now)
+
+
+def releases_url(api_url):
+    """The "list releases" endpoint that belongs to a "releases/latest" URL."""
+    return api_url[:-len("/latest")] if api_url.endswith("/latest") else api_url
+
+
+def cached_json(url, cache=None, session=None, timeout=DEFAULT_TIMEOUT, now=None):
+    """
+    GETs a JSON document through the cache; see `latest_release` for arguments and results.
+    """
+    now = time.time() if now is None else now
+    entry = cache.get(url) if cache else None
+    if cache and cache.is_fresh(entry, now):
+        return entry["body"], "cache"
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        r = (session or requests).get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and entry:
+            entry["fetched_at"] = now
+            cache.put(url, entry)
+            return entry["body"], "not-modified"
+        r.raise_for_status()
+        body = r.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        if entry:
+            return entry["body"], "stale"
+        raise ReleaseCheckError(f"Failed to check for updates: {e}") from e
+
+    if cache:
+        cache.put(url, {
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+            "fetched_at": now,
+            "body": body,
+        })
+    return body, "network"
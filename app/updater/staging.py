@@ -0,0 +1,224 @@
+# Description: Staged updates. A verified release is placed next to the installed ones
+#              (versions/<tag>/<file>) and recorded as staged; the switch happens on the next
+#              launch, before any window is created, so a running session is never interrupted.
+#              Works the same on Windows and Linux. Old versions are removed later, in small
+#              bounded batches, away from the startup path.
+
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+STATE_FILE = "versions.json"
+VERSIONS_DIR = "versions"
+RELAUNCH_ENV = "CONFIGVER_UPDATER_RELAUNCHED"   # guards against relaunch loops
+
+
+class StagedUpdates:
+    """
+    Side-by-side versions under one install root.
+
+    `<root>/versions.json` holds {"current": {...}, "previous": {...}, "staged": {...}}, each entry
+    being {"version", "path", "sha256"} with `path` relative to the root. It is only replaced
+    atomically, so an interrupted update leaves the previous state intact.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Install folder (the folder of the launcher executable).
+        """
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ state
+    def load(self):
+        try:
+            with open(os.path.join(self.root, STATE_FILE), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        path = os.path.join(self.root, STATE_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+
+    def version_path(self, version, file_name):
+        """Where `file_name` of `version` lives (the download target for a staged update)."""
+        return os.path.join(self.root, VERSIONS_DIR, _safe(version), file_name)
+
+    def abspath(self, entry):
+        return os.path.join(self.root, entry["path"]) if entry and entry.get("path") else None
+
+    # ------------------------------------------------------------------ staging
+    def stage(self, path, version, sha256=None):
+        """
+        Records an already verified file as the version to switch to on the next launch.
+
+        Args:
+            path (str): The downloaded executable, normally `version_path(version, name)`.
+            version (str): Its release tag.
+            sha256 (str, optional): Its verified digest, kept for reference.
+
+        Returns:
+            dict: The staged entry.
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        if os.name != "nt":
+            mode = os.stat(path).st_mode
+            os.chmod(path, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        entry = {"version": version, "path": os.path.relpath(os.path.abspath(path), self.root),
+                 "sha256": sha256, "staged_at": time.time()}
+        with self._lock:
+            data = self.load()
+            data["staged"] = entry
+            self._save(data)
+        return entry
+
+    def staged(self):
+        """The staged entry if its file is still there, else None."""
+        entry = self.load().get("staged")
+        return entry if entry and os.path.isfile(self.abspath(entry)) else None
+
+    def promote(self):
+        """
+        Makes the staged version current (the previous current one is kept as "previous").
+
+        Returns:
+            dict or None: The new current entry, or None if nothing was staged.
+        """
+        with self._lock:
+            data = self.load()
+            entry = data.pop("staged", None)
+            if not entry or not os.path.isfile(self.abspath(entry)):
+                if entry is not None:
+                    self._save(data)           # staged file vanished: forget it
+                return None
+            if data.get("current"):
+                data["previous"] = data["current"]
+            data["current"] = entry
+            self._save(data)
+            return entry
+
+    def current_path(self):
+        entry = self.load().get("current")
+        path = self.abspath(entry)
+        return path if path and os.path.isfile(path) else None
+
+    # ------------------------------------------------------------------ cleanup
+    def cleanup(self, keep=2, max_removals=3, budget_s=2.0, running=None):
+        """
+        Deletes old version folders, newest kept first, within a removal and time budget.
+
+        The current, previous and staged versions are never touched, nor the folder of the
+        running executable. Folders that cannot be deleted (e.g. a file still in use on
+        Windows) are skipped and retried on a later call.
+
+        Args:
+            keep (int): Number of most recent versions to keep in addition to the protected ones.
+            max_removals (int): Maximum folders removed in this call.
+            budget_s (float): Stop starting new removals after this many seconds.
+            running (str, optional): Path of the running executable.
+
+        Returns:
+            list: Names of the removed version folders.
+        """
+        base = os.path.join(self.root, VERSIONS_DIR)
+        try:
+            folders = [e for e in os.scandir(base) if e.is_dir()]
+        except OSError:
+            return []
+        data = self.load()
+        protected = {os.path.normcase(os.path.dirname(self.abspath(data.get(k))))
+                     for k in ("current", "previous", "staged") if data.get(k)}
+        if running:
+            protected.add(os.path.normcase(os.path.dirname(os.path.abspath(running))))
+
+        candidates = sorted((e for e in folders if os.path.normcase(e.path) not in protected),
+                            key=lambda e: e.stat().st_mtime, reverse=True)[keep:]
+        removed, deadline = [], time.monotonic() + budget_s
+        for folder in reversed(candidates):                      # oldest first
+            if len(removed) >= max_removals or time.monotonic() > deadline:
+                break
+            try:
+                shutil.rmtree(folder.path)
+                removed.append(folder.name)
+            except OSError:
+                pass
+        return removed
+
+    def cleanup_in_background(self, delay_s=30.0, **kwargs):
+        """
+        Runs `cleanup` in a daemon thread after `delay_s`, so it never competes with startup.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        def run():
+            time.sleep(delay_s)
+            self.cleanup(**kwargs)
+
+        thread = threading.Thread(target=run, name="updater-cleanup", daemon=True)
+        thread.start()
+        return thread
+
+
+def running_executable():
+    """The running executable: the frozen binary, or the script for source installs."""
+    return os.path.abspath(sys.executable if getattr(sys, "frozen", False) else sys.argv[0])
+
+
+def install_root(executable):
+    """Install folder of `executable`, also when it is one of the side-by-side versions."""
+    folder = os.path.dirname(os.path.abspath(executable))
+    versions = os.path.dirname(folder)
+    if os.path.basename(versions) == VERSIONS_DIR:
+        return os.path.dirname(versions)
+    return folder
+
+
+def launch_staged(root=None, argv=None, running=None, execute=True):
+    """
+    To be called first thing at startup: switches to a staged update and makes sure the current
+    version is the one running.
+
+    A staged version is promoted to current, then, if the running executable is not the current
+    version, the current one is started with the same arguments and this process ends.
+
+    Args:
+        root (str, optional): Install folder; defaults to `install_root` of the running executable.
+        argv (list, optional): Arguments to pass on; defaults to sys.argv[1:].
+        running (str, optional): The running executable; defaults to `running_executable()`.
+        execute (bool): Actually start the other executable (False returns its path, for tests).
+
+    Returns:
+        str or None: The executable that should run, if it is not this one.
+    """
+    running = os.path.abspath(running or running_executable())
+    staging = StagedUpdates(root or install_root(running))
+    staging.promote()
+    target = staging.current_path()
+    if not target or os.path.normcase(target) == os.path.normcase(running) or os.environ.get(RELAUNCH_ENV):
+        return None
+    if not execute:
+        return target
+
+    args = [target] + list(sys.argv[1:] if argv is None else argv)
+    env = dict(os.environ, **{RELAUNCH_ENV: "1"})
+    if os.name == "nt":
+        subprocess.Popen(args, env=env, close_fds=True)
+        sys.exit(0)
+    os.execve(target, args, env)                                  # does not return
+
+
+def _safe(version):
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in version) or "unknown"
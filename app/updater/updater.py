@@ -12,69 +12,284 @@ import sys
 import requests
 from PyQt6 import QtCore, QtWidgets
 
+try:
+    from .download import DownloadCancelled, DownloadEngine, DownloadError
+    from .delta import DeltaError, apply_patch, delta_chain
+    from .integrity import fetch_text, parse_digest, release_digest, signature_verifier
+    from .mirror import AssetCache, mirror_asset_url
+    from .progress import ProgressMeter
+    from .staging import StagedUpdates, install_root, launch_staged, running_executable
+    from .release_check import (DEFAULT_TTL, ReleaseCache, ReleaseCheckError, cached_json, latest_release,
+                                releases_url)
+except ImportError:  # run as a script next to download.py
+    from download import DownloadCancelled, DownloadEngine, DownloadError
+    from delta import DeltaError, apply_patch, delta_chain
+    from integrity import fetch_text, parse_digest, release_digest, signature_verifier
+    from mirror import AssetCache, mirror_asset_url
+    from progress import ProgressMeter
+    from staging import StagedUpdates, install_root, launch_staged, running_executable
+    from release_check import (DEFAULT_TTL, ReleaseCache, ReleaseCheckError, cached_json, latest_release,
+                               releases_url)
+
+CHECK_TIMEOUT_S = 15     # overall limit for a background update check
+
 
 class DownloadThread(QtCore.QThread):
     """
     A QThread subclass that handles the downloading of the latest version of the application.
 
+    Progress is throttled (by time and by percent, see progress.py) so a download produces a
+    few dozen events instead of one per chunk.
+
     Signals:
-        progress (int): Emitted with the current download progress percentage.
+        progress (int): Emitted with the current download progress percentage (not emitted while
+            the size is unknown).
+        progress_info (ProgressEvent): Emitted with bytes done, total (None if unknown), smoothed
+            rate and ETA; the last one has `finished` set.
         finished (str): Emitted when the download is completed or fails, with a message describing the outcome.
     """
 
     progress = QtCore.pyqtSignal(int)
+    progress_info = QtCore.pyqtSignal(object)
     finished = QtCore.pyqtSignal(str)
 
-    def __init__(self, download_url, save_path):
+    def __init__(self, download_url, save_path, expected_sha256=None, signature_url=None,
+                 public_key=None, segments=1, deltas=None, base_path=None, asset_cache=None,
+                 mirror_url=None):
         """
         Initializes the download thread with the URL of the file to be downloaded and the path to save it.
 
         Args:
             download_url (str): The URL of the file to be downloaded.
             save_path (str): The local file path where the downloaded file will be saved.
+            expected_sha256 (str, optional): Published SHA-256; the file is only saved if it matches.
+            signature_url (str, optional): URL of an Ed25519 signature over the digest.
+            public_key (str or bytes, optional): Key that must have produced that signature.
+            segments (int): Number of parallel range requests used for large files.
+            deltas (list, optional): Patch assets leading from `base_path` to the new version; when
+                they fail to apply, the full file is downloaded instead.
+            base_path (str, optional): The installed executable the patches apply to.
+            asset_cache (AssetCache, optional): Local content-addressed cache; a cached release is
+                copied instead of downloaded, and every verified download is added to it.
+            mirror_url (str, optional): Site mirror tried before the internet for files with a known digest.
         """
         super().__init__()
         self.download_url = download_url
         self.save_path = save_path
+        self.expected_sha256 = expected_sha256
+        self.signature_url = signature_url
+        self.public_key = public_key
+        self.deltas = deltas or []
+        self.base_path = base_path
+        self.used_delta = False
+        self.asset_cache = asset_cache
+        self.mirror_url = mirror_url
+        self.engine = DownloadEngine(segments=segments)
+        self.meter = ProgressMeter()
+
+    def cancel(self):
+        """Stops the download; the partial file is kept and resumed by the next attempt."""
+        self.engine.cancel()
 
     def run(self):
         """
         Starts the download process. Emits the progress signal as the download proceeds,
-        and emits the finished signal when the download is complete or fails.
+        and emits the finished signal when the download is complete or fails. A download
+        interrupted earlier resumes from the partial file instead of starting over.
         """
         try:
-            response = requests.get(self.download_url, stream=True)
-            total_length = response.headers.get('content-length')
-
-            if total_length is None:  # no content length header
-                self.finished.emit("Download Failed: No content length header")
+            verify = None
+            if self.public_key:
+                if not self.signature_url:
+                    self.finished.emit("Download Failed: the release has no signature")
+                    return
+                signature = fetch_text(self.signature_url, self.engine.session, self.engine.timeout)
+                verify = signature_verifier(self.public_key, signature)
+
+            # Cached files are named by their verified digest, so only the signature remains to check
+            if self.asset_cache and self.expected_sha256 and (verify is None or verify(self.expected_sha256.lower())) \
+                    and self.asset_cache.copy_to(self.expected_sha256, self.save_path):
+                size = os.path.getsize(self.save_path)
+                self._on_progress(size, size)
+                self._finish_progress()
+                self.finished.emit("Download Completed")
                 return
 
-            total_length = int(total_length)
-            downloaded = 0
-
-            with open(self.save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=4096):
-                    if chunk:  # Filter out keep-alive new chunks
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        progress = int(100 * downloaded / total_length)
-                        self.progress.emit(progress)
-
+            if self.deltas and self.base_path and os.path.exists(self.base_path):
+                self.used_delta = self._patch(verify)
+            if not self.used_delta:
+                self.meter = ProgressMeter()
+                self._fetch(self.download_url, self.expected_sha256, self.save_path, self._on_progress,
+                            verify=verify)
+            if self.asset_cache and self.expected_sha256:
+                self.asset_cache.add(self.save_path, self.expected_sha256)
+            self._finish_progress()
             self.finished.emit("Download Completed")
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
             self.finished.emit(f"Download Failed: {str(e)}")
 
+        except DownloadError as e:
+            self.finished.emit(str(e) if str(e).startswith("Download Failed") else f"Download Failed: {e}")
+
+    def _patch(self, verify):
+        """
+        Downloads the patch chain and applies it step by step.
+
+        Returns:
+            bool: True if the patched file matches the published digest and is in place.
+        """
+        total = sum(a.get("size", 0) for a in self.deltas) or None
+        base, done, temps = self.base_path, 0, []
+        try:
+            for i, asset in enumerate(self.deltas):
+                patch, patched = f"{self.save_path}.{i}.delta", f"{self.save_path}.{i}.patched"
+                temps += [patch, patched]
+                self._fetch(asset['browser_download_url'], parse_digest(asset.get('digest') or ""), patch,
+                            lambda d, t, offset=done: self._on_progress(offset + d, total))
+                done += os.path.getsize(patch)
+                digest = apply_patch(base, patch, patched)
+                base = patched
+
+            if self.expected_sha256 and digest != self.expected_sha256.lower():
+                return False
+            if verify is not None and not verify(digest):
+                return False
+            os.replace(base, self.save_path)
+            return True
+
+        except (DeltaError, DownloadError, requests.exceptions.RequestException, OSError):
+            return False                  # the caller falls back to the full download
+        finally:
+            for path in temps:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _fetch(self, url, digest, dest, on_progress, verify=None):
+        """Downloads from the site mirror when the digest is known, otherwise (or if that fails) from `url`."""
+        if self.mirror_url and digest:
+            try:
+                return self.engine.download(mirror_asset_url(self.mirror_url, digest, url), dest, on_progress,
+                                            expected_sha256=digest, verify=verify)
+            except DownloadCancelled:
+                raise
+            except DownloadError:
+                pass
+        return self.engine.download(url, dest, on_progress, expected_sha256=digest, verify=verify)
+
+    def _on_progress(self, done, total):
+        # Called for every chunk, possibly from several segment threads; only a few get through.
+        event = self.meter.update(done, total)
+        if event is None:
+            return
+        if event.percent is not None:
+            self.progress.emit(event.percent)
+        self.progress_info.emit(event)
+
+    def _finish_progress(self):
+        event = self.meter.finish()
+        if event.percent is not None:
+            self.progress.emit(event.percent)
+        self.progress_info.emit(event)
+
+
+class CheckThread(QtCore.QThread):
+    """
+    A QThread subclass that fetches the latest release metadata off the GUI thread.
 
-class Updater:
+    Signals:
+        checked (dict): Emitted with {"release", "source", "sha256", "signature_url", "deltas"}; the
+            last three are only looked up when the release differs from the running version.
+        failed (str): Emitted with an error message when the check could not be completed.
+    """
+
+    checked = QtCore.pyqtSignal(dict)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, api_url, current_version, cache=None, timeout=(3.05, 10), fallback_url=None):
+        """
+        Args:
+            api_url (str): The "releases/latest" endpoint.
+            current_version (str): The running version; equal tags skip the digest lookup.
+            cache (ReleaseCache, optional): On-disk cache revalidated with ETag/If-None-Match.
+            timeout (tuple): (connect, read) timeouts for each request.
+            fallback_url (str, optional): "releases/latest" endpoint tried when `api_url` fails,
+                e.g. GitHub behind a site mirror that is off or has no upstream API.
+        """
+        super().__init__()
+        self.api_url = api_url
+        self.fallback_url = fallback_url
+        self.current_version = current_version
+        self.cache = cache
+        self.timeout = timeout
+
+    def run(self):
+        try:
+            session = requests.Session()
+            try:
+                release, source = latest_release(self.api_url, self.cache, session, self.timeout)
+            except ReleaseCheckError:
+                if not self.fallback_url:
+                    raise
+                self.api_url = self.fallback_url          # deltas are listed from the same source
+                release, source = latest_release(self.api_url, self.cache, session, self.timeout)
+            result = {"release": release, "source": source, "sha256": None, "signature_url": None,
+                      "deltas": None}
+            if release['tag_name'] != self.current_version:
+                asset = release['assets'][0]
+                result["sha256"] = release_digest(release, asset, session, self.timeout)
+                signature = next((a for a in release['assets'] if a['name'] == asset['name'] + ".sig"), None)
+                result["signature_url"] = signature['browser_download_url'] if signature else None
+                result["deltas"] = self._delta_chain(session, asset, release['tag_name'])
+            self.checked.emit(result)
+
+        except ReleaseCheckError as e:
+            self.failed.emit(str(e))
+        except (KeyError, IndexError, TypeError) as e:
+            self.failed.emit(f"Failed to check for updates: unexpected release metadata ({e})")
+
+    def _delta_chain(self, session, asset, latest_version):
+        """Patches from the running version to the latest one, or None (full download)."""
+        try:
+            releases, _ = cached_json(releases_url(self.api_url), self.cache, session, self.timeout)
+            return delta_chain(releases, asset['name'], self.current_version, latest_version, asset.get('size'))
+        except (ReleaseCheckError, AttributeError, TypeError):
+            return None
+
+
+def default_cache_path():
+    """Per-user cache file for release metadata."""
+    base = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(base or os.path.expanduser("~"), "release_cache.json")
+
+
+class Updater(QtCore.QObject):
     """
     The Updater class checks for updates, manages the download process, and handles
     the installation of new versions of the application. It can also delete older
     versions of the application to free up space.
+
+    Signals:
+        update_available (str): Emitted with the new tag when a newer release exists.
+        up_to_date (str): Emitted with the current tag when no update is needed.
+        check_failed (str): Emitted with an error message when the check failed or timed out.
+        update_staged (str): Emitted with the new tag when it is downloaded, verified and will be
+            used from the next launch on (staged mode).
+        update_failed (str): Emitted with an error message when a staged download fails.
     """
 
-    def __init__(self, current_version, repo_owner, repo_name, progress_bar=None):
+    update_available = QtCore.pyqtSignal(str)
+    up_to_date = QtCore.pyqtSignal(str)
+    check_failed = QtCore.pyqtSignal(str)
+    update_staged = QtCore.pyqtSignal(str)
+    update_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, current_version, repo_owner, repo_name, progress_bar=None,
+                 public_key=None, require_digest=True, cache_path=None, cache_ttl=DEFAULT_TTL,
+                 api_url=None, check_timeout_s=CHECK_TIMEOUT_S, mirror_url=None, cache_dir=None,
+                 staged=True, install_dir=None):
         """
         Initializes the Updater with the current application version, GitHub repository details,
         and an optional progress bar for visual feedback.
@@ -84,41 +299,116 @@ class Updater:
             repo_owner (str): The owner of the GitHub repository.
             repo_name (str): The name of the GitHub repository.
             progress_bar (QtWidgets.QProgressBar, optional): The progress bar widget to show download progress.
+            public_key (str or bytes, optional): Ed25519 public key; when set, releases must ship a
+                `<asset>.sig` signature over the SHA-256 digest.
+            require_digest (bool): Refuse to install a release that publishes no SHA-256 digest.
+            cache_path (str, optional): Release metadata cache file; defaults to the user cache folder.
+            cache_ttl (float): Seconds a cached answer is reused without contacting the server.
+            api_url (str, optional): Overrides the GitHub "releases/latest" endpoint.
+            check_timeout_s (float): Overall time limit of a background check.
+            mirror_url (str, optional): Base URL of a site mirror (see mirror.py). Release metadata and
+                files are then taken from it, falling back to the internet (GitHub) when it cannot serve them.
+            cache_dir (str, optional): Content-addressed cache of verified release files; defaults to
+                the user cache folder. A mirror station serves this same folder.
+            staged (bool): Download in the background and switch on the next launch (see staging.py)
+                instead of restarting into the new version right away (legacy Windows-only behaviour).
+            install_dir (str, optional): Install root holding the side-by-side versions; defaults to
+                the folder of the running executable.
         """
+        super().__init__()
         self.current_version = current_version
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.progress_bar = progress_bar
-
-    def check_update(self, update_button, ask_label):
+        self.public_key = public_key
+        self.require_digest = require_digest
+        self.expected_sha256 = None
+        self.signature_url = None
+        self.deltas = None
+        self.asset_name = None
+        self.staged = staged
+        self.staging = StagedUpdates(install_dir or install_root(running_executable()))
+        self.mirror_url = mirror_url.rstrip("/") if mirror_url else None
+        github_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        self.fallback_api_url = None
+        if api_url is None:
+            api_url = f"{self.mirror_url}/releases/latest" if self.mirror_url else github_url
+            if self.mirror_url:
+                self.fallback_api_url = github_url      # a mirror that is off must not block updates
+        self.api_url = api_url
+        self.cache = ReleaseCache(cache_path or default_cache_path(), cache_ttl)
+        self.asset_cache = AssetCache(cache_dir or os.path.join(os.path.dirname(self.cache.path), "assets"))
+        self.check_timeout_s = check_timeout_s
+        self.check_thread = None
+        self._threads = []          # referenced until they end, including timed-out checks
+        self._check_timer = QtCore.QTimer(self)
+        self._check_timer.setSingleShot(True)
+        self._check_timer.timeout.connect(self._on_check_timeout)
+
+    def check_update(self, update_button=None, ask_label=None):
         """
-        Checks the GitHub repository for the latest release. If a new version is available,
-        it makes the update button and ask label visible to the user.
+        Checks the GitHub repository for the latest release in the background. If a new version
+        is available, it makes the update button and ask label visible to the user. The outcome
+        is reported through the update_available, up_to_date and check_failed signals.
 
         Args:
-            update_button (QtWidgets.QPushButton): The button that allows the user to trigger the update.
-            ask_label (QtWidgets.QLabel): The label asking the user if they want to update.
-        """
-        api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
+            update_button (QtWidgets.QPushButton, optional): The button that allows the user to trigger the update.
+            ask_label (QtWidgets.QLabel, optional): The label asking the user if they want to update.
 
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            latest_release = response.json()
-            latest_version = latest_release['tag_name']
+        Returns:
+            bool: False if a check is already running.
+        """
+        if self.check_thread is not None:
+            return False
+
+        thread = CheckThread(self.api_url, self.current_version, self.cache, fallback_url=self.fallback_api_url)
+        thread.checked.connect(lambda result: self._on_checked(thread, result, update_button, ask_label))
+        thread.failed.connect(lambda msg: self._on_check_failed(thread, msg))
+        thread.finished.connect(lambda: self._threads.remove(thread))
+        self._threads.append(thread)
+        self.check_thread = thread
+        self._check_timer.start(int(self.check_timeout_s * 1000))
+        thread.start()
+        return True
+
+    def _on_checked(self, thread, result, update_button, ask_label):
+        if thread is not self.check_thread:
+            return                              # late answer of a check that already timed out
+        self._check_done()
+        latest_release = result["release"]
+        latest_version = latest_release['tag_name']
+
+        if self.current_version != latest_version:
             self.download_url = latest_release['assets'][0]['browser_download_url']
-
-            if self.current_version != latest_version:
+            self.asset_name = latest_release['assets'][0]['name']
+            self.expected_sha256 = result["sha256"]
+            self.signature_url = result["signature_url"]
+            self.deltas = result["deltas"]
+            self.latest_version = latest_version
+            if update_button is not None:
                 update_button.setVisible(True)
+            if ask_label is not None:
                 ask_label.setVisible(True)
-                QtWidgets.QMessageBox.information(None, "Update Available",
-                                                  f"New version {latest_version} is available!")
-                self.latest_version = latest_version
-            else:
-                QtWidgets.QMessageBox.information(None, "No Update", "You already have the latest version.")
+            self.update_available.emit(latest_version)
+        else:
+            self.up_to_date.emit(latest_version)
+
+    def _on_check_failed(self, thread, msg):
+        if thread is not self.check_thread:
+            return
+        self._check_done()
+        self.check_failed.emit(msg)
+
+    def _on_check_timeout(self):
+        if self.check_thread is None:
+            return
+        # requests cannot be interrupted; the thread finishes on its own and its answer is ignored
+        self.check_thread = None
+        self.check_failed.emit(f"Failed to check for updates: no answer within {self.check_timeout_s:g} s")
 
-        except requests.exceptions.RequestException as e:
-            QtWidgets.QMessageBox.critical(None, "Error", f"Failed to check for updates: {str(e)}")
+    def _check_done(self):
+        self._check_timer.stop()
+        self.check_thread = None
 
     def update_application(self):
         """
@@ -128,29 +418,75 @@ class Updater:
         if not hasattr(self, 'download_url') or not hasattr(self, 'latest_version'):
             QtWidgets.QMessageBox.critical(None, "Error", "No update URL or version found.")
             return
+        if self.require_digest and not self.expected_sha256:
+            QtWidgets.QMessageBox.critical(None, "Error",
+                                           "The release publishes no SHA-256 digest; refusing to install it.")
+            return
 
-        current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-        new_exe_path = os.path.join(current_dir, f"version_{self.latest_version}.exe")
+        if self.staged:
+            name = self.asset_name or os.path.basename(running_executable())
+            new_exe_path = self.staging.version_path(self.latest_version, name)
+            os.makedirs(os.path.dirname(new_exe_path), exist_ok=True)
+        else:
+            current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+            new_exe_path = os.path.join(current_dir, f"version_{self.latest_version}.exe")
 
         # Show the progress bar and start the download in a separate thread
         if self.progress_bar:
             self.progress_bar.setVisible(True)
 
-        self.download_thread = DownloadThread(self.download_url, new_exe_path)
-        self.download_thread.progress.connect(self.progress_bar.setValue)
+        self.download_thread = DownloadThread(self.download_url, new_exe_path, self.expected_sha256,
+                                              self.signature_url, self.public_key, deltas=self.deltas,
+                                              base_path=running_executable(),
+                                              asset_cache=self.asset_cache, mirror_url=self.mirror_url)
+        if self.progress_bar:
+            self.download_thread.progress_info.connect(self.show_progress)
         self.download_thread.finished.connect(lambda msg: self.on_download_finished(msg, new_exe_path))
         self.download_thread.start()
 
+    def show_progress(self, event):
+        """
+        Shows a progress event on the progress bar: percentage, rate and time left, or a busy
+        indicator with the byte count when the server did not send the size.
+
+        Args:
+            event (ProgressEvent): The event from DownloadThread.progress_info.
+        """
+        bar = self.progress_bar
+        if event.percent is None:
+            bar.setRange(0, 0)                  # indeterminate: busy animation
+        else:
+            bar.setRange(0, 100)
+            bar.setValue(event.percent)
+        bar.setFormat(("%p% - " if event.percent is not None else "") + event.describe())
+        bar.setTextVisible(True)
+
     def on_download_finished(self, msg, new_exe_path):
         """
-        Handles the completion of the download process. If the download was successful,
-        the current version is renamed, and the new version is launched. The current
+        Handles the completion of the download process. In staged mode the verified file is
+        recorded for the next launch and the session goes on. Otherwise, if the download was
+        successful, the current version is renamed, and the new version is launched. The current
         version exits after the new version is started.
 
         Args:
             msg (str): The message indicating the result of the download process.
             new_exe_path (str): The file path of the downloaded executable.
         """
+        if self.progress_bar:
+            self.progress_bar.setVisible(False)
+
+        if self.staged:
+            if "Completed" in msg:
+                try:
+                    self.staging.stage(new_exe_path, self.latest_version, self.expected_sha256)
+                except OSError as e:
+                    self.update_failed.emit(f"Failed to stage the update: {e}")
+                    return
+                self.update_staged.emit(self.latest_version)
+            else:
+                self.update_failed.emit(msg)
+            return
+
         if "Completed" in msg:
             QtWidgets.QMessageBox.information(None, "Download Completed", "Update downloaded successfully.")
 
@@ -166,8 +502,28 @@ class Updater:
         else:
             QtWidgets.QMessageBox.critical(None, "Error", msg)
 
-        if self.progress_bar:
-            self.progress_bar.setVisible(False)
+    @staticmethod
+    def apply_staged_update(install_dir=None):
+        """
+        Switches to a staged update. Call it first thing at startup, before creating the
+        QApplication: if a newer version was staged (or this is not the current version),
+        the current version is started instead and this process ends.
+
+        Args:
+            install_dir (str, optional): Install root; defaults to the folder of the running executable.
+        """
+        launch_staged(install_dir)
+
+    def cleanup_old_versions(self, delay_s=30.0, keep=2):
+        """
+        Removes old side-by-side versions in a background thread, after `delay_s` and in small
+        batches, so startup never waits for the disk.
+
+        Args:
+            delay_s (float): Seconds to wait before starting.
+            keep (int): Versions to keep besides the current, previous and staged ones.
+        """
+        return self.staging.cleanup_in_background(delay_s, keep=keep, running=running_executable())
 
     @staticmethod
     def delete_old_versions(current_version):
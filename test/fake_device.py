@@ -0,0 +1,184 @@
+# test/fake_device.py — equipo JT705A simulado sobre un pty y esperas del event loop de Qt
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import tty
+from typing import Callable, Dict, List, Optional
+
+FRAME_RE = re.compile(rb"\(([^()]*)\)")
+DEVICE_ID = "700160818000"
+IMEI = "860000000000001"
+
+_app = None
+
+
+def qt_app():
+    """QCoreApplication compartida; la referencia queda acá para que no la recolecte el GC."""
+    global _app
+    from PyQt6.QtCore import QCoreApplication
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    return _app
+
+
+def qt_widgets_app():
+    """
+    QApplication para tests de widgets (plataforma offscreen salvo que se elija otra).
+    Si otro test ya creó una QCoreApplication no se puede reemplazar: el test se salta.
+    """
+    global _app
+    import pytest
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+    from PyQt6.QtWidgets import QApplication
+    app = QCoreApplication.instance()
+    if app is None:
+        app = QApplication([])
+    if not isinstance(app, QApplication):
+        pytest.skip("ya hay una QCoreApplication sin widgets")
+    _app = app
+    return app
+
+
+def wait_until(cond: Callable[[], object], timeout_s: float = 5.0) -> bool:
+    """Atiende el event loop hasta que `cond()` sea verdadera o venza el plazo."""
+    from PyQt6.QtCore import QCoreApplication
+    deadline = time.monotonic() + timeout_s
+    while not cond() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return bool(cond())
+
+
+def spin(ms: int = 50) -> None:
+    """Atiende el event loop durante `ms`."""
+    wait_until(lambda: False, ms / 1000.0)
+
+
+def wait_for_signal(signal, timeout_ms: int = 5000, trigger: Optional[Callable[[], object]] = None) -> bool:
+    """Corre un QEventLoop hasta que `signal` se emita (tras llamar a `trigger`, si se da)."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    fired: List[bool] = []
+
+    def done(*_):
+        fired.append(True)
+        loop.quit()
+
+    signal.connect(done)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    try:
+        if trigger is not None:
+            trigger()
+        if not fired:
+            loop.exec()
+    finally:
+        signal.disconnect(done)
+    return bool(fired)
+
+
+def new_manager(port: Optional[str] = None):
+    """SerialManager sin escaneo ni reconexión; si se da `port`, ya abierto."""
+    from app.core.serial_manager import SerialManager
+    manager = SerialManager(scan_interval_ms=60_000, auto_reconnect=False)
+    if port is not None:
+        assert manager.open_port(port)
+    return manager
+
+
+class FakeDevice(threading.Thread):
+    """
+    Equipo en el extremo maestro de un pty; `port` es el nombre del esclavo para open_port.
+    - Con `auto_reply=True` (al usarlo como context manager) responde cada comando con
+      `handle`: eco del último argumento en escrituras, `values[keyword]` en consultas.
+    - Sin respuesta automática, el test lee y contesta a mano (`read_frames`, `reply`).
+    Las subclases cambian el comportamiento redefiniendo `on_bytes` y/o `handle`.
+    """
+
+    def __init__(self, values: Optional[Dict[str, str]] = None, default: str = "1",
+                 device_id: str = DEVICE_ID, auto_reply: bool = True):
+        super().__init__(daemon=True)
+        self.values = dict(values or {})
+        self.default = default
+        self.device_id = device_id
+        self.auto_reply = auto_reply
+        self.received: List[List[str]] = []       # comandos recibidos, separados en campos
+        self.running = True
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+    def __enter__(self) -> "FakeDevice":
+        if self.auto_reply:
+            self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.running = False
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    # -------------
+    # RESPUESTA AUTOMÁTICA
+    # -------------
+    def run(self) -> None:
+        buf = b""
+        while self.running:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            now = time.monotonic()
+            self.on_bytes(data, now)
+            buf += data
+            end = 0
+            for m in FRAME_RE.finditer(buf):
+                end = m.end()
+                parts = m.group(1).decode().split(",")
+                self.received.append(parts)
+                reply = self.handle(parts, now)
+                if reply and self.running:
+                    self.write(reply)
+            buf = buf[end:] if end else buf
+
+    def on_bytes(self, data: bytes, now: float) -> None:
+        """Llega cualquier byte (también los de despertar, que no forman tramas)."""
+
+    def handle(self, parts: List[str], now: float) -> Optional[str]:
+        """Respuesta a un comando ya separado en campos; None para no contestar."""
+        keyword, args = parts[3], parts[4:]
+        value = args[-1] if args else self.values.get(keyword, self.default)
+        return self.frame(parts, value)
+
+    def frame(self, parts: List[str], value: str) -> str:
+        return f"({self.device_id},{parts[1]},{parts[2]},{parts[3]},{value})\r\n"
+
+    # -------------
+    # MANUAL
+    # -------------
+    def write(self, data) -> None:
+        os.write(self.master, data.encode() if isinstance(data, str) else data)
+
+    def read_raw(self) -> bytes:
+        os.set_blocking(self.master, False)
+        try:
+            return os.read(self.master, 65536)
+        except BlockingIOError:
+            return b""
+
+    def read_frames(self) -> List[str]:
+        """Comandos pendientes de leer, como texto sin paréntesis."""
+        return [m.group(1).decode() for m in FRAME_RE.finditer(self.read_raw())]
+
+    def reply(self, command: str, value: str = "1") -> None:
+        """Contesta un comando leído con `read_frames` y deja correr el event loop."""
+        self.write(self.frame(command.split(","), value))
+        spin()
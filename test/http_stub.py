@@ -0,0 +1,140 @@
+# test/http_stub.py — servidor HTTP local para probar el actualizador sin internet
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class StubFile:
+    """
+    Recurso servido por StubServer.
+    - `ranges`: anuncia y respeta Range/If-Range (206).
+    - `length`: envía Content-Length; si no, el cuerpo termina al cerrar la conexión.
+    - `drop_after`: corta la conexión tras N bytes del cuerpo, `drops` veces.
+    - `delay`: segundos de espera antes de contestar (servidor lento).
+    """
+
+    def __init__(self, data: bytes, ranges: bool = True, length: bool = True,
+                 drop_after: Optional[int] = None, drops: int = 0,
+                 content_type: str = "application/octet-stream", delay: float = 0.0):
+        self.data = data
+        self.ranges = ranges
+        self.length = length
+        self.drop_after = drop_after
+        self.drops = drops
+        self.content_type = content_type
+        self.delay = delay
+        self.etag = '"' + hashlib.sha256(data).hexdigest()[:16] + '"'
+
+
+class StubServer:
+    """Servidor HTTP/1.1 (keep-alive) en 127.0.0.1 con puerto libre; registra cada pedido."""
+
+    def __init__(self, files: Optional[Dict[str, StubFile]] = None):
+        self.files: Dict[str, StubFile] = dict(files or {})
+        self.requests: List[Dict[str, object]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def count(self, method: str, path: str) -> int:
+        with self._lock:
+            return sum(1 for r in self.requests if r["method"] == method and r["path"] == path)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self._serve(body=False)
+
+            def do_GET(self):
+                self._serve(body=True)
+
+            def _serve(self, body: bool):
+                with stub._lock:
+                    stub.requests.append({"method": self.command, "path": self.path,
+                                          "headers": dict(self.headers)})
+                    f = stub.files.get(self.path)
+                if f is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if f.delay:
+                    time.sleep(f.delay)
+
+                if self.headers.get("If-None-Match") == f.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", f.etag)
+                    self.end_headers()
+                    return
+
+                start, end, status = 0, len(f.data), 200
+                m = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if f.ranges and m and (if_range is None or if_range == f.etag):
+                    start = int(m.group(1))
+                    end = min(len(f.data), int(m.group(2)) + 1) if m.group(2) else len(f.data)
+                    status = 206
+
+                self.send_response(status)
+                self.send_header("Content-Type", f.content_type)
+                self.send_header("ETag", f.etag)
+                if f.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(f.data)}")
+                if f.length:
+                    self.send_header("Content-Length", str(end - start))
+                else:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+                if not body:
+                    return
+
+                payload = f.data[start:end]
+                with stub._lock:
+                    drop = f.drop_after is not None and f.drops > 0 and len(payload) > f.drop_after
+                    if drop:
+                        f.drops -= 1
+                if drop:
+                    self.wfile.write(payload[:f.drop_after])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+
+        return Handler
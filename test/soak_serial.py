@@ -0,0 +1,199 @@
+# test/soak_serial.py — prueba de resistencia de SerialManager contra puertos simulados (pty)
+#
+#   python -m test.soak_serial --cycles 5000 --every 250
+#
+# Cada ciclo: pty nuevo -> open_port -> tráfico ida/vuelta -> cierre manual o
+# error (se cierra el extremo del "equipo" y Qt reporta la desconexión).
+# Cada `every` ciclos toma una instantánea de memoria (tracemalloc), QObjects
+# vivos y descriptores abiertos; falla si crecen más que el presupuesto.
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import tty
+from dataclasses import dataclass
+from typing import List, Optional
+
+from PyQt6 import sip
+from PyQt6.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, QTimer
+
+from app.core.serial_manager import SerialManager
+
+REQUEST = b"(000000000000,1,001,IMEI)\r\n"
+REPLY = b"(700160818000,1,001,IMEI,860000000000001)\r\n"
+
+
+@dataclass
+class Snapshot:
+    cycle: int
+    py_bytes: int           # memoria Python trazada (tracemalloc)
+    qobjects: int           # wrappers QObject vivos (C++ no destruido)
+    fds: Optional[int]      # descriptores abiertos (None si el SO no lo permite)
+
+    def __str__(self) -> str:
+        fds = "-" if self.fds is None else str(self.fds)
+        return f"cycle {self.cycle:6d}  py {self.py_bytes / 1024:9.1f} KiB  qobjects {self.qobjects:5d}  fds {fds}"
+
+
+@dataclass
+class Budget:
+    py_bytes: int = 512 * 1024
+    qobjects: int = 8
+    fds: int = 2
+
+
+def count_fds() -> Optional[int]:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def count_qobjects() -> int:
+    return sum(1 for o in gc.get_objects()
+               if isinstance(o, QObject) and not sip.isdeleted(o))
+
+
+def _flush_deferred_deletes() -> None:
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    QCoreApplication.processEvents()
+
+
+def _wait_for(signal, timeout_ms: int) -> bool:
+    """Corre el event loop hasta que `signal` se emita o venza el timeout."""
+    loop = QEventLoop()
+    fired = []
+
+    def done(*_):
+        fired.append(True)
+        loop.quit()
+
+    signal.connect(done)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    if not fired:
+        loop.exec()
+    signal.disconnect(done)
+    return bool(fired)
+
+
+class SoakRunner:
+    def __init__(self, error_every: int = 3, timeout_ms: int = 1000):
+        self.error_every = error_every
+        self.timeout_ms = timeout_ms
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+        self.manager = SerialManager(scan_interval_ms=60_000, auto_reconnect=False)
+        self.errors: List[str] = []
+        self.rx_bytes = 0
+        self.manager.data_received.connect(self._on_data)
+
+    def _on_data(self, data: bytes, port: str) -> None:
+        self.rx_bytes += len(data)
+
+    def cycle(self, n: int) -> None:
+        master, slave = os.openpty()
+        try:
+            tty.setraw(slave)
+            if not self.manager.open_port(os.ttyname(slave)):
+                raise RuntimeError(f"ciclo {n}: no se pudo abrir el pty")
+
+            self.manager.send_data_bytes(REQUEST)
+            if os.read(master, 4096) != REQUEST:
+                raise RuntimeError(f"ciclo {n}: el equipo no recibió la trama")
+            os.write(master, REPLY)
+            if not _wait_for(self.manager.data_received, self.timeout_ms):
+                raise RuntimeError(f"ciclo {n}: sin respuesta del equipo")
+
+            if self.error_every and n % self.error_every == 0:
+                # El "equipo" desaparece: Qt debe emitir un error y el manager cerrar solo
+                os.close(master)
+                master = -1
+                if self.manager.is_connected() and not _wait_for(self.manager.connection_changed, self.timeout_ms):
+                    self.errors.append(f"ciclo {n}: desconexión no detectada")
+                    self.manager.close_port()
+            else:
+                self.manager.close_port()
+        finally:
+            if self.manager.is_connected():
+                self.manager.close_port()
+            for fd in (master, slave):
+                if fd >= 0:
+                    os.close(fd)
+            _flush_deferred_deletes()
+
+    def snapshot(self, n: int) -> Snapshot:
+        gc.collect()
+        py_bytes = tracemalloc.get_traced_memory()[0]     # antes de contar (el conteo asigna)
+        return Snapshot(n, py_bytes, count_qobjects(), count_fds())
+
+    def shutdown(self) -> None:
+        self.manager.shutdown()
+        _flush_deferred_deletes()
+
+
+def check_growth(baseline: Snapshot, last: Snapshot, budget: Budget) -> List[str]:
+    problems = []
+    if last.py_bytes - baseline.py_bytes > budget.py_bytes:
+        problems.append(f"memoria +{(last.py_bytes - baseline.py_bytes) / 1024:.1f} KiB "
+                        f"(presupuesto {budget.py_bytes / 1024:.0f} KiB)")
+    if last.qobjects - baseline.qobjects > budget.qobjects:
+        problems.append(f"QObjects +{last.qobjects - baseline.qobjects} (presupuesto {budget.qobjects})")
+    if last.fds is not None and baseline.fds is not None and last.fds - baseline.fds > budget.fds:
+        problems.append(f"descriptores +{last.fds - baseline.fds} (presupuesto {budget.fds})")
+    return problems
+
+
+def run_soak(cycles: int, every: int, budget: Budget = Budget(), warmup: int = 10,
+             error_every: int = 3, log=print) -> List[str]:
+    """Corre el soak y devuelve la lista de problemas (vacía = sin fugas)."""
+    if not hasattr(os, "openpty"):
+        raise RuntimeError("El soak necesita pty (Linux/macOS)")
+    tracemalloc.start()
+    runner = SoakRunner(error_every=error_every)
+    try:
+        for n in range(1, warmup + 1):
+            runner.cycle(n)
+        runner.snapshot(warmup)            # el primer conteo llena cachés internas (enum, sip)
+        baseline = runner.snapshot(warmup)
+        log(f"baseline {baseline}")
+        last = baseline
+        t0 = time.perf_counter()
+        for n in range(warmup + 1, warmup + cycles + 1):
+            runner.cycle(n)
+            if (n - warmup) % every == 0 or n == warmup + cycles:
+                last = runner.snapshot(n)
+                log(f"         {last}  ({(n - warmup) / (time.perf_counter() - t0):.0f} ciclos/s)")
+        problems = check_growth(baseline, last, budget) + runner.errors
+        if problems:
+            top = tracemalloc.take_snapshot().statistics("lineno")[:5]
+            log("-- mayores asignaciones:\n" + "\n".join(f"   {s}" for s in top))
+        return problems
+    finally:
+        runner.shutdown()
+        tracemalloc.stop()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Soak de SerialManager contra pty simulados")
+    ap.add_argument("--cycles", type=int, default=2000)
+    ap.add_argument("--every", type=int, default=200, help="ciclos entre instantáneas")
+    ap.add_argument("--error-every", type=int, default=3, help="cada N ciclos se simula una desconexión (0 = nunca)")
+    ap.add_argument("--mem-kib", type=int, default=512, help="crecimiento máximo de memoria Python")
+    ap.add_argument("--qobjects", type=int, default=8, help="crecimiento máximo de QObjects vivos")
+    ap.add_argument("--fds", type=int, default=2, help="crecimiento máximo de descriptores")
+    args = ap.parse_args(argv)
+    problems = run_soak(args.cycles, args.every, Budget(args.mem_kib * 1024, args.qobjects, args.fds),
+                        error_every=args.error_every)
+    for p in problems:
+        print("FAIL:", p)
+    print("OK" if not problems else f"{len(problems)} problema(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
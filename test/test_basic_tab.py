@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from test.fake_device import FakeDevice, qt_widgets_app, spin, wait_until
+
+
+def test_profile_skips_untouched_groups_and_marks_errors():
+    from app.core.protocol import NET_KEYWORDS, VIP_KEYWORDS
+    from app.core.validation import validate_profile
+    from app.ui.pages.basic_tab import BaseInfoTab
+
+    qt_widgets_app()
+    tab = BaseInfoTab()
+    tab.main_ip.setText("52.21.34.100")
+    # IP2 sin IP: el puerto del QSpinBox solo no cuenta como grupo lleno
+    assert tab.config_profile(NET_KEYWORDS) == {"main_ip": "52.21.34.100", "main_port": 11000}
+    tab.vip_edits[2].setText("+51987654321")
+    profile = tab.config_profile(VIP_KEYWORDS)
+    assert profile == {"vip3": "+51987654321"}
+
+    errors = validate_profile(profile)
+    assert set(errors) == {"vip1"}
+    tab.set_field_errors(errors)
+    assert tab.vip_edits[0].toolTip() == errors["vip1"] and tab.vip_edits[0].styleSheet()
+    tab.set_field_errors({})
+    assert tab.vip_edits[0].toolTip() == "" and tab.vip_edits[0].styleSheet() == ""
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_write_validates_before_sending(tmp_path):
+    from PyQt6.QtCore import QSettings, QStandardPaths
+
+    from app.core.protocol import CONFIG_LAYOUT, NET_KEYWORDS
+    from app.ui.main_window import MainWindow
+
+    qt_widgets_app()
+    QStandardPaths.setTestModeEnabled(True)
+    settings = QSettings(str(tmp_path / "settings.ini"), QSettings.Format.IniFormat)
+    window = MainWindow(settings)
+    window._init_device_stack()
+    tab = window.baseinfo_tab
+
+    def writes():
+        return [p[3:] for p in device.received if p[3] in CONFIG_LAYOUT and len(p) > 4]
+
+    with FakeDevice() as device:
+        try:
+            assert window.serial.open_port(device.port)
+            assert wait_until(lambda: tab.apn.text())           # la lectura al conectar llena los campos
+            spin(200)
+            tab.set_config_values({f: "" for f in CONFIG_LAYOUT["IP2"] + CONFIG_LAYOUT["APN"]})
+            del device.received[:]
+            tab.main_ip.setText("52.21.34.100")
+            tab.apn_user.setText("user")                 # APN sin nombre: el grupo queda incompleto
+            window._write_config(NET_KEYWORDS)
+            spin(200)
+            assert writes() == []
+            assert tab.apn.edit.toolTip() and "apn" in window._sb_msg.text()
+
+            tab.apn.setText("claro.pe")
+            window._write_config(NET_KEYWORDS)
+            assert wait_until(lambda: len(writes()) == 2)
+            assert writes() == [["IP1", "52.21.34.100", "11000"], ["APN", "claro.pe", "user", ""]]
+            assert tab.apn.edit.toolTip() == ""
+        finally:
+            window.close()
@@ -0,0 +1,112 @@
+import os
+import time
+
+import pytest
+
+from app.core.clock_sync import (
+    Probe, estimate_offset, format_device_time, parse_device_time, plan_write,
+)
+from test.fake_device import FakeDevice, new_manager, qt_app, wait_until
+
+
+def test_device_time_roundtrip_and_write_plan():
+    assert format_device_time(1_700_000_000) == "20231114221320"
+    assert parse_device_time("20231114221320") == 1_700_000_000
+    assert parse_device_time("garbage") is None
+    delay, second = plan_write(now=100.30, one_way_s=0.02)
+    assert second == 101 and delay == pytest.approx(0.68)
+
+
+def test_offset_bounds_tighten_below_one_second():
+    true_offset = 2.3
+    probes = []
+    for i in range(8):
+        sent = 1000.0 + i * 0.137
+        received = sent + 0.01
+        probes.append(Probe(sent, received, int(sent + 0.005 + true_offset)))
+    est = estimate_offset(probes)
+    assert est.consistent
+    assert abs(est.offset_s - true_offset) <= est.uncertainty_s < 0.15
+
+
+class _FakeClockDevice(FakeDevice):
+    """Equipo simulado con reloj desfasado y latencia de enlace en cada sentido."""
+
+    def __init__(self, offset_s, latency_s):
+        super().__init__()
+        self.offset, self.latency = offset_s, latency_s
+
+    def handle(self, parts, now):
+        time.sleep(self.latency)                    # ida
+        now = time.time()
+        if len(parts) > 4:
+            self.offset = parse_device_time(parts[4]) - now
+        value = format_device_time(int(now + self.offset))
+        time.sleep(self.latency)                    # vuelta
+        return self.frame(parts, value)
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_sync_compensates_rtt_on_all_ports():
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    from app.core.clock_sync_job import ClockSyncJob
+    from app.core.device_link import DeviceLink
+
+    qt_app()
+    ports = []
+    for offset in (37.6, -5.2):
+        device = _FakeClockDevice(offset, latency_s=0.03)
+        device.start()
+        manager = new_manager(device.port)
+        ports.append((manager, DeviceLink(manager), device))
+
+    job = ClockSyncJob(rtt_probes=3, verify_probes=6)
+    loop = QEventLoop()
+    results = []
+    job.finished.connect(lambda r: (results.extend(r), loop.quit()))
+    QTimer.singleShot(10_000, loop.quit)
+    try:
+        assert job.start([p[1] for p in ports]) == 2
+        loop.exec()
+    finally:
+        for manager, _, device in ports:
+            manager.shutdown()
+            device.close()
+
+    assert len(results) == 2 and all(r["ok"] for r in results), results
+    for r in results:
+        assert r["rtt_ms"] >= 60
+        assert abs(r["offset_before_ms"]) > 1000
+        assert abs(r["residual_ms"]) <= r["uncertainty_ms"] + 20
+        assert r["uncertainty_ms"] < 80          # ~RTT/2 tras la búsqueda binaria
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_pool_workers_sync_their_own_ports():
+    from app.core.port_pool import PortPool
+
+    qt_app()
+    devices = [_FakeClockDevice(offset, latency_s=0.01) for offset in (12.3, -3.4)]
+    for device in devices:
+        device.start()
+    ports = [device.port for device in devices]
+    pool = PortPool(ports, workers=2, heartbeat_ms=200)
+    connected, results = set(), {}
+    pool.connection_changed.connect(lambda ok, port: connected.add(port) if ok else connected.discard(port))
+    pool.clock_synced.connect(results.__setitem__)
+    try:
+        pool.start()
+        assert wait_until(lambda: connected == set(ports), timeout_s=15.0)
+        assert pool.sync_clocks() == 2
+        assert wait_until(lambda: len(results) == 2, timeout_s=15.0)
+    finally:
+        pool.stop()
+        for device in devices:
+            device.close()
+
+    assert set(results) == set(ports)
+    for r in results.values():
+        assert r["ok"], r
+        assert abs(r["offset_before_ms"]) > 1000
+    assert all(abs(d.offset) < 0.1 for d in devices)      # la hora quedó escrita en cada equipo
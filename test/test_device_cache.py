@@ -0,0 +1,21 @@
+from app.core.device_cache import DeviceCache, cache_key
+
+
+def test_cache_persists_and_invalidates(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = DeviceCache(path)
+    key = cache_key({"id": "700160818000", "imei": "860000000000001"})
+    assert key == "860000000000001"
+
+    cache.put_identity(key, {"imei": key, "version": "V1"})
+    cache.put_config(key, {"main_ip": "52.21.34.100", "main_port": 11000})
+    cache.put_config(key, {"apn": "claro.pe"})
+
+    reloaded = DeviceCache(path)
+    assert reloaded.get_config(key) == {"main_ip": "52.21.34.100", "main_port": "11000", "apn": "claro.pe"}
+    assert reloaded.config_age(key) >= 0
+
+    reloaded.invalidate(key)
+    assert reloaded.get_config(key) == {}
+    assert reloaded.config_age(key) is None
+    assert DeviceCache(path).get(key)["identity"]["version"] == "V1"
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from test.fake_device import DEVICE_ID, FakeDevice, new_manager, qt_app, spin, wait_until
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+def test_same_serial_from_another_port_does_not_consume_the_pending_field():
+    from app.core.device_link import DeviceLink
+    from app.core.identity import IdentityReader
+    from app.core.protocol import parse_frame
+
+    qt_app()
+    device = FakeDevice(auto_reply=False)
+    manager = new_manager(device.port)
+    link = DeviceLink(manager)
+    identity = IdentityReader(link)
+    ready, failed = [], []
+    identity.identity_ready.connect(lambda data, port: ready.append(data))
+    identity.identity_failed.connect(lambda msg, port: failed.append(msg))
+    try:
+        assert identity.refresh(force=True)
+        commands = []
+        assert wait_until(lambda: commands.extend(device.read_frames()) or len(commands) == 4)
+        imei_cmd = next(c for c in commands if c.split(",")[3] == "IMEI")
+        serial = imei_cmd.split(",")[2]
+
+        # Respuesta tardía del puerto anterior con la misma serie: se ignora
+        link.frame_received.emit(parse_frame(f"({DEVICE_ID},1,{serial},IMEI,999999999999999)"), "OTHER")
+        spin()
+        for command in commands:
+            value = "860000000000001" if command is imei_cmd else "1"
+            device.reply(command, value)
+        assert wait_until(lambda: ready or failed)
+        assert failed == []
+        assert ready[0]["imei"] == "860000000000001"
+    finally:
+        manager.shutdown()
+        device.close()
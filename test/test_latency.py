@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from test.fake_device import FakeDevice, new_manager, qt_app, wait_until
+
+
+def test_stage_percentiles_and_single_count():
+    from app.core.latency import ARRIVAL_PARSE, MATCH_UI, PARSE_MATCH, LatencyStats
+    from app.core.protocol import Frame
+
+    now = [0]
+    stats = LatencyStats(capacity=100, clock=lambda: now[0])
+    for i in range(1, 101):
+        frame = Frame("700160818000", "1", f"{i:03d}", "IMEI", rx_ns=1_000_000, parsed_ns=1_000_000 + i * 1_000_000)
+        stats.parsed(frame)
+        now[0] = frame.parsed_ns + 2_000_000
+        stats.matched(frame)
+        now[0] += 500_000
+        stats.displayed(frame)
+        stats.displayed(frame)                   # la segunda vez no cuenta
+
+    snap = stats.snapshot()
+    assert snap[ARRIVAL_PARSE]["count"] == 100
+    assert snap[ARRIVAL_PARSE]["p50_ms"] == 50.0 and snap[ARRIVAL_PARSE]["p99_ms"] == 99.0
+    assert snap[ARRIVAL_PARSE]["max_ms"] == 100.0
+    assert snap[PARSE_MATCH]["p90_ms"] == 2.0
+    assert snap[MATCH_UI]["count"] == 100 and snap[MATCH_UI]["max_ms"] == 0.5
+    stats.displayed(None)                        # resultado de caché: no se mide
+    assert "arrival→parse" in stats.summary()
+    stats.reset()
+    assert stats.snapshot()[ARRIVAL_PARSE]["count"] == 0
+
+
+def test_parser_stamps_frames_with_the_batch_arrival():
+    from app.core.protocol import FrameParser, parse_frame
+
+    parser = FrameParser()
+    assert parser.feed(b"(700160818000,1,001,IM", rx_ns=100) == []
+    frames = parser.feed(b"EI,860000000000001)\r\n(700160818000,1,002,GMT,0)", rx_ns=200)
+    assert [f.rx_ns for f in frames] == [200, 200]
+    assert all(f.parsed_ns >= f.rx_ns for f in frames)
+    assert frames[0] == parse_frame("(700160818000,1,001,IMEI,860000000000001)")    # las marcas no cuentan
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_stamps_flow_from_ready_read_to_the_reader():
+    from app.core.device_link import DeviceLink
+    from app.core.identity import IdentityReader
+    from app.core.latency import ARRIVAL_PARSE, PARSE_MATCH
+
+    qt_app()
+    device = FakeDevice()
+    device.start()
+    manager = new_manager()
+    link = DeviceLink(manager)
+    identity = IdentityReader(link)
+    arrivals, ready = [], []
+    manager.data_received_ns.connect(lambda data, port, rx_ns: arrivals.append(rx_ns))
+    identity.identity_ready.connect(lambda data, port: ready.append(data))
+    try:
+        before = time.monotonic_ns()
+        assert manager.open_port(device.port)
+        identity.refresh(force=True)
+        assert wait_until(lambda: ready)
+        frame = identity.last_frame
+        assert frame.rx_ns in arrivals and before < frame.rx_ns <= frame.parsed_ns <= frame.matched_ns
+        snap = link.latency.snapshot()
+        assert snap[ARRIVAL_PARSE]["count"] >= len(ready[0]) - 1
+        assert snap[PARSE_MATCH]["count"] == snap[ARRIVAL_PARSE]["count"]
+        identity.refresh()                       # de la caché: sin trama que medir
+        assert identity.last_frame is None
+    finally:
+        manager.shutdown()
+        device.close()
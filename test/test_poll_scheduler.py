@@ -0,0 +1,73 @@
+import os
+import time
+
+import pytest
+
+from test.fake_device import FakeDevice, new_manager, qt_app
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+def test_interactive_commands_preempt_polls():
+    from app.core.device_link import DeviceLink
+    from app.core.poll_scheduler import PollScheduler
+
+    qt_app()
+    device = FakeDevice(auto_reply=False)
+    manager = new_manager()
+    link = DeviceLink(manager)
+    poller = PollScheduler(link, window=1)
+    results = []
+    poller.poll_result.connect(lambda name, frame, port: results.append((name, frame.value)))
+    try:
+        for name in ("battery", "signal", "gps"):
+            poller.add_poll(name, name.upper(), interval_ms=60_000)
+        assert manager.open_port(device.port)
+        poller.start()
+        assert not poller.enqueue(poller.jobs["battery"])      # ya en vuelo: se fusiona
+
+        sent = device.read_frames()
+        assert [f.split(",")[3] for f in sent] == ["BATTERY"]   # ventana de 1 sondeo
+        link.send_command("IMEI")                                # interactivo
+        operator = device.read_frames()
+        assert [f.split(",")[3] for f in operator] == ["IMEI"]
+
+        device.reply(sent[0], "87")
+        assert results == [("battery", "87")]
+        assert device.read_frames() == []                        # no sondea con el IMEI pendiente
+
+        device.reply(operator[0], "860000000000001")
+        sent = device.read_frames()
+        assert [f.split(",")[3] for f in sent] == ["SIGNAL"]
+        assert poller.pending() == 1
+    finally:
+        poller.stop()
+        manager.shutdown()
+        device.close()
+
+
+def test_stale_polls_are_dropped():
+    from app.core.device_link import DeviceLink
+    from app.core.poll_scheduler import PollScheduler
+
+    qt_app()
+    device = FakeDevice(auto_reply=False)
+    manager = new_manager()
+    link = DeviceLink(manager)
+    poller = PollScheduler(link, window=1)
+    dropped = []
+    poller.poll_dropped.connect(lambda name, why: dropped.append((name, why)))
+    try:
+        poller.add_poll("gps", "GPS", interval_ms=60_000, max_age_ms=20)
+        assert manager.open_port(device.port)
+        link.send_command("VERSION")                 # interactivo pendiente: el sondeo espera
+        poller.start()
+        assert poller.pending() == 1
+        time.sleep(0.05)
+        device.reply(device.read_frames()[0], "V1")
+        assert dropped == [("gps", "stale")]
+        assert device.read_frames() == []
+    finally:
+        poller.stop()
+        manager.shutdown()
+        device.close()
@@ -0,0 +1,42 @@
+from test.fake_device import qt_widgets_app
+
+
+def _info(name):
+    return {"description": f"USB {name}", "vendor_id": 0x1A86, "product_id": 0x7523}
+
+
+def test_rescan_only_inserts_and_removes_the_changed_rows():
+    from app.ui.widgets.port_model import PORT_ROLE, PortListModel
+
+    qt_widgets_app()
+    model = PortListModel()
+    model.update_ports(["COM1", "COM2", "COM3"], _info)
+    kept = {name: model.item(model.row_of(name)) for name in ("COM1", "COM3")}
+    inserted, removed, reset = [], [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.modelReset.connect(lambda: reset.append(True))
+
+    model.update_ports(["COM1", "COM3", "COM4"], _info)
+    assert removed == [(1, 1)] and inserted == [(2, 2)] and reset == []
+    assert [model.item(r).data(PORT_ROLE) for r in range(model.rowCount())] == ["COM1", "COM3", "COM4"]
+    assert all(model.item(model.row_of(n)) is item for n, item in kept.items())
+    assert model.item(2).text() == "COM4 — USB COM4 (1A86:7523)"
+
+    model.update_ports(["COM1", "COM3", "COM4"], _info)           # mismo escaneo: nada cambia
+    assert len(removed) == 1 and len(inserted) == 1
+    assert model.row_of("COM2") == -1
+
+
+def test_selected_port_survives_a_rescan():
+    from app.ui.widgets.panels import ComPanel
+
+    qt_widgets_app()
+    panel = ComPanel()
+    panel.set_ports(["COM1", "COM2"], _info)
+    panel.combo_port.setCurrentIndex(panel.port_model.row_of("COM2"))
+    assert panel.selected_port() == "COM2"
+
+    panel.set_ports(["COM5", "COM2"], _info)                      # COM1 se va, COM5 llega
+    assert panel.selected_port() == "COM2"
+    assert panel.combo_port.currentIndex() == panel.port_model.row_of("COM2")
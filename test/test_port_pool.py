@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from test.fake_device import FakeDevice, qt_app, wait_until
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+def _wait(cond):
+    return wait_until(cond, timeout_s=15.0)       # arrancar procesos "spawn" lleva su tiempo
+
+
+def test_group_ports_balances_and_caps_workers():
+    from app.core.port_worker import group_ports
+
+    assert group_ports(["A", "B", "C", "D", "E"], 2) == [["A", "C", "E"], ["B", "D"]]
+    assert group_ports(["A", "B"], 8) == [["A"], ["B"]]
+    assert group_ports([], 4) == []
+
+
+def test_frame_packing_round_trip():
+    from app.core.port_worker import pack_frame, unpack_frame
+    from app.core.protocol import parse_frame
+
+    frame = parse_frame("(700160818000,1,007,IMEI,860000000000001)")
+    port, back = unpack_frame(pack_frame(frame, "COM7"))
+    assert port == "COM7" and back == frame
+
+
+def test_workers_serve_their_ports_and_are_replaced_when_they_die():
+    from app.core.port_pool import PortPool
+
+    qt_app()
+    devices = [FakeDevice(default=f"86000000000000{i}") for i in range(3)]
+    for device in devices:
+        device.start()
+    ports = [device.port for device in devices]
+    pool = PortPool(ports, workers=2, heartbeat_ms=200, stall_timeout_s=5.0)
+    frames, connected, exited = [], set(), []
+    pool.frames_received.connect(frames.extend)
+    pool.connection_changed.connect(lambda ok, port: connected.add(port) if ok else connected.discard(port))
+    pool.worker_exited.connect(lambda index, group, restarted: exited.append((index, group, restarted)))
+    try:
+        pool.start()
+        assert _wait(lambda: connected == set(ports))
+        pids = {s["pid"] for s in pool.stats()}
+        assert len(pids) == 2 and os.getpid() not in pids
+
+        for port in ports:
+            assert pool.send_command(port, "IMEI")
+        assert _wait(lambda: len(frames) == 3)
+        assert {(port, f.value) for port, f in frames} == {
+            (port, f"86000000000000{i}") for i, port in enumerate(ports)}
+
+        # Un trabajador muere: el otro sigue, y el caído se reemplaza
+        victim = pool.workers[0]
+        victim.process.kill()
+        assert _wait(lambda: exited)
+        assert exited[0] == (0, victim.ports, True)
+        frames.clear()
+        assert pool.send_command(pool.workers[1].ports[0], "IMEI")
+        assert _wait(lambda: len(frames) == 1)
+        assert _wait(lambda: connected == set(ports))
+        assert pool.send_command(victim.ports[0], "IMEI")
+        assert _wait(lambda: len(frames) == 2)
+    finally:
+        pool.stop()
+        for device in devices:
+            device.close()
+    assert not any(w.process.is_alive() for w in pool.workers)
+    assert not pool.send_command(ports[0], "IMEI")
+
+
+def test_pool_keeps_one_journal_and_resumes_across_workers(tmp_path):
+    from app.core.port_pool import PortPool
+    from app.core.protocol import CONFIG_LAYOUT
+    from app.core.provisioning import Journal
+
+    imeis = [f"86000000000000{i}" for i in range(3)]
+    csv_path = tmp_path / "fleet.csv"
+    csv_path.write_text("IMEI,main_ip,main_port\n" + "".join(f"{imei},10.0.0.{i},9000\n"
+                                                            for i, imei in enumerate(imeis)))
+    qt_app()
+    devices = [FakeDevice({"IMEI": imei}) for imei in imeis]
+    for device in devices:
+        device.start()
+    ports = [device.port for device in devices]
+
+    def provision():
+        pool = PortPool(ports, workers=2, heartbeat_ms=200)
+        units, progress = [], {}
+        pool.unit_finished.connect(lambda port, imei, ok, msg: units.append((imei, ok, msg)))
+        pool.progress.connect(lambda port, done, total: progress.__setitem__(port, (done, total)))
+        try:
+            pool.start()
+            assert len({s["pid"] for s in pool.stats()}) == 2
+            pool.start_provisioning(str(csv_path))
+            assert _wait(lambda: len(units) == 3)
+            assert _wait(lambda: len(progress) == 3 and all(p == (3, 3) for p in progress.values()))
+        finally:
+            pool.stop()
+        return sorted(units)
+
+    def writes():
+        return [p[3] for d in devices for p in d.received if p[3] in CONFIG_LAYOUT]
+
+    try:
+        assert provision() == [(imei, True, "Configuración aplicada") for imei in imeis]
+        assert writes() == ["IP1"] * 3
+        lines = (tmp_path / "fleet.csv.journal.jsonl").read_text().splitlines()
+        assert len(lines) == 3                       # un solo escritor: ni líneas cortadas ni perdidas
+        assert Journal(str(tmp_path / "fleet.csv.journal.jsonl")).done() == set(imeis)
+
+        # Reanudar: ningún equipo se vuelve a escribir
+        assert provision() == [(imei, True, "Ya aprovisionado (bitácora)") for imei in imeis]
+        assert writes() == ["IP1"] * 3
+    finally:
+        for device in devices:
+            device.close()
@@ -0,0 +1,25 @@
+from app.core.protocol import FrameParser, SerialCounter, build_command, parse_frame
+
+
+def test_build_and_parse_roundtrip():
+    cmd = build_command("700160818000", "001", "base", "1")
+    assert cmd == "(700160818000,1,001,BASE,1)"
+    frame = parse_frame(cmd)
+    assert frame.device_id == "700160818000"
+    assert frame.serial == "001"
+    assert frame.keyword == "BASE"
+    assert frame.value == "1"
+
+
+def test_parser_handles_split_reads_and_garbage():
+    parser = FrameParser()
+    assert parser.feed(b"noise(700160818000,1,002,IM") == []
+    frames = parser.feed(b"EI,860000000000001)\r\n(700160818000,1,003,CCID,8951)")
+    assert [f.keyword for f in frames] == ["IMEI", "CCID"]
+    assert frames[0].value == "860000000000001"
+
+
+def test_serial_counter_wraps():
+    c = SerialCounter(start=999)
+    assert c.next() == "999"
+    assert c.next() == "001"
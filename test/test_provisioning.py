@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from app.core.provisioning import Journal, ProfileIndex, row_to_config
+from test.fake_device import FakeDevice, new_manager, qt_app, wait_until
+
+
+def test_index_reads_rows_on_demand(tmp_path):
+    csv_path = tmp_path / "fleet.csv"
+    csv_path.write_text(
+        "IMEI,main_ip,main_port,apn,vip1\n"
+        "860000000000001,52.21.34.100,11000,claro.pe,+51987654321\n"
+        '860000000000002,10.0.0.12,9000,"movistar.pe",\n'
+    )
+    index = ProfileIndex(str(csv_path))
+    assert len(index) == 2
+    row = index.row("860000000000002")
+    assert row_to_config(row) == {"main_ip": "10.0.0.12", "main_port": "9000", "apn": "movistar.pe"}
+    assert index.row("999") is None
+
+
+def test_journal_resumes_after_truncated_line(tmp_path):
+    path = tmp_path / "fleet.journal.jsonl"
+    journal = Journal(str(path))
+    journal.record("860000000000001", "done")
+    journal.record("860000000000002", "failed", "timeout")
+    with open(path, "a") as f:
+        f.write('{"imei": "8600000000000')   # corte a mitad de escritura
+
+    resumed = Journal(str(path))
+    assert resumed.done() == {"860000000000001"}
+    resumed.record("860000000000002", "done")
+    assert Journal(str(path)).done() == {"860000000000001", "860000000000002"}
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_job_writes_full_groups_and_rejects_partial_rows(tmp_path):
+    from app.core.device_link import DeviceLink
+    from app.core.identity import IdentityReader
+    from app.core.protocol import CONFIG_LAYOUT
+    from app.core.provisioning_job import ProvisioningJob
+
+    def writes():
+        return [p[3:] for p in device.received if p[3] in CONFIG_LAYOUT]
+
+    csv_path = tmp_path / "fleet.csv"
+    csv_path.write_text(
+        "IMEI,main_ip,main_port,vip1,vip2,vip3,vip4,vip5\n"
+        "860000000000001,52.21.34.100,11000,,,,,\n"
+        "860000000000002,52.21.34.100,,+51987654321,,,,\n"   # IP1 sin puerto: borraría el del equipo
+    )
+    qt_app()
+    finished = []
+    with FakeDevice({"IMEI": "860000000000001"}) as device:
+        manager = new_manager()
+        link = DeviceLink(manager)
+        job = ProvisioningJob(link, IdentityReader(link), str(csv_path), timeout_ms=2000)
+        job.unit_finished.connect(lambda imei, ok, msg: finished.append((imei, ok, msg)))
+        try:
+            assert manager.open_port(device.port)
+            job.start()
+            assert wait_until(lambda: finished)
+            assert finished == [("860000000000001", True, "Configuración aplicada")]
+            assert writes() == [["IP1", "52.21.34.100", "11000"]]
+
+            # Otra unidad en el mismo puerto, con la fila incompleta: no se escribe nada
+            device.values["IMEI"] = "860000000000002"
+            device.received.clear()
+            manager.connection_changed.emit(True, device.port)
+            assert wait_until(lambda: len(finished) == 2)
+            imei, ok, msg = finished[1]
+            assert imei == "860000000000002" and not ok and "main_port" in msg
+            assert writes() == []
+        finally:
+            job.stop()
+            manager.shutdown()
+    assert Journal(job.journal.path).done() == {"860000000000001"}
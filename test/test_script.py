@@ -0,0 +1,30 @@
+import pytest
+
+from app.core.script import ScriptError, parse_script, substitute
+
+
+def test_repeat_expands_with_loop_variable():
+    steps = parse_script("""
+        # comentario
+        @timeout 800
+        @repeat 2 n
+        (${id},1,${serial},BASE,${n})
+        @wait /OK/ 500
+        @end
+        @delay 100
+    """)
+    kinds = [s.kind for s in steps]
+    assert kinds == ["timeout", "set", "send", "wait_pattern", "set", "send", "wait_pattern", "delay"]
+    assert steps[1].arg == "n 1" and steps[4].arg == "n 2"
+    assert steps[3].arg == "OK" and steps[3].ms == 500
+
+
+def test_errors_carry_line_numbers():
+    with pytest.raises(ScriptError, match="Línea 2"):
+        parse_script("CMD\n@repeat 2\nCMD")
+    with pytest.raises(ScriptError, match="Línea 1"):
+        parse_script("@bogus")
+
+
+def test_substitute_keeps_unknown_variables():
+    assert substitute("(${id},${x})", {"id": "700160818000"}) == "(700160818000,${x})"
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from test.fake_device import DEVICE_ID, FakeDevice, new_manager, qt_app, spin, wait_until
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+@pytest.fixture
+def runner():
+    """(ScriptRunner, FakeDevice sin respuesta automática, finished recibidos)."""
+    from app.core.device_link import DeviceLink
+    from app.core.script_runner import ScriptRunner
+
+    qt_app()
+    device = FakeDevice(auto_reply=False)
+    manager = new_manager(device.port)
+    script_runner = ScriptRunner(DeviceLink(manager))
+    finished = []
+    script_runner.finished.connect(lambda ok, msg: finished.append((ok, msg)))
+    try:
+        yield script_runner, device, finished
+    finally:
+        script_runner.stop()
+        manager.shutdown()
+        device.close()
+
+
+def _next_command(device, timeout_s=2.0):
+    commands = []
+    assert wait_until(lambda: commands.extend(device.read_frames()) or commands, timeout_s)
+    assert len(commands) == 1                    # nunca sale más de un paso por respuesta
+    return commands[0]
+
+
+def test_each_repeat_step_waits_for_the_previous_reply(runner):
+    script_runner, device, finished = runner
+    assert script_runner.start(f"@repeat 3 n\n({DEVICE_ID},1,${{serial}},BASE,${{n}})\n@end")
+
+    sent = []
+    for _ in range(3):
+        command = _next_command(device)
+        spin(150)
+        assert device.read_frames() == []        # el siguiente espera la respuesta
+        sent.append(command.split(",")[4])
+        device.reply(command, command.split(",")[4])
+    assert wait_until(lambda: finished)
+    assert sent == ["1", "2", "3"]
+    assert finished == [(True, "Guion completado (6 pasos)")]
+    assert not script_runner.is_running()
+
+
+def test_step_times_out_without_sending_the_next(runner):
+    script_runner, device, finished = runner
+    assert script_runner.start(f"@timeout 200\n({DEVICE_ID},1,${{serial}},BASE,1)\n"
+                               f"({DEVICE_ID},1,${{serial}},BASE,2)")
+    _next_command(device)
+    assert wait_until(lambda: finished)
+    assert finished == [(False, "Línea 2: sin respuesta en 200 ms")]
+    spin(100)
+    assert device.read_frames() == []
+
+
+def test_wait_pattern_holds_until_the_text_arrives(runner):
+    script_runner, device, finished = runner
+    assert script_runner.start(f"@auto_wait off\nAT\n@wait /READY/ 2000\n({DEVICE_ID},1,${{serial}},BASE,1)")
+    raw = bytearray()
+    assert wait_until(lambda: raw.extend(device.read_raw()) or b"AT\n" in raw)
+    device.write("BUSY\r\n")
+    spin(150)
+    assert device.read_frames() == []
+    device.write("READY\r\n")
+    command = _next_command(device)
+    assert command.split(",")[3:] == ["BASE", "1"]
+    assert wait_until(lambda: finished)
+    assert finished[0][0] is True
+
+
+def test_stop_ends_the_run_and_ignores_the_late_reply(runner):
+    script_runner, device, finished = runner
+    assert script_runner.start(f"({DEVICE_ID},1,${{serial}},BASE,1)\n({DEVICE_ID},1,${{serial}},BASE,2)")
+    command = _next_command(device)
+    script_runner.stop()
+    assert finished == [(False, "Guion detenido")]
+    assert not script_runner.is_running()
+
+    device.reply(command)
+    spin(150)
+    assert device.read_frames() == []
+    assert len(finished) == 1
@@ -0,0 +1,230 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from test.fake_device import FakeDevice, new_manager, qt_app, wait_until
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+def _client(port):
+    s = socket.create_connection(("127.0.0.1", port))
+    s.setblocking(False)
+    return s
+
+
+def _recv(sock):
+    try:
+        return sock.recv(65536)
+    except BlockingIOError:
+        return b""
+
+
+@pytest.fixture
+def gateway_setup():
+    qt_app()
+    device = FakeDevice(auto_reply=False)
+    manager = new_manager(device.port)
+    yield manager, device
+    manager.shutdown()
+    device.close()
+
+
+def test_fan_out_and_line_atomic_writes(gateway_setup):
+    from app.core.serial_gateway import SerialGateway
+
+    manager, device = gateway_setup
+    gateway = SerialGateway(manager)
+    assert gateway.listen_tcp()
+    a, b = _client(gateway.tcp_port()), _client(gateway.tcp_port())
+    try:
+        assert wait_until(lambda: len(gateway.clients) == 2)
+        device.write(b"(700160818000,1,001,IMEI,860000000000001)\r\n")
+        got = {a: b"", b: b""}
+
+        def received():
+            for s in got:
+                got[s] += _recv(s)
+            return all(v.endswith(b"\r\n") for v in got.values())
+
+        assert wait_until(received)
+        assert got[a] == got[b] == b"(700160818000,1,001,IMEI,860000000000001)\r\n"
+
+        # Media línea de A no sale hasta completarse; la línea completa de B pasa antes
+        a.sendall(b"(000000000000,1,002,")
+        b.sendall(b"(000000000000,1,003,GMT)\r\n")
+        out = b""
+
+        def collect(expected):
+            def check():
+                nonlocal out
+                out += device.read_raw()
+                return out.endswith(expected)
+            return check
+
+        assert wait_until(collect(b"GMT)\r\n"))
+        assert out == b"(000000000000,1,003,GMT)\r\n"
+        out = b""
+        a.sendall(b"APN)\r\n")
+        assert wait_until(collect(b"APN)\r\n"))
+        assert out == b"(000000000000,1,002,APN)\r\n"
+    finally:
+        a.close()
+        b.close()
+        gateway.close()
+
+
+def test_write_lease_queues_other_clients(gateway_setup):
+    from app.core.serial_gateway import SerialGateway
+
+    manager, device = gateway_setup
+    gateway = SerialGateway(manager, lease_ms=300)
+    assert gateway.listen_tcp()
+    a, b = _client(gateway.tcp_port()), _client(gateway.tcp_port())
+    try:
+        assert wait_until(lambda: len(gateway.clients) == 2)
+        a.sendall(b"(000000000000,1,001,IMEI)\r\n")
+        out = b""
+
+        def collect(expected):
+            def check():
+                nonlocal out
+                out += device.read_raw()
+                return out.endswith(expected)
+            return check
+
+        assert wait_until(collect(b"IMEI)\r\n"))
+        started = time.monotonic()
+        b.sendall(b"(000000000000,1,002,GMT)\r\n")
+        a.sendall(b"(000000000000,1,003,APN)\r\n")        # el dueño del turno sigue escribiendo
+        assert wait_until(collect(b"GMT)\r\n"))
+        assert time.monotonic() - started >= 0.25          # B esperó a que venza el turno de A
+        assert out == b"(000000000000,1,001,IMEI)\r\n(000000000000,1,003,APN)\r\n(000000000000,1,002,GMT)\r\n"
+    finally:
+        a.close()
+        b.close()
+        gateway.close()
+
+
+def test_slow_client_is_dropped_without_stalling_the_others(gateway_setup):
+    from app.core.serial_gateway import POLICY_DROP, SerialGateway
+
+    manager, device = gateway_setup
+    gateway = SerialGateway(manager, max_buffer=64 * 1024, slow_policy=POLICY_DROP)
+    assert gateway.listen_tcp()
+    slow = socket.socket()
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    slow.connect(("127.0.0.1", gateway.tcp_port()))
+    fast = _client(gateway.tcp_port())
+    dropped = []
+    gateway.client_dropped.connect(lambda name, why: dropped.append(name))
+    total = 8 * 1024 * 1024
+    block = b"x" * 4096
+    writer = threading.Thread(target=lambda: [device.write(block) for _ in range(total // len(block))],
+                              daemon=True)
+    try:
+        assert wait_until(lambda: len(gateway.clients) == 2)
+        slow_name = next(iter(gateway.clients))
+        writer.start()
+        received = 0
+
+        def drain():
+            nonlocal received
+            while (chunk := _recv(fast)):
+                received += len(chunk)
+            return received >= total
+
+        assert wait_until(drain, timeout_s=30.0)
+        assert dropped == [slow_name]
+        assert len(gateway.clients) == 1
+    finally:
+        writer.join(5)
+        slow.close()
+        fast.close()
+        gateway.close()
+
+
+def test_local_socket_clients_share_the_port(gateway_setup, tmp_path):
+    from PyQt6.QtNetwork import QLocalSocket
+
+    from app.core.serial_gateway import SerialGateway
+
+    manager, device = gateway_setup
+    gateway = SerialGateway(manager)
+    assert gateway.listen_local(str(tmp_path / "gw.sock"))
+    client = QLocalSocket()
+    client.connectToServer(gateway.local_name())
+    try:
+        assert wait_until(lambda: len(gateway.clients) == 1)
+        device.write(b"(700160818000,1,001,GMT,0)\r\n")
+        data = b""
+
+        def received():
+            nonlocal data
+            data += bytes(client.readAll())
+            return data.endswith(b"\r\n")
+
+        assert wait_until(received)
+        assert data == b"(700160818000,1,001,GMT,0)\r\n"
+    finally:
+        client.abort()
+        gateway.close()
+
+
+def test_gateway_address_parsing():
+    from app.core.gateway_client import parse_gateway_address
+
+    assert parse_gateway_address("tcp:127.0.0.1:7000") == ("tcp", "127.0.0.1", 7000)
+    assert parse_gateway_address("tcp::7000") == ("tcp", "127.0.0.1", 7000)
+    assert parse_gateway_address("local:configver-gw") == ("local", "configver-gw", 0)
+    for bad in ("COM7", "tcp:host", "tcp:host:0", "local:"):
+        with pytest.raises(ValueError):
+            parse_gateway_address(bad)
+
+
+def test_device_link_runs_over_the_gateway_next_to_a_monitor():
+    from app.core.device_link import DeviceLink
+    from app.core.gateway_client import GatewayManager
+    from app.core.identity import IdentityReader
+    from app.core.serial_gateway import SerialGateway
+
+    qt_app()
+    with FakeDevice({"IMEI": "860000000000001"}) as device:
+        manager = new_manager(device.port)
+        gateway = SerialGateway(manager)
+        assert gateway.listen_tcp()
+        address = f"tcp:127.0.0.1:{gateway.tcp_port()}"
+        gui = GatewayManager(address, scan_interval_ms=60_000, auto_reconnect=False)
+        identity = IdentityReader(DeviceLink(gui))
+        monitor = _client(gateway.tcp_port())
+        states, ready = [], []
+        gui.connection_changed.connect(lambda ok, port: states.append((ok, port)))
+        identity.identity_ready.connect(lambda data, port: ready.append(data))
+        try:
+            assert gui.get_list_ports() == [address]
+            assert gui.open_port(address) and gui.is_connected()
+            assert wait_until(lambda: len(gateway.clients) == 2)
+            identity.refresh(force=True)
+            assert wait_until(lambda: ready)
+            assert ready[0]["imei"] == "860000000000001"
+            seen = b""
+
+            def monitored():
+                nonlocal seen
+                seen += _recv(monitor)
+                return b"IMEI,860000000000001)" in seen
+
+            assert wait_until(monitored)                 # el monitor ve las respuestas de la GUI
+
+            gateway.close()                              # pasarela caída: el "puerto" se cierra
+            assert wait_until(lambda: not gui.is_connected())
+            assert states == [(True, address), (False, address)]
+            assert gui.get_port_name() == address        # se conserva para reconectar
+        finally:
+            monitor.close()
+            gui.shutdown()
+            gateway.close()
+            manager.shutdown()
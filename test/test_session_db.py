@@ -0,0 +1,30 @@
+from app.core.protocol import parse_frame
+from app.core.session_db import SessionDB
+
+
+def test_frames_are_batched_and_queryable(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    db = SessionDB(path, operator="ana")
+    tx = parse_frame("(000000000000,1,001,IP1,52.21.34.100,11000)")
+    rx = parse_frame("(700160818000,1,001,IP1,52.21.34.100,11000)")
+    for _ in range(2500):
+        db.log_frame("tx", "COM7", tx, "860000000000001")
+        db.log_frame("rx", "COM7", rx, "860000000000001")
+    db.log_frame("rx", "COM7", parse_frame("(700160818000,1,002,IMEI,860000000000002)"), "860000000000002")
+    assert db.flush()
+    assert db.count() == 5001
+    db.close()
+
+    other = SessionDB(path, operator="luis")
+    try:
+        assert other.session_id != db.session_id
+        rows = other.history(imei="860000000000002")
+        assert [(r["keyword"], r["args"], r["operator"]) for r in rows] == [("IMEI", "860000000000002", "ana")]
+        assert len(other.history(keyword="ip1", limit=10)) == 10
+        assert other.history(operator="luis") == []
+        plan = " ".join(r[-1] for r in other._reader().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM frames WHERE imei = ? ORDER BY ts DESC", ("x",)))
+        assert "frames_imei_ts" in plan
+        assert other._reader().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        other.close()
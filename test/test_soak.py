@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+
+
+def test_short_soak_stays_within_budget():
+    from test.soak_serial import run_soak
+    assert run_soak(cycles=60, every=20, warmup=5, log=lambda *_: None) == []
+
+
+def test_soak_catches_leaked_ports(monkeypatch):
+    from PyQt6.QtCore import QObject
+    from PyQt6.QtSerialPort import QSerialPort
+
+    import app.core.serial_manager as sm
+    from test.soak_serial import Budget, run_soak
+
+    keeper = QObject()      # deleteLater perdido: cada puerto queda colgado de este padre
+    monkeypatch.setattr(sm, "QSerialPort", type("LeakyPort", (QSerialPort,), {
+        "__init__": lambda self: QSerialPort.__init__(self, keeper),
+        "deleteLater": lambda self: None}))
+    problems = run_soak(cycles=30, every=10, warmup=5, budget=Budget(qobjects=8), log=lambda *_: None)
+    assert any("QObjects" in p for p in problems)
@@ -0,0 +1,19 @@
+import importlib
+import sys
+
+from app.core.startup_timing import StartupTimer
+
+
+def test_report_tracks_imports_and_budget():
+    sys.modules.pop("colorsys", None)
+    timing = StartupTimer(budget_ms=0.0)
+    try:
+        importlib.import_module("colorsys")      # import medido
+        timing.mark("first_paint")
+    finally:
+        timing.finish()
+    assert "colorsys" in timing.imports.modules
+    assert timing.over_budget()
+    report = timing.report()
+    assert "first_paint" in report and "OVER BUDGET" in report
+    assert timing.imports not in sys.meta_path
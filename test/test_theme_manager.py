@@ -0,0 +1,26 @@
+from test.fake_device import qt_widgets_app
+
+
+def test_same_theme_is_built_and_applied_once(monkeypatch):
+    from app.themes import theme_manager as tm
+
+    app = qt_widgets_app()
+    builds, applied = [], []
+
+    def get_qss(theme):
+        builds.append(theme)
+        return f"/* {theme} */"
+
+    monkeypatch.setattr(tm, "get_qss", get_qss)
+    monkeypatch.setattr(app, "setStyleSheet", applied.append, raising=False)
+    manager = tm.ThemeManager(app)
+
+    assert manager.apply("dark") is True
+    assert manager.apply("DARK") is False        # ya activo: no se vuelve a pulir nada
+    assert builds == ["dark"] and applied == ["/* dark */"]
+
+    assert manager.toggle() == "light"
+    assert manager.toggle() == "dark"
+    assert builds == ["dark", "light"]           # la QSS oscura sale de la caché
+    assert applied == ["/* dark */", "/* light */", "/* dark */"]
+    assert manager.last_switch_ms is not None
@@ -0,0 +1,28 @@
+import json
+import threading
+
+from app.core.protocol import FrameParser
+from app.core.tracing import Tracer
+
+
+def test_instrumented_methods_export_chrome_trace(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.json"))
+    assert tracer.instrument(FrameParser, ("feed", "future_stage"), "parser") == 1
+    try:
+        parser = FrameParser()
+        assert len(parser.feed(b"(700160818000,1,001,IMEI,860000000000001)")) == 1
+        t = threading.Thread(target=parser.feed, args=(b"noise",), name="worker")
+        t.start()
+        t.join()
+    finally:
+        tracer.uninstall()
+    assert FrameParser.feed.__name__ == "feed" and not hasattr(FrameParser.feed, "__wrapped__")
+
+    assert tracer.export() == 2
+    data = json.loads((tmp_path / "trace.json").read_text())
+    spans = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in spans} == {"FrameParser.feed"}
+    assert len({e["tid"] for e in spans}) == 2
+    names = {e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"}
+    assert "worker" in names
+    assert "FrameParser.feed" in tracer.summary()
@@ -0,0 +1,82 @@
+import json
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from app.updater.release_check import ReleaseCache, ReleaseCheckError, latest_release
+from app.updater.updater import Updater
+from test.http_stub import StubFile, StubServer
+
+DIGEST = "ab" * 32
+RELEASE = {
+    "tag_name": "v2.0",
+    "assets": [{"name": "ConfigVer.exe", "browser_download_url": "http://example/ConfigVer.exe",
+                "digest": "sha256:" + DIGEST}],
+}
+
+
+def release_file(release=RELEASE, **kw):
+    return StubFile(json.dumps(release).encode(), content_type="application/json", **kw)
+
+
+def test_cache_ttl_and_conditional_revalidation(tmp_path):
+    cache = ReleaseCache(str(tmp_path / "cache" / "release.json"), ttl=60)
+    with StubServer({"/latest": release_file()}) as server:
+        url = server.url("/latest")
+        assert latest_release(url, cache, now=1000) == (RELEASE, "network")
+        assert latest_release(url, cache, now=1030) == (RELEASE, "cache")
+        assert server.count("GET", "/latest") == 1
+
+        assert latest_release(url, cache, now=1100) == (RELEASE, "not-modified")
+        assert server.requests[-1]["headers"]["If-None-Match"] == server.files["/latest"].etag
+        assert latest_release(url, cache, now=1120)[1] == "cache"       # the 304 renewed the TTL
+
+        newer = dict(RELEASE, tag_name="v2.1")
+        server.files["/latest"] = release_file(newer)
+        assert latest_release(url, cache, now=1200) == (newer, "network")
+
+    # Server unreachable: the last known answer is still usable
+    assert latest_release(url, cache, timeout=0.5, now=1300) == (newer, "stale")
+    with pytest.raises(ReleaseCheckError):
+        latest_release(url, ReleaseCache(str(tmp_path / "empty.json")), timeout=0.5)
+
+
+def _wait(app, cond, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while not cond() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return cond()
+
+
+def test_check_runs_in_background_and_reports_through_signals(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    with StubServer({"/latest": release_file(), "/slow": release_file(delay=1.5)}) as server:
+        updater = Updater("v1.0", "owner", "repo", api_url=server.url("/latest"),
+                          cache_path=str(tmp_path / "release.json"))
+        events = []
+        updater.update_available.connect(lambda tag: events.append(("available", tag)))
+        updater.up_to_date.connect(lambda tag: events.append(("latest", tag)))
+        updater.check_failed.connect(lambda msg: events.append(("failed", msg)))
+
+        t0 = time.monotonic()
+        assert updater.check_update()
+        assert time.monotonic() - t0 < 0.2                  # returns right away
+        assert not updater.check_update()                   # one check at a time
+        assert _wait(app, lambda: events)
+        assert events == [("available", "v2.0")]
+        assert updater.download_url == "http://example/ConfigVer.exe"
+        assert updater.expected_sha256 == DIGEST
+
+        slow = Updater("v2.0", "owner", "repo", api_url=server.url("/slow"),
+                       cache_path=str(tmp_path / "slow.json"), check_timeout_s=0.3)
+        slow.check_failed.connect(lambda msg: events.append(("failed", msg)))
+        slow.up_to_date.connect(lambda tag: events.append(("latest", tag)))
+        slow.check_update()
+        assert _wait(app, lambda: len(events) == 2)
+        assert events[1][0] == "failed" and "0.3 s" in events[1][1]
+        # The late answer is ignored once the thread ends
+        assert _wait(app, lambda: not slow._threads)
+        app.processEvents()
+        assert len(events) == 2
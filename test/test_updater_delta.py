@@ -0,0 +1,103 @@
+import hashlib
+import os
+import random
+
+import pytest
+
+from app.updater.delta import DeltaError, apply_patch, delta_chain, make_delta
+from app.updater.updater import DownloadThread
+from test.fake_device import qt_app
+from test.http_stub import StubFile, StubServer
+
+
+def _versions(tmp_path):
+    rnd = random.Random(7)
+    v1 = bytearray(rnd.randbytes(1024 * 1024))
+    v2 = bytearray(v1)
+    for _ in range(10):
+        p = rnd.randrange(len(v2) - 500)
+        v2[p:p + 200] = rnd.randbytes(200)
+    v2[5000:5000] = rnd.randbytes(3000)              # insertion shifts everything after it
+    v3 = bytearray(v2)
+    del v3[300000:310000]
+    paths = []
+    for name, data in (("v1", v1), ("v2", v2), ("v3", v3)):
+        path = str(tmp_path / name)
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def test_patch_roundtrip_and_verification(tmp_path):
+    v1, v2, _ = _versions(tmp_path)
+    patch = str(tmp_path / "p.delta")
+    size = make_delta(v1, v2, patch)
+    assert size < os.path.getsize(v2) // 20
+
+    out = str(tmp_path / "out")
+    digest = apply_patch(v1, patch, out)
+    assert open(out, "rb").read() == open(v2, "rb").read()
+    assert digest == hashlib.sha256(open(v2, "rb").read()).hexdigest()
+
+    with pytest.raises(DeltaError):
+        apply_patch(v2, patch, out)                  # wrong installed version
+    data = bytearray(open(patch, "rb").read())
+    data[-20] ^= 0xFF
+    with open(patch, "wb") as f:
+        f.write(data)
+    with pytest.raises(DeltaError):
+        apply_patch(v1, patch, str(tmp_path / "bad"))
+    assert not os.path.exists(str(tmp_path / "bad")) and not os.path.exists(str(tmp_path / "bad.tmp"))
+
+
+def _asset(name, url="http://x", size=100):
+    return {"name": name, "browser_download_url": url + "/" + name, "size": size}
+
+
+def test_delta_chain():
+    releases = [
+        {"tag_name": "v1.2-rc", "assets": [_asset("app.exe", size=10_000), _asset("app.exe.v1.1-v1.2-rc.delta")]},
+        {"tag_name": "v1.1", "assets": [_asset("app.exe"), _asset("app.exe.v1.0-v1.1.delta")]},
+        {"tag_name": "v1.0", "assets": [_asset("app.exe")]},
+    ]
+    chain = delta_chain(releases, "app.exe", "v1.0", "v1.2-rc", full_size=10_000)
+    assert [a["name"] for a in chain] == ["app.exe.v1.0-v1.1.delta", "app.exe.v1.1-v1.2-rc.delta"]
+    assert delta_chain(releases, "app.exe", "v0.9", "v1.2-rc") is None
+    assert delta_chain(releases, "app.exe", "v1.0", "v1.2-rc", full_size=150) is None   # not worth it
+
+
+def _run(thread):
+    messages = []
+    thread.finished.connect(messages.append)
+    thread.run()
+    return messages
+
+
+def test_download_thread_applies_chain_and_falls_back(tmp_path):
+    qt_app()
+    v1, v2, v3 = _versions(tmp_path)
+    make_delta(v1, v2, str(tmp_path / "a.delta"))
+    make_delta(v2, v3, str(tmp_path / "b.delta"))
+    full = open(v3, "rb").read()
+    files = {"/app.exe": StubFile(full),
+             "/a.delta": StubFile(open(str(tmp_path / "a.delta"), "rb").read()),
+             "/b.delta": StubFile(open(str(tmp_path / "b.delta"), "rb").read())}
+    sha = hashlib.sha256(full).hexdigest()
+    dest = str(tmp_path / "new" / "app.exe")
+    os.makedirs(os.path.dirname(dest))
+
+    with StubServer(files) as server:
+        deltas = [{"browser_download_url": server.url(p), "size": len(files[p].data)} for p in ("/a.delta", "/b.delta")]
+        thread = DownloadThread(server.url("/app.exe"), dest, sha, deltas=deltas, base_path=v1)
+        assert _run(thread) == ["Download Completed"]
+        assert thread.used_delta and server.count("GET", "/app.exe") == 0
+        assert open(dest, "rb").read() == full
+        assert os.listdir(os.path.dirname(dest)) == ["app.exe"]
+        os.remove(dest)
+
+        # The installed file is not the patch source: full download instead
+        thread = DownloadThread(server.url("/app.exe"), dest, sha, deltas=deltas, base_path=v2)
+        assert _run(thread) == ["Download Completed"]
+        assert not thread.used_delta and server.count("GET", "/app.exe") == 1
+        assert open(dest, "rb").read() == full
@@ -0,0 +1,140 @@
+import hashlib
+import os
+
+import pytest
+
+from app.updater import download
+from app.updater.download import DownloadCancelled, DownloadEngine, IntegrityError, next_chunk_size
+from app.updater.integrity import release_digest
+from test.http_stub import StubFile, StubServer
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 123)
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_resumes_after_dropped_connection(tmp_path):
+    dest = str(tmp_path / "app.exe")
+    files = {"/app.exe": StubFile(PAYLOAD, drop_after=1024 * 1024, drops=2)}
+    with StubServer(files) as server:
+        seen = []
+        engine = DownloadEngine(backoff=0.01)
+        assert engine.download(server.url("/app.exe"), dest, lambda d, t: seen.append((d, t))) == len(PAYLOAD)
+        gets = [r for r in server.requests if r["method"] == "GET"]
+    assert open(dest, "rb").read() == PAYLOAD
+    assert not os.path.exists(dest + ".part") and not os.path.exists(dest + ".part.json")
+    # Each retry asks only for what is missing, validated by the ETag
+    assert len(gets) == 3
+    start, end = map(int, gets[1]["headers"]["Range"][len("bytes="):].split("-"))
+    assert 0 < start <= 1024 * 1024 and end == len(PAYLOAD) - 1
+    assert gets[1]["headers"]["If-Range"] == files["/app.exe"].etag
+    assert seen[-1] == (len(PAYLOAD), len(PAYLOAD))
+    assert all(a[0] <= b[0] for a, b in zip(seen, seen[1:]))
+    # One pooled connection serves the HEAD and the first GET
+    assert server.connections <= len(gets)
+
+
+def test_resumes_partial_file_from_previous_run(tmp_path, monkeypatch):
+    dest = str(tmp_path / "app.exe")
+    with StubServer({"/app.exe": StubFile(PAYLOAD)}) as server:
+        engine = DownloadEngine()
+        monkeypatch.setattr(download, "STATE_SAVE_INTERVAL", 0.0)
+
+        def stop_halfway(done, total):
+            if done >= len(PAYLOAD) // 2:
+                engine.cancel()
+
+        with pytest.raises(DownloadCancelled):
+            engine.download(server.url("/app.exe"), dest, stop_halfway)
+        assert os.path.exists(dest + ".part.json")
+
+        DownloadEngine().download(server.url("/app.exe"), dest)
+        last = [r for r in server.requests if r["method"] == "GET"][-1]
+    assert open(dest, "rb").read() == PAYLOAD
+    assert last["headers"]["Range"] != "bytes=0-%d" % (len(PAYLOAD) - 1)
+
+
+def test_streams_without_content_length(tmp_path):
+    dest = str(tmp_path / "app.exe")
+    with StubServer({"/app.exe": StubFile(PAYLOAD, ranges=False, length=False)}) as server:
+        seen = []
+        DownloadEngine().download(server.url("/app.exe"), dest, lambda d, t: seen.append((d, t)))
+    assert open(dest, "rb").read() == PAYLOAD
+    assert seen[-1] == (len(PAYLOAD), None)
+
+
+def test_parallel_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "MIN_SEGMENT_SIZE", 1024 * 1024)
+    dest = str(tmp_path / "app.exe")
+    with StubServer({"/app.exe": StubFile(PAYLOAD, drop_after=300 * 1024, drops=1)}) as server:
+        DownloadEngine(segments=3, backoff=0.01).download(server.url("/app.exe"), dest)
+        ranges = sorted(r["headers"]["Range"] for r in server.requests if r["method"] == "GET")
+    assert open(dest, "rb").read() == PAYLOAD
+    assert len(ranges) == 4            # three segments plus the retry of the dropped one
+
+
+def test_restarts_when_file_changes_mid_download(tmp_path):
+    dest = str(tmp_path / "app.exe")
+    newer = os.urandom(len(PAYLOAD))
+    with StubServer({"/app.exe": StubFile(PAYLOAD)}) as server:
+        def swap(done, total):
+            # After the HEAD probe the release is replaced: If-Range no longer matches
+            server.files["/app.exe"] = StubFile(newer)
+
+        DownloadEngine().download(server.url("/app.exe"), dest, swap)
+    assert open(dest, "rb").read() == newer
+
+
+def test_chunk_size_adapts_to_throughput():
+    assert next_chunk_size(download.MIN_CHUNK, download.MIN_CHUNK, 0.001) == 2 * download.MIN_CHUNK
+    assert next_chunk_size(download.MAX_CHUNK, download.MAX_CHUNK, 0.0001) == download.MAX_CHUNK
+    assert next_chunk_size(1024 * 1024, 1024 * 1024, 10.0) == download.MIN_CHUNK
+
+
+def test_digest_is_computed_while_streaming(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "MIN_SEGMENT_SIZE", 1024 * 1024)
+    dest = str(tmp_path / "app.exe")
+    files = {"/app.exe": StubFile(PAYLOAD, drop_after=512 * 1024, drops=2)}
+    with StubServer(files) as server:
+        for segments in (1, 3):
+            engine = DownloadEngine(segments=segments, backoff=0.01)
+            engine.download(server.url("/app.exe"), dest, expected_sha256=PAYLOAD_SHA256.upper())
+            assert engine.sha256 == PAYLOAD_SHA256
+            os.remove(dest)
+
+
+def test_mismatching_digest_never_reaches_destination(tmp_path):
+    dest = str(tmp_path / "app.exe")
+    with open(dest, "wb") as f:
+        f.write(b"current version")
+    with StubServer({"/app.exe": StubFile(PAYLOAD)}) as server:
+        with pytest.raises(IntegrityError):
+            DownloadEngine().download(server.url("/app.exe"), dest, expected_sha256="0" * 64)
+        with pytest.raises(IntegrityError):
+            DownloadEngine().download(server.url("/app.exe"), dest, verify=lambda digest: False)
+    assert open(dest, "rb").read() == b"current version"
+    assert os.listdir(tmp_path) == ["app.exe"]
+
+
+def test_release_digest_sources():
+    asset = {"name": "ConfigVer.exe", "browser_download_url": "x"}
+    assert release_digest({"assets": [dict(asset, digest="sha256:" + PAYLOAD_SHA256)]},
+                          dict(asset, digest="sha256:" + PAYLOAD_SHA256)) == PAYLOAD_SHA256
+    body = "Changes...\n\n%s  ConfigVer.exe\n%s  other.zip\n" % (PAYLOAD_SHA256, "1" * 64)
+    assert release_digest({"assets": [asset], "body": body}, asset) == PAYLOAD_SHA256
+    assert release_digest({"assets": [asset], "body": "no digest here"}, asset) is None
+
+    with StubServer({"/sums": StubFile(("%s *ConfigVer.exe\n" % PAYLOAD_SHA256).encode())}) as server:
+        sums = {"name": "SHA256SUMS", "browser_download_url": server.url("/sums")}
+        assert release_digest({"assets": [asset, sums]}, asset) == PAYLOAD_SHA256
+
+
+def test_signature_over_digest(tmp_path):
+    ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+    from cryptography.hazmat.primitives import serialization
+    from app.updater.integrity import signature_verifier
+
+    key = ed25519.Ed25519PrivateKey.generate()
+    public = key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    signature = key.sign(bytes.fromhex(PAYLOAD_SHA256))
+    assert signature_verifier(public, signature)(PAYLOAD_SHA256)
+    assert not signature_verifier(public, signature)("0" * 64)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from PyQt6.QtCore import QCoreApplication
+
+from app.updater.mirror import AssetCache, MirrorServer, mirror_asset_url
+from app.updater.release_check import latest_release
+from app.updater.updater import CheckThread, DownloadThread, Updater
+from test.fake_device import qt_app
+from test.http_stub import StubFile, StubServer
+
+PAYLOAD = os.urandom(2 * 1024 * 1024 + 17)
+DIGEST = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_asset_cache(tmp_path):
+    cache = AssetCache(str(tmp_path / "cache"))
+    src = str(tmp_path / "a.bin")
+    with open(src, "wb") as f:
+        f.write(PAYLOAD)
+    assert not cache.has(DIGEST)
+    assert cache.add(src, DIGEST).endswith(os.path.join("sha256", DIGEST[:2], DIGEST))
+    assert cache.has(DIGEST.upper())
+    assert cache.copy_to(DIGEST, str(tmp_path / "out.bin"))
+    assert open(str(tmp_path / "out.bin"), "rb").read() == PAYLOAD
+    assert not cache.copy_to("0" * 64, str(tmp_path / "none.bin"))
+    assert cache.prune(len(PAYLOAD)) == 0
+    assert cache.prune(1) == 1 and not cache.has(DIGEST)
+
+
+def _station(tmp_path, name, url, mirror_url):
+    root = tmp_path / name
+    root.mkdir()
+    return DownloadThread(url, str(root / "app.exe"), DIGEST, asset_cache=AssetCache(str(root / "cache")),
+                          mirror_url=mirror_url)
+
+
+def test_site_mirror_fetches_each_release_once(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    release = {"tag_name": "v2.0", "assets": [{"name": "app.exe", "digest": "sha256:" + DIGEST}]}
+    files = {"/app.exe": StubFile(PAYLOAD),
+             "/repos/o/r/releases/latest": StubFile(json.dumps(release).encode(), content_type="application/json")}
+    with StubServer(files) as internet:
+        asset_url = internet.url("/app.exe")
+        mirror = MirrorServer(AssetCache(str(tmp_path / "mirror")), "127.0.0.1", 0,
+                              upstream_api=internet.url("/repos/o/r"), allowed_hosts=("127.0.0.1",)).start()
+        try:
+            # Release metadata through the mirror, revalidated with its ETag
+            assert latest_release(mirror.url + "/releases/latest")[0] == release
+            assert latest_release(mirror.url + "/releases/latest")[0] == release
+            assert internet.count("GET", "/repos/o/r/releases/latest") == 1
+
+            stations = [_station(tmp_path, f"st{i}", asset_url, mirror.url) for i in range(3)]
+            messages = []
+            for st in stations:
+                st.finished.connect(messages.append)
+            workers = [threading.Thread(target=st.run) for st in stations]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+            app.processEvents()
+            assert messages == ["Download Completed"] * 3
+            for st in stations:
+                assert open(st.save_path, "rb").read() == PAYLOAD
+                assert st.asset_cache.has(DIGEST)
+            assert internet.count("GET", "/app.exe") == 1 and mirror.upstream_fetches == 1
+
+            # A second install on the same station comes from its local cache
+            again = DownloadThread(asset_url, str(tmp_path / "again.exe"), DIGEST,
+                                   asset_cache=stations[0].asset_cache, mirror_url=mirror.url)
+            again.run()
+            assert open(str(tmp_path / "again.exe"), "rb").read() == PAYLOAD
+            assert internet.count("GET", "/app.exe") == 1
+        finally:
+            mirror.stop()
+
+        # Mirror gone: the station falls back to the internet
+        lone = _station(tmp_path, "lone", asset_url, mirror.url)
+        lone.run()
+        assert open(lone.save_path, "rb").read() == PAYLOAD
+        assert internet.count("GET", "/app.exe") == 2
+
+
+def test_check_falls_back_to_the_internet_when_the_mirror_cannot_answer(tmp_path):
+    qt_app()
+    release = {"tag_name": "v2.0", "assets": [{"name": "app.exe", "digest": "sha256:" + DIGEST}]}
+    files = {"/repos/o/r/releases/latest": StubFile(json.dumps(release).encode(), content_type="application/json")}
+    with StubServer(files) as internet:
+        github = internet.url("/repos/o/r/releases/latest")
+
+        def check(mirror_url):
+            thread = CheckThread(mirror_url + "/releases/latest", "v2.0", fallback_url=github, timeout=(0.5, 2))
+            results, failures = [], []
+            thread.checked.connect(results.append)
+            thread.failed.connect(failures.append)
+            thread.run()
+            return results, failures
+
+        # Mirror started without --upstream-api: it answers 404 for release metadata
+        mirror = MirrorServer(AssetCache(str(tmp_path / "mirror")), "127.0.0.1", 0).start()
+        try:
+            results, failures = check(mirror.url)
+        finally:
+            mirror.stop()
+        assert failures == [] and results[0]["release"] == release
+        assert internet.count("GET", "/repos/o/r/releases/latest") == 1
+
+        # Mirror gone
+        results, failures = check(mirror.url)
+        assert failures == [] and results[0]["release"] == release
+        assert internet.count("GET", "/repos/o/r/releases/latest") == 2
+
+    updater = Updater("v1.0", "o", "r", mirror_url="http://station-01:8765/", cache_path=str(tmp_path / "c.json"))
+    assert updater.api_url == "http://station-01:8765/releases/latest"
+    assert updater.fallback_api_url == "https://api.github.com/repos/o/r/releases/latest"
+
+
+def test_mirror_is_not_an_open_proxy(tmp_path):
+    with StubServer({"/app.exe": StubFile(PAYLOAD)}) as internet:
+        mirror = MirrorServer(AssetCache(str(tmp_path / "mirror")), "127.0.0.1", 0).start()
+        try:
+            r = requests.get(mirror_asset_url(mirror.url, DIGEST, internet.url("/app.exe")), timeout=5)
+            assert r.status_code == 502
+            assert internet.count("GET", "/app.exe") == 0
+            assert requests.get(mirror.url + "/releases/latest", timeout=5).status_code == 404
+        finally:
+            mirror.stop()
@@ -0,0 +1,87 @@
+import os
+
+from PyQt6.QtCore import QCoreApplication
+
+from app.updater.progress import ProgressMeter, RateEstimator, format_duration
+from app.updater.updater import DownloadThread
+from test.http_stub import StubFile, StubServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_events_are_throttled_by_time_and_percent():
+    clock = FakeClock()
+    meter = ProgressMeter(clock=clock)
+    total, chunk = 40 * 1024 * 1024, 4096
+    events = []
+    for i in range(1, total // chunk + 1):
+        clock.now = i * 0.001                       # 4 KB every ms: 4 MB/s for 10 s
+        event = meter.update(i * chunk, total)
+        if event:
+            events.append(event)
+    assert 50 <= len(events) <= 101                # ~10 per second instead of 10240
+    assert all(b.percent > a.percent for a, b in zip(events, events[1:]))
+    last = events[-1]
+    assert abs(last.rate - 4096 / 0.001) / (4096 / 0.001) < 0.01
+    middle = events[len(events) // 2]
+    assert abs(middle.eta_s - (total - middle.done) / middle.rate) < 1e-6
+    assert abs(middle.eta_s - (total - middle.done) / (4096 / 0.001)) < 0.5
+    final = meter.finish()
+    assert final.finished and final.percent == 100 and final.eta_s == 0.0
+
+    # Fast link, small file: the percent step is the limit
+    clock.now, meter = 0.0, ProgressMeter(clock=clock)
+    emitted = 0
+    for i in range(1, 1001):
+        clock.now = i * 1.0                         # very slow chunks, but only 0.1 % each
+        emitted += meter.update(i, 1000) is not None
+    assert emitted == 100 + 1
+
+
+def test_indeterminate_mode_and_smoothing():
+    clock = FakeClock()
+    meter = ProgressMeter(clock=clock)
+    events = []
+    for i in range(1, 301):
+        clock.now = i * 0.01
+        # Bursty arrivals: 0 or 2 chunks per tick, 100 KB/s on average
+        event = meter.update((i + i % 2) // 2 * 2048, None)
+        if event:
+            events.append(event)
+    assert len(events) <= 31
+    assert all(e.percent is None and e.eta_s is None for e in events)
+    assert "at" in events[-1].describe()
+    rates = [e.rate for e in events[5:]]
+    assert max(rates) / min(rates) < 1.5           # no jumping between 0 and 2x
+    final = meter.finish()
+    assert final.total == final.done and final.percent == 100
+
+    estimator = RateEstimator(time_constant_s=1.0)
+    for t in range(0, 21):
+        estimator.update(t * 1000, float(t))
+    for t in range(21, 30):
+        estimator.update(20_000 + (t - 20) * 3000, float(t))   # rate triples
+    assert 2000 < estimator.rate < 3000
+    assert format_duration(3725) == "1:02:05" and format_duration(35) == "0:35"
+
+
+def test_download_thread_emits_few_events(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    payload = os.urandom(4 * 1024 * 1024)
+    with StubServer({"/a": StubFile(payload), "/b": StubFile(payload, ranges=False, length=False)}) as server:
+        for path in ("/a", "/b"):
+            thread = DownloadThread(server.url(path), str(tmp_path / path[1:]))
+            infos, percents = [], []
+            thread.progress_info.connect(infos.append)
+            thread.progress.connect(percents.append)
+            thread.run()
+            app.processEvents()
+            assert 1 <= len(infos) <= 12
+            assert infos[-1].finished and infos[-1].done == len(payload)
+            assert percents[-1] == 100
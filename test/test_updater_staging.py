@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from app.updater.staging import StagedUpdates, install_root, launch_staged
+from app.updater.updater import Updater
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write(path, text, mode=0o644):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    os.chmod(path, mode)
+    return path
+
+
+def test_stage_promote_and_relaunch_target(tmp_path):
+    root = str(tmp_path)
+    launcher = _write(os.path.join(root, "ConfigVer"), "launcher")
+    staging = StagedUpdates(root)
+    new = _write(staging.version_path("v2.0", "ConfigVer"), "v2")
+    staging.stage(new, "v2.0", "ab" * 32)
+    assert staging.staged()["version"] == "v2.0"
+    if os.name != "nt":
+        assert os.access(new, os.X_OK)
+
+    # Next launch from the install root: v2.0 becomes current and is started instead
+    assert launch_staged(running=launcher, execute=False) == new
+    state = staging.load()
+    assert state["current"]["version"] == "v2.0" and "staged" not in state
+    # Running the current version itself: nothing to do
+    assert install_root(new) == root
+    assert launch_staged(running=new, execute=False) is None
+
+    v3 = _write(staging.version_path("v3.0", "ConfigVer"), "v3")
+    staging.stage(v3, "v3.0")
+    assert launch_staged(running=new, execute=False) == v3
+    assert staging.load()["previous"]["version"] == "v2.0"
+
+
+def test_cleanup_is_bounded_and_keeps_protected_versions(tmp_path):
+    staging = StagedUpdates(str(tmp_path))
+    for i in range(8):
+        path = _write(staging.version_path(f"v1.{i}", "ConfigVer"), str(i))
+        os.utime(os.path.dirname(path), (1000 + i, 1000 + i))
+    staging.stage(staging.version_path("v1.0", "ConfigVer"), "v1.0")      # oldest, but staged
+    staging.promote()
+    staging.stage(staging.version_path("v1.1", "ConfigVer"), "v1.1")
+
+    removed = staging.cleanup(keep=2, max_removals=3, running=staging.version_path("v1.2", "x"))
+    assert removed == ["v1.3", "v1.4", "v1.5"]                            # oldest first, 3 at most
+    assert staging.cleanup(keep=2, max_removals=3) == ["v1.2"]          # no longer running
+    left = sorted(os.listdir(os.path.join(str(tmp_path), "versions")))
+    assert left == ["v1.0", "v1.1", "v1.6", "v1.7"]
+
+    thread = staging.cleanup_in_background(delay_s=0.0, keep=0, max_removals=10)
+    thread.join(5)
+    assert sorted(os.listdir(os.path.join(str(tmp_path), "versions"))) == ["v1.0", "v1.1"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="exec of a shell script")
+def test_launcher_execs_staged_version(tmp_path):
+    root = str(tmp_path)
+    launcher = _write(os.path.join(root, "launcher.py"),
+                      f"import sys\nsys.path.insert(0, {REPO!r})\n"
+                      "from app.updater.staging import launch_staged\nlaunch_staged()\nprint('old')\n")
+    staging = StagedUpdates(root)
+    new = _write(staging.version_path("v2.0", "ConfigVer"), '#!/bin/sh\necho new "$@"\n')
+    staging.stage(new, "v2.0")
+    env = {k: v for k, v in os.environ.items() if k != "CONFIGVER_UPDATER_RELAUNCHED"}
+    out = subprocess.run([sys.executable, launcher, "--port", "COM7"], capture_output=True, text=True,
+                         timeout=30, env=env)
+    assert out.stdout.strip() == "new --port COM7"
+
+
+def test_updater_stages_instead_of_restarting(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    updater = Updater("v1.0", "o", "r", cache_path=str(tmp_path / "cache.json"), install_dir=str(tmp_path))
+    events = []
+    updater.update_staged.connect(events.append)
+    updater.update_failed.connect(lambda msg: events.append("failed: " + msg))
+    updater.latest_version, updater.expected_sha256 = "v2.0", "cd" * 32
+    path = _write(updater.staging.version_path("v2.0", "ConfigVer"), "v2")
+
+    updater.on_download_finished("Download Completed", path)
+    updater.on_download_finished("Download Failed: Checksum mismatch", path)
+    t0 = time.monotonic()
+    while len(events) < 2 and time.monotonic() - t0 < 2:
+        app.processEvents()
+    assert events == ["v2.0", "failed: Download Failed: Checksum mismatch"]
+    assert updater.staging.staged()["sha256"] == "cd" * 32
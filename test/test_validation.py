@@ -0,0 +1,41 @@
+from app.core.validation import missing_fields, validate_profile, validate_rows, validate_value
+
+
+def test_single_fields():
+    assert validate_value("main_ip", "52.21.34.100") is None
+    assert validate_value("main_ip", "256.1.1.1")
+    assert validate_value("main_port", "0")
+    assert validate_value("apn", "claro.pe") is None
+    assert validate_value("apn", "bad apn")
+    assert validate_value("apn_user", "a,b")
+    assert validate_value("vip1", "+51987654321") is None
+    assert validate_value("vip1", "") is None          # vacío = no escribir
+    assert validate_value("unknown", "x") is None
+
+
+def test_batch_report_per_row():
+    rows = [{"main_ip": "10.0.0.1", "main_port": "11000", "apn": "claro.pe"} for _ in range(20_000)]
+    rows[7] = {"main_ip": "10.0.0.300", "main_port": "70000", "vip2": "12"}
+    report = validate_rows(rows, start=1)
+    # vip2 sola deja el grupo VIP sin su primer número
+    assert sorted((e.row, e.field) for e in report) == [(8, "main_ip"), (8, "main_port"), (8, "vip1"), (8, "vip2")]
+    assert validate_profile(rows[0]) == {}
+
+
+def test_partial_keyword_groups_are_rejected():
+    assert missing_fields({"vip1": "+51987654321"}) == {}              # vip2..vip5 son lugares libres
+    assert set(missing_fields({"vip3": "+51987654321"})) == {"vip1"}
+    assert set(validate_profile({"main_ip": "1.2.3.4"})) == {"main_port"}
+    assert "IP1" in validate_profile({"main_ip": "1.2.3.4"})["main_port"]
+    assert validate_profile({"apn": "claro.pe"}) == {}                 # usuario y clave son opcionales
+    assert missing_fields({"main_ip": "", "vip1": ""}) == {}
+    assert set(missing_fields({"main_ip": "1.2.3.4", "main_port": " "})) == {"main_port"}
+
+
+def test_commands_skip_blank_required_fields_and_pad_optional_ones():
+    from app.core.protocol import config_commands
+
+    gui = {"main_ip": "1.2.3.4", "main_port": "", "sub_ip": "", "sub_port": 9000, "apn": "claro.pe",
+           "apn_user": "", "apn_pass": "", "vip1": "+51987654321", "vip2": "", "vip3": "", "vip4": "", "vip5": ""}
+    assert config_commands(gui, ("IP1", "IP2", "APN", "VIP")) == [
+        ("APN", "claro.pe", "", ""), ("VIP", "+51987654321", "", "", "", "")]
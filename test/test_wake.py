@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from app.core.wake import WakeStats
+from test.fake_device import FakeDevice, new_manager, qt_app, wait_for_signal
+
+
+def test_stats_learn_per_firmware_and_persist(tmp_path):
+    path = str(tmp_path / "wake.json")
+    stats = WakeStats(path)
+    assert stats.first_probe_delay("V1") == 0.0
+    for s in (0.9, 1.0, 1.1, 1.2, 3.0):
+        stats.record("V1", s)
+    stats.record("", 0.2)
+    again = WakeStats(path)
+    assert again.first_probe_delay("V1") == 1.0
+    assert again.samples("?") == [0.2]
+    assert again.quantile("V2", 0.5) is None
+
+
+class _SleepyDevice(FakeDevice):
+    """Equipo simulado: ignora tramas mientras duerme; cualquier byte lo despierta tras `wake_s`."""
+
+    def __init__(self, wake_s):
+        super().__init__({}, default="V2.1")
+        self.wake_s = wake_s
+        self.awake_at = None
+        self.ignored = 0
+
+    def sleep(self):
+        self.awake_at = None
+
+    def on_bytes(self, data, now):
+        if self.awake_at is None:
+            self.awake_at = now + self.wake_s
+
+    def handle(self, parts, now):
+        if now < self.awake_at:
+            self.ignored += 1
+            return None
+        return self.frame(parts, "V2.1")
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_queued_commands_flush_after_adaptive_wake(tmp_path):
+    from app.core.device_link import DeviceLink
+    from app.core.wake_manager import WakeManager
+
+    qt_app()
+    manager = new_manager()
+    link = DeviceLink(manager)
+    stats = WakeStats(str(tmp_path / "wake.json"))
+    wake = WakeManager(link, stats, probe_timeout_ms=60, max_probe_timeout_ms=200)
+    device = _SleepyDevice(wake_s=0.4)
+    woke, ran = [], []
+    wake.woke.connect(lambda ms, probes: woke.append((ms, probes)))
+    try:
+        assert manager.open_port(device.port)
+        device.start()
+        wait_for_signal(wake.woke, trigger=lambda: wake.when_awake(lambda: ran.append(link.send_command("IMEI"))))
+        assert ran and wake.pending() == 0 and wake.is_awake()
+        assert wake.firmware == "V2.1"
+        first_ms, first_probes = woke[0]
+        assert first_ms >= 400 and first_probes > 1
+
+        # Segunda vez: espera lo aprendido antes de sondear
+        wait_for_signal(link.frame_received)                  # respuesta al IMEI encolado
+        device.sleep()
+        wake._set_state("asleep")
+        wait_for_signal(wake.woke, trigger=wake.wake)
+        assert woke[1][1] < first_probes
+        assert stats.samples("V2.1")
+    finally:
+        manager.shutdown()
+        device.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="necesita pty")
+def test_reconnect_keeps_firmware_from_cached_identity(tmp_path):
+    from app.core.device_link import DeviceLink
+    from app.core.wake_manager import WakeManager
+
+    qt_app()
+    manager = new_manager()
+    link = DeviceLink(manager)
+    wake = None
+
+    def on_identity(connected, port):
+        if connected:
+            wake.firmware = "V2.1"                # identidad cacheada, emitida al reconectar
+
+    # Como en MainWindow: ese slot se conecta antes de crear WakeManager, así que corre primero
+    manager.connection_changed.connect(on_identity)
+    wake = WakeManager(link, WakeStats(str(tmp_path / "wake.json")))
+    with FakeDevice() as device:
+        try:
+            assert manager.open_port(device.port)
+            assert wake.firmware == "V2.1"
+            manager.close_port()
+            assert wake.firmware == ""
+            assert manager.open_port(device.port)
+            assert wake.firmware == "V2.1"
+        finally:
+            manager.shutdown()
@@ -0,0 +1,68 @@
+import json
+import time
+
+from test.fake_device import qt_app, spin
+
+
+def _block(seconds):
+    time.sleep(seconds)                          # un slot que no devuelve el control al event loop
+
+
+def test_stall_is_detected_once_with_the_blocking_stack(tmp_path):
+    from app.core.watchdog import StallWatchdog
+
+    qt_app()
+    watchdog = StallWatchdog(threshold_ms=150, heartbeat_ms=20)
+    stalls = []
+    watchdog.stall_detected.connect(stalls.append)
+    watchdog.start()
+    try:
+        spin(100)
+        _block(0.5)
+        spin(200)
+    finally:
+        watchdog.stop()
+
+    assert len(stalls) == 1
+    record = stalls[0]
+    assert record.duration_ms >= 300
+    assert "_block" in record.handler
+    assert record.samples and all("_block" in s for s in record.samples)
+    assert list(watchdog.records) == [record]
+    assert watchdog.max_latency_ms >= record.duration_ms
+
+    path = tmp_path / "stalls.json"
+    assert watchdog.dump(str(path)) == 1
+    assert json.loads(path.read_text())["stalls"][0]["handler"] == record.handler
+
+
+def test_healthy_loop_does_not_fire():
+    from app.core.watchdog import StallWatchdog
+
+    qt_app()
+    watchdog = StallWatchdog(threshold_ms=150, heartbeat_ms=20)
+    stalls = []
+    watchdog.stall_detected.connect(stalls.append)
+    watchdog.start()
+    try:
+        spin(600)
+    finally:
+        watchdog.stop()
+
+    assert stalls == []
+    assert not watchdog.records
+    assert watchdog.last_latency_ms < watchdog.threshold_ms
+
+
+def test_threshold_from_env_falls_back_and_clamps(monkeypatch):
+    from app.core.watchdog import DEFAULT_HEARTBEAT_MS, ENV_THRESHOLD, StallWatchdog
+
+    qt_app()
+    monkeypatch.setenv(ENV_THRESHOLD, "400")
+    assert StallWatchdog.from_env().threshold_ms == 400
+    monkeypatch.setenv(ENV_THRESHOLD, "fast")                   # no numérico: la app igual arranca
+    assert StallWatchdog.from_env().threshold_ms == 250
+    monkeypatch.setenv(ENV_THRESHOLD, "-5")
+    assert StallWatchdog.from_env().threshold_ms == DEFAULT_HEARTBEAT_MS
+    monkeypatch.delenv(ENV_THRESHOLD)
+    assert StallWatchdog.from_env().threshold_ms == 250